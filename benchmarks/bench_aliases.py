@@ -0,0 +1,62 @@
+# Cost of the module -> distribution alias database.
+#
+#   python benchmarks/bench_aliases.py [--runs 20] [--lookups 100000]
+#
+# Reports the alias module's own import time in a fresh interpreter (from
+# -X importtime; importing it must not read the database), the one-off load
+# on the first lookup, and the steady-state lookup cost.
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from pydepguard.pylock import aliases
+
+IMPORT_SNIPPET = "import pydepguard.pylock.aliases as a; assert a._table is None"
+
+
+def import_self_time():
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "pydepguard.pylock.aliases":
+            return int(fields[0].split(":")[1]) / 1e6
+    raise RuntimeError("alias module not found in -X importtime output")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    imports = [import_self_time() for _ in range(args.runs)]
+
+    loads = []
+    for _ in range(args.runs):
+        aliases.clear_alias_cache()
+        start = perf_counter()
+        aliases.lookup_alias("sklearn")
+        loads.append(perf_counter() - start)
+
+    names = ["sklearn", "PIL", "pil", "requests", "nosuchmodule"] * (args.lookups // 5)
+    start = perf_counter()
+    for name in names:
+        aliases.lookup_alias(name)
+    per_lookup = (perf_counter() - start) / len(names)
+
+    print(f"entries        {len(aliases.load_aliases())}")
+    print(f"module import  median {statistics.median(imports) * 1000:7.3f} ms")
+    print(f"first lookup   median {statistics.median(loads) * 1000:7.3f} ms (parses the database)")
+    print(f"lookup         {per_lookup * 1e9:7.1f} ns each ({len(names)} lookups)")
+
+
+if __name__ == "__main__":
+    main()
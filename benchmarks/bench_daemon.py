@@ -0,0 +1,69 @@
+# Validation round trip through `pylock serve` versus a fresh CLI process.
+# Starts a daemon on a temporary socket, validates one script repeatedly.
+#
+#   python benchmarks/bench_daemon.py [--runs 50]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from pydepguard.pylock.daemon import request, wait_until_ready  # noqa: E402
+
+
+def options(script):
+    return dict(scripts=[str(script)], generate=False, validate=True, run=False, force=False, project=False,
+                workers=1, no_cache=False, lock_format='json', strict=True, non_interactive=True,
+                on_error='abort', fix_missing=False, batch_install=False, jobs=1, pip_fallback=False,
+                revalidate=False, transitive=False, verify_hashes=False, wheelhouse=None)
+
+
+def report(label, timings):
+    print(f"{label:<10} median {statistics.median(timings) * 1000:8.2f} ms  "
+          f"min {min(timings) * 1000:8.2f} ms  ({len(timings)} runs)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "hello.py"
+        script.write_text("import json\nimport pip\nprint('hello')\n")
+        socket_path = Path(tmp) / "pylock.sock"
+        env = dict(os.environ, PYTHONPATH=str(ROOT))
+        pylock = [sys.executable, "-m", "pydepguard.pylock"]
+        subprocess.run([*pylock, str(script), "--generate"], env=env, stdout=subprocess.DEVNULL, check=True)
+
+        daemon = subprocess.Popen([*pylock, "serve", "--socket", str(socket_path)], env=env,
+                                  stdout=subprocess.DEVNULL)
+        try:
+            wait_until_ready(socket_path)
+            timings = []
+            for _ in range(args.runs):
+                start = perf_counter()
+                request(socket_path, {'op': 'validate', 'options': options(script)})
+                timings.append(perf_counter() - start)
+            report("daemon", timings)
+
+            timings = []
+            for _ in range(min(args.runs, 20)):
+                start = perf_counter()
+                subprocess.run([*pylock, str(script), "--validate", "--non-interactive"], env=env,
+                               stdout=subprocess.DEVNULL, check=True)
+                timings.append(perf_counter() - start)
+            report("cli", timings)
+        finally:
+            request(socket_path, {'op': 'shutdown'})
+            daemon.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Import-time regression check for the `--run` path. Generates a lockfile
+# for a throwaway script, then parses `python -X importtime -m pydepguard.pylock
+# app.py --run` and fails when the median time spent importing after
+# interpreter startup exceeds the budget.
+#
+#   python benchmarks/bench_importtime.py [--runs 10] [--budget-ms 60] [--top 10]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = "import pip\n"
+
+
+def _pylock(*args, **kwargs):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    return subprocess.run([sys.executable, *args], env=env, stdout=subprocess.DEVNULL, check=True, **kwargs)
+
+
+def make_script(directory: Path) -> Path:
+    script = directory / "app.py"
+    script.write_text(SCRIPT)
+    _pylock("-m", "pydepguard.pylock", str(script), "--generate", "--no-cache")
+    return script
+
+
+def importtime(script: Path):
+    # Returns ({module: (self_us, cumulative_us)}, total_us), where total_us
+    # sums the top-level imports made after `site`, i.e. everything the
+    # `--run` invocation itself pulled in.
+    result = _pylock("-X", "importtime", "-m", "pydepguard.pylock", str(script), "--run",
+                     stderr=subprocess.PIPE, text=True)
+    modules = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        top_level = not name[1:].startswith(" ")
+        name = name.strip()
+        if name == "site":
+            # Everything up to and including this line is interpreter startup.
+            modules, total = {}, 0
+            continue
+        modules[name] = (int(self_us), int(cumulative_us))
+        if top_level:
+            total += int(cumulative_us)
+    return modules, total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=60.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        script = make_script(Path(tmp))
+        totals = []
+        for _ in range(args.runs):
+            modules, total = importtime(script)
+            totals.append(total)
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"pylock app.py --run imports: median {median_ms:7.1f} ms  min {min(totals) / 1000:7.1f} ms  "
+          f"({args.runs} runs, budget {args.budget_ms:.0f} ms)")
+    print(f"{len(modules)} modules imported; slowest (self time, last run):")
+    for name, (self_us, _) in sorted(modules.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {self_us / 1000:7.2f} ms  {name}")
+
+    if median_ms > args.budget_ms:
+        print(f"[pylock.CRIT] Import time {median_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Scaling benchmark for multi-file scanning.
+#
+#   python benchmarks/bench_scan.py [--files 4000] [--lines 300]
+#
+# Generates a synthetic project where main.py imports every module, then
+# times scan_project_for_imports (the walk behind `--generate --project`)
+# with 1, 2, 4, ... worker processes.
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydepguard.pylock.depscan import scan_project_for_imports
+
+
+def make_project(root: Path, files: int, lines: int):
+    body = "".join(
+        f"def func_{n}(x, y=1):\n"
+        f"    total = sum(i * y for i in range(x))\n"
+        f"    return json.dumps({{'n': {n}, 'total': total}})\n\n"
+        for n in range(lines // 4)
+    )
+    (root / "main.py").write_text("".join(f"import mod_{i}\n" for i in range(files)))
+    for i in range(files):
+        (root / f"mod_{i}.py").write_text(f"import json\nimport thirdparty_{i % 50}\n\n{body}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=4000)
+    parser.add_argument("--lines", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, *(2 ** i for i in range(1, cpus.bit_length())), cpus})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_project(root, args.files, args.lines)
+        print(f"{args.files} files x ~{args.lines} lines, {cpus} CPUs")
+        baseline = None
+        for workers in counts:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = perf_counter()
+                refs, _, scanned = scan_project_for_imports(root / "main.py", workers=workers)
+                best = min(best, perf_counter() - start)
+            baseline = baseline or best
+            print(f"workers={workers:<3} files={len(scanned):<6} refs={len(refs):<7} "
+                  f"{best:8.3f}s  speedup x{baseline / best:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# Single-file scanner benchmark: time and peak memory of the NodeVisitor
+# scanner against the previous ast.walk/isinstance implementation (kept below
+# as the baseline). Both scan the same pre-parsed tree, so the numbers exclude
+# ast.parse itself.
+#
+#   python benchmarks/bench_scanner.py [--functions 20000]
+import argparse
+import ast
+import builtins
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydepguard.pylock.depscan import ImportReference, SymbolReference, _ImportScanner
+
+
+def legacy_scan(tree: ast.AST, filepath: Path) -> tuple[list[ImportReference], list[SymbolReference]]:
+    refs = []
+    used_references = []
+    declared_symbols = set()
+    BUILTIN_SYMBOLS = set(dir(builtins))
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                refs.append(ImportReference(
+                    module=alias.name,
+                    file=str(filepath),
+                    line=node.lineno,
+                    import_type='import',
+                    imported_symbols=[alias.asname] if alias.asname else []
+                ))
+                declared_symbols.add(alias.asname or alias.name.split('.')[0])
+
+        elif isinstance(node, ast.ImportFrom):
+            if node.level and not node.module:
+                module = '.' * node.level
+                symbols = [alias.name for alias in node.names]
+            else:
+                module = f"{'.' * node.level}{node.module}" if node.level else node.module
+                symbols = [alias.name for alias in node.names]
+
+            refs.append(ImportReference(
+                module=module,
+                file=str(filepath),
+                line=node.lineno,
+                import_type='from',
+                imported_symbols=symbols
+            ))
+            declared_symbols.update(symbols)
+
+        elif isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name) and node.func.id == '__import__':
+                if len(node.args) >= 1 and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+                    refs.append(ImportReference(
+                        module=node.args[0].value,
+                        file=str(filepath),
+                        line=node.lineno,
+                        import_type='dynamic',
+                        imported_symbols=[]
+                    ))
+                    declared_symbols.add(node.args[0].value)
+
+            elif isinstance(node.func, ast.Attribute) and node.func.attr == 'import_module':
+                if hasattr(node.func.value, 'id') and node.func.value.id == 'importlib':
+                    if len(node.args) >= 1 and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+                        refs.append(ImportReference(
+                            module=node.args[0].value,
+                            file=str(filepath),
+                            line=node.lineno,
+                            import_type='dynamic',
+                            imported_symbols=[]
+                        ))
+                        declared_symbols.add(node.args[0].value)
+
+        elif isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Load):
+                used_references.append(SymbolReference(
+                    name=node.id,
+                    file=str(filepath),
+                    line=node.lineno,
+                    context='load'
+                ))
+
+        elif isinstance(node, ast.Attribute):
+            if isinstance(node.value, ast.Name):
+                used_references.append(SymbolReference(
+                    name=node.value.id,
+                    file=str(filepath),
+                    line=node.lineno,
+                    context='attribute'
+                ))
+
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    declared_symbols.add(target.id)
+
+        elif isinstance(node, ast.With):
+            for item in node.items:
+                if item.optional_vars and isinstance(item.optional_vars, ast.Name):
+                    declared_symbols.add(item.optional_vars.id)
+
+    imported_modules = {ref.module.split('.')[0] for ref in refs}
+    imported_aliases = {
+        sym for ref in refs if ref.imported_symbols
+        for sym in ref.imported_symbols
+    }
+    all_imported = imported_modules.union(imported_aliases)
+    all_known = all_imported.union(declared_symbols).union(BUILTIN_SYMBOLS)
+
+    seen = set()
+    unbound_symbols = []
+    for ref in used_references:
+        if ref.name not in all_known and ref.name not in seen:
+            unbound_symbols.append(ref)
+            seen.add(ref.name)
+
+    return refs, unbound_symbols
+
+
+def make_source(functions: int) -> str:
+    header = "import os\nimport json\nfrom collections import defaultdict\n\n"
+    body = "".join(
+        f"def func_{n}(items, factor=2):\n"
+        f"    result = defaultdict(list)\n"
+        f"    for idx, item in enumerate(items):\n"
+        f"        result[os.path.basename(item)].append(idx * factor)\n"
+        f"    return json.dumps({{k: v for k, v in result.items() if v}})\n\n"
+        for n in range(functions)
+    )
+    return header + body
+
+
+def visitor_scan(tree: ast.AST, filepath: Path):
+    return _ImportScanner(filepath).scan(tree)
+
+
+def measure(scan, tree: ast.AST, repeat: int) -> tuple[float, int, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = perf_counter()
+        refs, unbound = scan(tree, Path("bench.py"))
+        best = min(best, perf_counter() - start)
+    del refs, unbound
+    gc.collect()
+    tracemalloc.start()
+    scan(tree, Path("bench.py"))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(scan(tree, Path("bench.py"))[1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--functions", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = make_source(args.functions)
+    start = perf_counter()
+    tree = ast.parse(source)
+    print(f"{len(source.splitlines())} lines, ast.parse {perf_counter() - start:.3f}s")
+    for label, scan in (("legacy ast.walk", legacy_scan), ("NodeVisitor", visitor_scan)):
+        seconds, peak, unbound = measure(scan, tree, args.repeat)
+        print(f"{label:<16} {seconds:8.3f}s  peak {peak / 2**20:8.2f} MiB  unbound={unbound}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Cold-start comparison for `pylock --run`: subprocess execution versus
+# --in-process. Each sample is a fresh `python -m pydepguard.pylock` call.
+#
+#   python benchmarks/bench_startup.py [--runs 20]
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def pylock(*args):
+    return subprocess.run(
+        [sys.executable, "-m", "pydepguard.pylock", *args],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    )
+
+
+def sample(args, runs):
+    timings = []
+    for _ in range(runs):
+        start = perf_counter()
+        pylock(*args)
+        timings.append(perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "hello.py"
+        script.write_text("import json\nprint(json.dumps({'hello': 'world'}))\n")
+        pylock(str(script), "--generate")
+        pylock(str(script), "--validate", "--non-interactive")
+
+        for label, extra in (("subprocess", []), ("in-process", ["--in-process"])):
+            timings = sample([str(script), "--run", "--non-interactive", *extra], args.runs)
+            print(f"{label:<11} median {statistics.median(timings) * 1000:7.1f} ms  "
+                  f"min {min(timings) * 1000:7.1f} ms  ({args.runs} runs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,7 @@
-from .pylock import *
\ No newline at end of file
+from . import pylock as _pylock
+
+__all__ = _pylock.__all__
+
+
+def __getattr__(name):
+    return getattr(_pylock, name)
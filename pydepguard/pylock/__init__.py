@@ -1,6 +1,52 @@
-from .config import *
-from .lockfile import *
-from .depscan import *
-from .validator import *
-from .runner import *
-from .package_handler import *
+import importlib
+
+# Public names are resolved on first access so that importing the package
+# (which every `pylock` invocation does) does not import every submodule.
+_EXPORTS = {
+    'config': 'config',
+    'LOCK_FORMATS': 'lockfile',
+    'LockfileManager': 'lockfile',
+    'BUILTIN_SYMBOLS': 'depscan',
+    'IMPLICIT_SYMBOLS': 'depscan',
+    'ImportReference': 'depscan',
+    'SCANNER_VERSION': 'depscan',
+    'SymbolReference': 'depscan',
+    'scan_files_for_imports': 'depscan',
+    'scan_project_for_imports': 'depscan',
+    'scan_script_for_imports': 'depscan',
+    'scan_source_for_imports': 'depscan',
+    'walk_project_imports': 'depscan',
+    'check_package_availability': 'validator',
+    'expand_transitive': 'validator',
+    'resolve_installed_package_info': 'validator',
+    'validate_environment': 'validator',
+    'verify_hashes': 'validator',
+    'OUTPUT_MODES': 'runner',
+    'STREAM_CHUNK_SIZE': 'runner',
+    'execute_script': 'runner',
+    'run_script_in_process': 'runner',
+    'ensure_package': 'package_handler',
+    'extract_installed_version': 'package_handler',
+    'guess_distribution_name': 'package_handler',
+    'install_package': 'package_handler',
+    'install_packages': 'package_handler',
+    'install_packages_offline': 'package_handler',
+    'is_importable': 'package_handler',
+    'load_known_depmap': 'package_handler',
+    'resolve_pip_name': 'package_handler',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,76 @@
+import os
+import threading
+from pathlib import Path
+from .cache import user_config_dir
+
+ALIAS_RESOURCE = "known_deps.pydepcache"
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def overlay_path() -> Path:
+    override = os.environ.get("PYLOCK_ALIASES")
+    return Path(override) if override else user_config_dir() / "aliases.tsv"
+
+
+def parse_aliases(text: str) -> dict[str, str]:
+    aliases = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        fields = line.split()
+        if len(fields) == 2:
+            aliases[fields[0]] = fields[1]
+    return aliases
+
+
+def _read_bundled() -> str:
+    import importlib.resources as resources
+    try:
+        return resources.files("pydepguard.pylock").joinpath(ALIAS_RESOURCE).read_text(encoding="utf-8")
+    except Exception as e:
+        print(f"[pylock.WARN] Failed to load known dependency map: {e}")
+        return ""
+
+
+def _read_overlay() -> str:
+    try:
+        return overlay_path().read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return ""
+    except OSError as e:
+        print(f"[pylock.WARN] Failed to read alias overlay {overlay_path()}: {e}")
+        return ""
+
+
+def load_aliases() -> dict[str, str]:
+    # Bundled database first, then the user's overlay on top of it.
+    aliases = parse_aliases(_read_bundled())
+    aliases.update(parse_aliases(_read_overlay()))
+    return aliases
+
+
+def _get_table() -> dict[str, str]:
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                aliases = load_aliases()
+                # Exact spellings win; lowercased keys catch `pil` or `crypto`.
+                table = {name.lower(): dist for name, dist in aliases.items()}
+                table.update(aliases)
+                _table = table
+    return _table
+
+
+def lookup_alias(module: str) -> str | None:
+    # Nothing is read until the first lookup; after that it is a dict probe.
+    table = _get_table()
+    return table.get(module) or table.get(module.lower())
+
+
+def clear_alias_cache():
+    global _table
+    _table = None
@@ -0,0 +1,130 @@
+import glob
+import io
+import json
+import sys
+import threading
+from pathlib import Path
+from time import perf_counter
+
+SUMMARY_VERSION = 1
+FAILED_STATUSES = ('failed', 'error')
+
+
+def _lines(files_from: str) -> list[str]:
+    if files_from == '-':
+        text = sys.stdin.read()
+    else:
+        with open(files_from, 'r', encoding='utf-8') as f:
+            text = f.read()
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.lstrip().startswith('#')]
+
+
+def expand_scripts(patterns, files_from: str = None) -> list[Path]:
+    # Existing paths are taken as given; anything else with glob characters
+    # is expanded (`**` included). Order is kept and duplicates are dropped.
+    patterns = list(patterns) + (_lines(files_from) if files_from else [])
+    scripts, seen = [], set()
+    for pattern in patterns:
+        if not Path(pattern).exists() and any(c in pattern for c in '*?['):
+            matches = [Path(match) for match in sorted(glob.glob(pattern, recursive=True))]
+            if not matches:
+                print(f"[pylock.WARN] No scripts match {pattern}")
+        else:
+            matches = [Path(pattern)]
+        for path in matches:
+            key = path.resolve()
+            if key not in seen:
+                seen.add(key)
+                scripts.append(path)
+    return scripts
+
+
+class ThreadOutput:
+    # Stands in for sys.stdout while scripts are handled in parallel: each
+    # worker writes to its own buffer, flushed in one piece when it finishes.
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def write(self, text):
+        return (getattr(self.local, 'buffer', None) or self.stream).write(text)
+
+    def flush(self):
+        if getattr(self.local, 'buffer', None) is None:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    def collect(self, func, *args):
+        # Returns func's result and everything it printed on this thread.
+        self.local.buffer = io.StringIO()
+        try:
+            result = func(*args)
+        finally:
+            text, self.local.buffer = self.local.buffer.getvalue(), None
+        return result, text
+
+    def capture(self, func, *args):
+        self.local.buffer = io.StringIO()
+        try:
+            return func(*args)
+        finally:
+            text, self.local.buffer = self.local.buffer.getvalue(), None
+            with self.lock:
+                self.stream.write(text)
+                self.stream.flush()
+
+
+def _timed(task, script):
+    start = perf_counter()
+    try:
+        result = task(script)
+    except Exception as e:
+        # One broken script must not stop the rest of the batch.
+        print(f"[pylock.CRIT] {script}: {e}")
+        result = {'status': 'failed', 'error': str(e)}
+    return dict({'script': str(script)}, **result, seconds=round(perf_counter() - start, 6))
+
+
+def run_batch(scripts, task, jobs: int = 1) -> list[dict]:
+    # `task(script)` returns a result dict with at least a 'status'. Results
+    # come back in input order regardless of `jobs`.
+    if jobs <= 1 or len(scripts) <= 1:
+        return [_timed(task, script) for script in scripts]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    output = ThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(lambda script: output.capture(_timed, task, script), scripts))
+    finally:
+        sys.stdout = output.stream
+
+
+def summarize(action: str, results: list[dict], seconds: float) -> dict:
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    return {
+        'version': SUMMARY_VERSION,
+        'action': action,
+        'scripts': results,
+        'counts': counts,
+        'failed': sum(counts.get(status, 0) for status in FAILED_STATUSES),
+        'seconds': round(seconds, 6),
+    }
+
+
+def write_summary(path: str, summary: dict, stream=None):
+    text = json.dumps(summary, indent=2)
+    if path == '-':
+        stream = stream or sys.stdout
+        stream.write(text + '\n')
+        stream.flush()
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + '\n')
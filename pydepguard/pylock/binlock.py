@@ -0,0 +1,143 @@
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+
+# Layout (little endian):
+#   header   magic, format version, flags, dep count, document length
+#   document compact JSON of every top-level key except 'deps'
+#   index    one (name offset, name length, value offset, value length)
+#            entry per dep, in lockfile order
+#   data     dep names (utf-8) and compact JSON values
+# Offsets are absolute, so a dep is one slice of the mapped file and only
+# the entries actually looked up are ever decoded.
+
+MAGIC = b'PYLOCKB\0'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<8sHHII')
+_ENTRY = struct.Struct('<IHII')
+
+
+def _encode(value) -> bytes:
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def dumps(lockfile: dict) -> bytes:
+    deps = lockfile.get('deps', {})
+    document = _encode({key: value for key, value in lockfile.items() if key != 'deps'})
+    names = [name.encode('utf-8') for name in deps]
+    values = [_encode(info) for info in deps.values()]
+
+    offset = _HEADER.size + len(document) + _ENTRY.size * len(names)
+    index = bytearray()
+    data = bytearray()
+    for name, value in zip(names, values):
+        if len(name) > 0xFFFF:
+            raise ValueError(f"[pylock] Dependency name too long for binary lockfile: {name[:40]!r}...")
+        index += _ENTRY.pack(offset + len(data), len(name), offset + len(data) + len(name), len(value))
+        data += name
+        data += value
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(names), len(document))
+    return b''.join((header, document, bytes(index), bytes(data)))
+
+
+class LazyDeps(Mapping):
+    def __init__(self, buffer, slots: dict[str, tuple[int, int]]):
+        self._buffer = buffer
+        self._slots = slots
+        self._decoded = {}
+
+    def __getitem__(self, name):
+        if name not in self._decoded:
+            offset, length = self._slots[name]
+            self._decoded[name] = json.loads(bytes(self._buffer[offset:offset + length]).decode('utf-8'))
+        return self._decoded[name]
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, name):
+        return name in self._slots
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+def is_binary(path) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def loads(buffer) -> dict:
+    if len(buffer) < _HEADER.size:
+        raise ValueError("[pylock] Binary lockfile is truncated")
+    magic, version, _flags, count, document_len = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("[pylock] Not a binary lockfile")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"[pylock] Unsupported binary lockfile version: {version}")
+
+    document_start = _HEADER.size
+    index_start = document_start + document_len
+    index_end = index_start + _ENTRY.size * count
+    if len(buffer) < index_end:
+        raise ValueError("[pylock] Binary lockfile is truncated")
+
+    lockfile = json.loads(bytes(buffer[document_start:index_start]).decode('utf-8'))
+    slots = {}
+    for name_offset, name_len, value_offset, value_len in _ENTRY.iter_unpack(buffer[index_start:index_end]):
+        if value_offset + value_len > len(buffer):
+            raise ValueError("[pylock] Binary lockfile is truncated")
+        name = bytes(buffer[name_offset:name_offset + name_len]).decode('utf-8')
+        slots[name] = (value_offset, value_len)
+    lockfile['deps'] = LazyDeps(buffer, slots)
+    return lockfile
+
+
+def load(path) -> dict:
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return loads(buffer)
+    except ValueError:
+        buffer.close()
+        raise
+
+
+def write(path, lockfile: dict):
+    path = Path(path)
+    data = dumps(lockfile)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def to_json(lockfile: dict) -> dict:
+    return {key: dict(value) if key == 'deps' else value for key, value in lockfile.items()}
+
+
+def json_to_binary(src, dst):
+    with open(src, 'r') as f:
+        write(dst, json.load(f))
+
+
+def binary_to_json(src, dst):
+    lockfile = load(src)
+    try:
+        content = to_json(lockfile)
+    finally:
+        lockfile['deps'].close()
+    with open(dst, 'w') as f:
+        json.dump(content, f, indent=4)
@@ -1,14 +1,6 @@
-KNOWN_DEP_MAP = {
-  "yaml": "pyyaml",
-  "bs4": "beautifulsoup4",
-  "cv2": "opencv-python",
-  "PIL": "pillow",
-  "sklearn": "scikit-learn",
-  "Crypto": "pycryptodome",
-  "Image": "pillow",
-  "lxml": "lxml",
-  "win32com": "pywin32"
-}
+import os
+import sys
+from pathlib import Path
 
 KNOWN_TRANSITIVE = {
     "pandas.read_excel": ["openpyxl", "xlrd"],
@@ -17,4 +9,30 @@ KNOWN_TRANSITIVE = {
     "yaml.safe_load": ["pyyaml"],
     "matplotlib.use": ["matplotlib"],
     "pydantic.BaseModel": ["pydantic"],
-}
\ No newline at end of file
+}
+
+
+def user_cache_dir() -> Path:
+    override = os.environ.get("PYLOCK_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pylock"
+
+
+def user_config_dir() -> Path:
+    override = os.environ.get("PYLOCK_CONFIG_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or Path.home() / "AppData" / "Roaming"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return Path(base) / "pylock"
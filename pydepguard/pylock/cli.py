@@ -1,90 +1,318 @@
 import argparse
+import os
 import sys
-import json
-from pathlib import Path
-from .depscan import scan_script_for_imports
-from .lockfile import LockfileManager
-from .validator import validate_environment
-from .runner import execute_script
-from .utils import enrich_dependencies
+from .lockfile import LockfileManager, LOCK_FORMATS
+from .runner import OUTPUT_MODES
+from .batch import expand_scripts, run_batch, summarize, write_summary
+from .profiling import session, span
 
-from time import time
-
-gtime = time()
+from time import perf_counter
 
 
 def main():
+    # Timed from here rather than from module import, so the reported total
+    # is pylock's own work; --profile breaks it down by phase.
+    start = perf_counter()
+    if sys.argv[1:2] == ['serve']:
+        from .daemon import serve_main
+        return serve_main(sys.argv[2:])
+
     parser = argparse.ArgumentParser(
         description="PyLock: A gatekeeper dependency validator for Python scripts.\n"
                     "This tool scans Python scripts for imports, generates lockfiles, and validates dependencies.\n"
                     "Version 3.0.4 - Made by 0xIkari\n"
                     "Part of the PyDepGuard project\n"
-                    "Usage: pylock script.py [options]\n\n"
+                    "Usage: pylock script.py [script.py ...] [options]\n"
+                    "       pylock serve [--socket PATH] [--poll SECONDS]\n\n"
                     "Options:\n"
                     "  --generate         Generate or overwrite per-file lockfile\n"
+                    "  --force            With --generate, rebuild even if no source file changed\n"
                     "  --validate         Validate environment against lockfile\n"
-                    "  --run              Run the script if validation passes\n"
+                    "  --run              Refresh a stale lockfile, then run the script if validation passes\n"
                     "  --strict           Enable strict version matching\n"
                     "  --non-interactive  Disable user input (e.g., for CI/CD)\n"
                     "  --on-error         Set behavior on errors: 'abort', 'warn', or 'skip'\n"
-                    "  --fix-missing      Install any missing dependencies as found during AST or locklife read\n",
+                    "  --fix-missing      Install any missing dependencies as found during AST or locklife read\n"
+                    "  --batch-install    With --fix-missing, install all missing dependencies in a single pip call\n"
+                    "  --wheelhouse DIR   With --fix-missing, install only from local wheels in DIR (offline)\n"
+                    "  --jobs N           Check dependencies using N worker threads (default: 1)\n"
+                    "  --pip-fallback     Ask `pip show` about packages missing from the installed metadata\n"
+                    "  --revalidate       Check every dependency even if the environment is unchanged\n"
+                    "  --transitive       Also validate the pinned transitive dependencies in the lockfile\n"
+                    "  --verify-hashes    Re-hash installed files and check them against RECORD and the lockfile\n"
+                    "  --project          With --generate, follow local imports and lock the whole project\n"
+                    "  --workers N        Parse project files with N worker processes (0 = one per CPU)\n"
+                    "  --no-cache         Re-parse every file instead of reusing cached scan results\n"
+                    "  --output MODE      How --run forwards script output: 'stream', 'inherit', or 'buffer'\n"
+                    "  --in-process       With --run, execute the script in this interpreter instead of a new one\n"
+                    "  --lock-format FMT  Lockfile format to read and write: 'json' (default) or 'binary'\n"
+                    "  --convert-lock     Convert the script's lockfile from the other format into --lock-format\n"
+                    "  --files-from FILE  Also read script paths, one per line, from FILE ('-' for stdin)\n"
+                    "  --script-jobs N    With several scripts, handle N of them at a time (default: 1)\n"
+                    "  --summary-json P   Write per-script results as JSON to P ('-' for stdout)\n"
+                    "  --watch            Keep the lockfile up to date as the script (or project) is edited\n"
+                    "  --debounce SECS    With --watch, wait for SECS of quiet before rescanning (default: 0.3)\n"
+                    "  --daemon           Send --generate/--validate to a running `pylock serve` instead\n"
+                    "  --socket PATH      Socket of the daemon (default: $PYLOCK_SOCKET or the user runtime dir)\n"
+                    "  --profile PATH     Write a JSON report of the time spent in each phase to PATH\n"
+                    "  --cprofile PATH    Also run under cProfile and dump the stats to PATH\n",
         formatter_class=argparse.RawTextHelpFormatter
     )
-    parser.add_argument('script', nargs='?', help="Script to check and run")
+    parser.add_argument('scripts', nargs='*', metavar='script', help="Scripts or glob patterns to check (--run takes one)")
     parser.add_argument('-g', '--generate', action='store_true')
+    parser.add_argument('--force', action='store_true')
     parser.add_argument('-v', '--validate', action='store_true')
     parser.add_argument('-r', '--run', action='store_true')
     parser.add_argument('--strict', action='store_true')
     parser.add_argument('--non-interactive', action='store_true')
     parser.add_argument('--on-error', choices=['abort', 'warn', 'skip'], default='abort')
     parser.add_argument('--fix-missing', action='store_true')
+    parser.add_argument('--batch-install', action='store_true')
+    parser.add_argument('--wheelhouse', default=os.environ.get('PYLOCK_WHEELHOUSE'))
+    parser.add_argument('-j', '--jobs', type=int, default=1)
+    parser.add_argument('--pip-fallback', action='store_true')
+    parser.add_argument('--revalidate', action='store_true')
+    parser.add_argument('--transitive', action='store_true')
+    parser.add_argument('--verify-hashes', action='store_true')
+    parser.add_argument('--project', action='store_true')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--output', choices=OUTPUT_MODES, default='stream')
+    parser.add_argument('--in-process', action='store_true')
+    parser.add_argument('--lock-format', choices=LOCK_FORMATS, default='json')
+    parser.add_argument('--convert-lock', action='store_true')
+    parser.add_argument('--files-from', metavar='FILE')
+    parser.add_argument('--script-jobs', type=int, default=1)
+    parser.add_argument('--summary-json', metavar='PATH')
+    parser.add_argument('--watch', action='store_true')
+    parser.add_argument('--debounce', type=float, default=0.3)
+    parser.add_argument('--daemon', action='store_true')
+    parser.add_argument('--socket', metavar='PATH')
+    parser.add_argument('--profile', metavar='PATH')
+    parser.add_argument('--cprofile', metavar='PATH')
 
     args = parser.parse_args()
+    stdout = sys.stdout
+    if args.summary_json == '-':
+        # stdout carries nothing but the JSON summary, so it can be piped;
+        # the log goes to stderr.
+        sys.stdout = sys.stderr
+    try:
+        with session(args.profile, args.cprofile):
+            _command(parser, args, start, stdout)
+    finally:
+        sys.stdout = stdout
+
 
-    if not args.script:
+def _command(parser, args, start, stdout=None):
+
+    if not args.scripts and not args.files_from:
         parser.print_help()
         sys.exit(1)
 
-    script_path = Path(args.script)
-    if not script_path.exists():
-        print(f"[pylock] Error: File not found: {script_path}", file=sys.stderr)
+    if args.jobs < 1 or args.script_jobs < 1:
+        print("[pylock] Error: --jobs and --script-jobs must be at least 1", file=sys.stderr)
+        sys.exit(1)
+
+    if args.wheelhouse and not os.path.isdir(args.wheelhouse):
+        print(f"[pylock] Error: Wheelhouse directory not found: {args.wheelhouse}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.workers < 0:
+        print("[pylock] Error: --workers must be 0 or more", file=sys.stderr)
+        sys.exit(1)
+
+    scripts = expand_scripts(args.scripts, args.files_from)
+    if not scripts:
+        parser.print_help()
         sys.exit(1)
 
-    lm = LockfileManager(script_path)
-
-    if args.generate:
-        print("[pylock] Scanning for imports...")
-        imports, unbound_symbols = scan_script_for_imports(script_path)
-        print(f"[pylock] Found {len(unbound_symbols)} unbound symbols.")
-        unbound_findings = list()
-        for sym in unbound_symbols:
-            unbound_findings.append(f"File: {sym.file} Module: {sym.name} Line Number: {sym.line})")
-            print(f"[pylock.CRIT] Unbound Symbol: {sym.name} at {sym.file}:{sym.line} - Add `import {sym.name}` to {sym.file} resolve.")
-        deps = enrich_dependencies(imports)
-        lm.save(deps)
-        print(f"[pylock] Lockfile generated for {script_path.name} with {len(deps)} dependencies.")
-        print(f"[pylock.DBG] Total Time Spent: {time() - gtime:.8f} seconds")
-        print(f"If this helped you save time, please star or sponsor me: https://github.com/nuclear-treestump/pylock-dependency-lockfile")
+    if len(scripts) == 1 and not scripts[0].exists():
+        print(f"[pylock] Error: File not found: {scripts[0]}", file=sys.stderr)
+        sys.exit(1)
+
+    if len(scripts) > 1 and args.run:
+        print("[pylock] Error: --run takes exactly one script", file=sys.stderr)
+        sys.exit(1)
+
+    if args.files_from == '-':
+        # stdin held the script list, so there is nobody left to answer prompts.
+        args.non_interactive = True
+
+    if args.script_jobs > 1 and (args.fix_missing or not args.non_interactive) and not args.generate:
+        print("[pylock] Error: --script-jobs needs --non-interactive and cannot be combined with --fix-missing",
+              file=sys.stderr)
+        sys.exit(1)
+
+    if args.convert_lock:
+        for script_path in scripts:
+            if not script_path.exists():
+                print(f"[pylock] Error: File not found: {script_path}", file=sys.stderr)
+                sys.exit(1)
+            lm = LockfileManager(script_path, lock_format=args.lock_format)
+            try:
+                target = lm.convert()
+            except FileNotFoundError as e:
+                print(f"[pylock] Error: No lockfile to convert: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"[pylock] Converted lockfile to {args.lock_format}: {target}")
+        return
+
+    if args.watch:
+        if len(scripts) != 1:
+            print("[pylock] Error: --watch takes exactly one script", file=sys.stderr)
+            sys.exit(1)
+        from .scancache import ScanCache
+        from .watcher import watch_lockfile
+
+        lm = LockfileManager(scripts[0], lock_format=args.lock_format)
+        watch_lockfile(lm, scripts[0], project=args.project, cache=None if args.no_cache else ScanCache(),
+                       debounce=args.debounce)
+        return
+
+    if not (args.generate or args.validate or args.run):
+        print("[pylock] No action specified. Use --generate, --validate, or --run.\n")
+        parser.print_help()
         return
 
-    if args.validate or args.run:
-        if not lm.exists():
-            print(f"[pylock] Error: No lockfile found for {script_path.name}. Please run with --generate first.", file=sys.stderr)
+    action = 'generate' if args.generate else 'validate'
+    if args.daemon:
+        results, summary = _daemon_request(args, action, scripts)
+    elif args.generate:
+        # Command modules are imported where they are used, so `--run` on a
+        # valid environment never loads the scanner or the installer.
+        from .scancache import ScanCache
+
+        cache = None if args.no_cache else ScanCache()
+        task = lambda script_path: _generate_script(args, script_path, cache)
+    else:
+        task = lambda script_path: _validate_script(args, script_path)
+
+    if len(scripts) == 1 and not args.summary_json:
+        result = results[0] if args.daemon else task(scripts[0])
+        if result['status'] == 'error':
+            print(f"[pylock] Error: {result['error']}", file=sys.stderr)
+            sys.exit(1)
+        if result['status'] == 'failed':
             sys.exit(1)
+        rc = _run_script(args, scripts[0]) if args.run and not args.generate else 0
+        print(f"[pylock.DBG] Total Time Spent: {perf_counter() - start:.8f} seconds")
+        if result['status'] != 'unchanged':
+            print(f"If this helped you save time, please star or sponsor me: https://github.com/nuclear-treestump/pylock-dependency-lockfile")
+        if rc:
+            sys.exit(rc)
+        return
+
+    # Batch mode: the installed-distribution index, environment snapshot and
+    # scan cache are built once and shared by every script.
+    if not args.daemon:
+        batch_start = perf_counter()
+        results = run_batch(scripts, task, jobs=args.script_jobs)
+        summary = summarize(action, results, perf_counter() - batch_start)
+    for result in results:
+        if result['status'] == 'error':
+            print(f"[pylock] Error: {result['error']}", file=sys.stderr)
+    counts = ', '.join(f"{count} {status}" for status, count in sorted(summary['counts'].items()))
+    print(f"[pylock] {len(results)} scripts: {counts} ({summary['seconds']:.2f}s)")
+    if args.summary_json:
+        write_summary(args.summary_json, summary, stdout)
+    if summary['failed']:
+        sys.exit(1)
+
+
+def _daemon_request(args, action, scripts):
+    # The daemon has its own working directory, so every path it is given is
+    # made absolute here; --run still executes the script in this process.
+    from .daemon import DaemonError, default_socket_path, request
+
+    options = dict(vars(args), scripts=[str(path.resolve()) for path in scripts], files_from=None)
+    if args.wheelhouse:
+        options['wheelhouse'] = os.path.abspath(args.wheelhouse)
+    try:
+        response = request(args.socket or default_socket_path(), {'op': action, 'options': options})
+    except DaemonError as e:
+        print(f"[pylock] Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    sys.stdout.write(response['output'])
+    return response['results'], response['summary']
 
-        lockfile = lm.load()
-        validate_environment(
+
+def _run_script(args, script_path):
+    with span('execute', script=str(script_path), mode='in-process' if args.in_process else args.output):
+        if args.in_process:
+            from .runner import run_script_in_process
+            return run_script_in_process(str(script_path))
+        from .runner import execute_script
+        return execute_script(str(script_path), output=args.output)
+
+
+def _generate_script(args, script_path, cache):
+    from .generator import generate
+
+    if not script_path.exists():
+        return {'status': 'error', 'error': f"File not found: {script_path}"}
+    lm = LockfileManager(script_path, lock_format=args.lock_format)
+    print(f"[pylock] Scanning {script_path.name} for imports...")
+    workers = (args.workers or os.cpu_count() or 1) if args.project else 1
+    with span('generate', script=str(script_path)):
+        result = generate(lm, script_path, project=args.project, workers=workers, cache=cache, force=args.force)
+    if result is None:
+        print(f"[pylock] No changes since the last --generate; {lm.lockfile_path.name} is up to date (use --force to rebuild).")
+        return {'status': 'unchanged', 'lockfile': str(lm.lockfile_path)}
+    deps, unbound_symbols, files, rescanned = result
+    if args.project:
+        print(f"[pylock] Scanned {len(files)} project files.")
+    if len(rescanned) < len(files):
+        print(f"[pylock] Re-parsed {len(rescanned)} changed files; reused {len(files) - len(rescanned)} unchanged.")
+    print(f"[pylock] Found {len(unbound_symbols)} unbound symbols.")
+    for sym in unbound_symbols:
+        print(f"[pylock.CRIT] Unbound Symbol: {sym.name} at {sym.file}:{sym.line} - Add `import {sym.name}` to {sym.file} resolve.")
+    print(f"[pylock] Lockfile generated for {script_path.name} with {len(deps)} dependencies.")
+    return {
+        'status': 'generated',
+        'lockfile': str(lm.lockfile_path),
+        'dependencies': len(deps),
+        'unbound': [f"{sym.file}:{sym.line}:{sym.name}" for sym in unbound_symbols],
+        'files': len(files),
+        'rescanned': len(rescanned),
+    }
+
+
+def _validate_script(args, script_path, cache=None, load=None):
+    from .generator import is_stale
+    from .validator import validate_environment
+
+    if not script_path.exists():
+        return {'status': 'error', 'error': f"File not found: {script_path}"}
+    lm = LockfileManager(script_path, lock_format=args.lock_format)
+    if not lm.exists():
+        return {'status': 'error',
+                'error': f"No lockfile found for {script_path.name}. Please run with --generate first."}
+
+    lockfile = load(lm) if load else lm.load()
+    if args.run and is_stale(lm, script_path, lockfile):
+        from .generator import refresh_lockfile
+        if cache is None and not args.no_cache:
+            from .scancache import ScanCache
+            cache = ScanCache()
+        lockfile = refresh_lockfile(lm, script_path, lockfile, cache=cache)
+    with span('validate', script=str(script_path)):
+        environment = validate_environment(
             lockfile,
             strict=args.strict,
             interactive=not args.non_interactive,
             on_error=args.on_error,
-            fix_missing=args.fix_missing
+            fix_missing=args.fix_missing,
+            batch_install=args.batch_install,
+            jobs=args.jobs,
+            pip_fallback=args.pip_fallback,
+            revalidate=args.revalidate,
+            transitive=args.transitive,
+            check_hashes=args.verify_hashes,
+            wheelhouse=args.wheelhouse
         )
-        if args.run:
-            execute_script(args.script)
-        print(f"[pylock.DBG] Total Time Spent: {time() - gtime:.8f} seconds")
-        print(f"If this helped you save time, please star or sponsor me: https://github.com/nuclear-treestump/pylock-dependency-lockfile")
-        return
-
-    print("[pylock] No action specified. Use --generate, --validate, or --run.\n")
-    parser.print_help()
+    if environment:
+        lm.record_environment(environment)
+    # `passed with warnings` (on-error warn/skip) records no fingerprint.
+    return {'status': 'passed' if environment else 'warned', 'lockfile': str(lm.lockfile_path),
+            'dependencies': len(lockfile['deps'])}
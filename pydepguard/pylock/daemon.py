@@ -0,0 +1,271 @@
+import json
+import os
+import socket
+import sys
+import threading
+from pathlib import Path
+from time import monotonic, sleep
+from .cache import user_cache_dir
+
+# `pylock serve` keeps the distribution index, environment snapshot, scan
+# results and parsed lockfiles in memory and answers requests over a Unix
+# domain socket. Each request and each response is one line of JSON:
+#   {"op": "ping" | "stats" | "generate" | "validate" | "shutdown", ...}
+#   {"ok": true, ...} or {"ok": false, "error": "..."}
+# generate/validate carry the client's parsed options (script paths already
+# expanded and absolute) and return the per-script results plus the log the
+# client would have printed.
+
+PROTOCOL_VERSION = 1
+DEFAULT_POLL_SECONDS = 2.0
+
+
+class DaemonError(Exception):
+    pass
+
+
+def default_socket_path() -> Path:
+    override = os.environ.get("PYLOCK_SOCKET")
+    if override:
+        return Path(override)
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    return Path(runtime) / "pylock.sock" if runtime else user_cache_dir() / "pylock.sock"
+
+
+def _send(sock, message: dict):
+    sock.sendall(json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n')
+
+
+def request(path, message: dict) -> dict:
+    # The thin client: one connection per call, no pylock state loaded.
+    if not hasattr(socket, 'AF_UNIX'):
+        raise DaemonError("the pylock daemon needs Unix domain sockets")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError as e:
+            raise DaemonError(f"No pylock daemon at {path} ({e.strerror}); start one with `pylock serve`") from e
+        _send(sock, dict(message, version=PROTOCOL_VERSION, executable=sys.executable))
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise DaemonError("The pylock daemon closed the connection without answering")
+    response = json.loads(line)
+    if not response.get('ok'):
+        raise DaemonError(response.get('error', 'request failed'))
+    return response
+
+
+class _LockfileCache:
+    # Parsed JSON lockfiles, reused while the file's (mtime, size) holds.
+    # Binary lockfiles are memory-mapped and decoded lazily, so they are
+    # loaded per request instead.
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def load(self, lm):
+        if lm.lock_format != 'json':
+            return lm.load()
+        stat = os.stat(lm.lockfile_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        path = str(lm.lockfile_path.resolve())
+        with self.lock:
+            cached = self.entries.get(path)
+        if cached is None or cached[0] != key:
+            cached = (key, lm.load())
+            with self.lock:
+                self.entries[path] = cached
+        lm.lockfile = cached[1]
+        return cached[1]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class PylockServer:
+    def __init__(self, path, poll: float = DEFAULT_POLL_SECONDS, no_cache: bool = False):
+        self.path = Path(path)
+        self.poll = poll
+        self.started = monotonic()
+        self.requests = 0
+        self.lockfiles = _LockfileCache()
+        self.scan_cache = None
+        if not no_cache:
+            from .scancache import MemoryScanCache
+            self.scan_cache = MemoryScanCache()
+        self.script_locks = {}
+        self.script_locks_guard = threading.Lock()
+        self.install_lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.server = None
+        self.output = None
+
+    def warm(self):
+        from . import resolver, utils
+        from .distindex import environment_signature, get_distribution_index
+        from .snapshot import get_snapshot
+
+        # Answers memoized for the previous environment can never be hit again.
+        resolver.clear_classification_cache()
+        resolver._installed_requirements.cache_clear()
+        utils._distribution_info.cache_clear()
+        self.signature = environment_signature()
+        get_snapshot()
+        get_distribution_index()
+
+    def watch(self):
+        # Polls the site-packages signature (directory mtimes, one stat per
+        # path) and rebuilds the snapshot and index before the next request
+        # needs them. Script changes are caught per request by is_stale().
+        from .distindex import environment_signature
+
+        while not self.stopping.wait(self.poll):
+            signature = environment_signature()
+            if signature != self.signature:
+                print("[pylock] Installed packages changed; refreshing caches.")
+                try:
+                    self.warm()
+                except Exception as e:
+                    print(f"[pylock.WARN] Cache refresh failed: {e}")
+
+    def _script_lock(self, script) -> threading.Lock:
+        with self.script_locks_guard:
+            return self.script_locks.setdefault(str(script), threading.Lock())
+
+    def handle(self, message: dict) -> dict:
+        op = message.get('op')
+        if message.get('version') != PROTOCOL_VERSION:
+            return {'ok': False, 'error': f"Protocol version mismatch (daemon speaks {PROTOCOL_VERSION})"}
+        if op == 'ping':
+            return {'ok': True, 'pid': os.getpid(), 'executable': sys.executable}
+        if op == 'stats':
+            return {'ok': True, 'pid': os.getpid(), 'uptime': round(monotonic() - self.started, 3),
+                    'requests': self.requests, 'lockfiles': len(self.lockfiles),
+                    'scan_entries': len(self.scan_cache.memory) if self.scan_cache else 0}
+        if op == 'shutdown':
+            self.stopping.set()
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {'ok': True}
+        if op in ('generate', 'validate'):
+            # Validation runs against this interpreter's site-packages.
+            if message.get('executable') != sys.executable:
+                return {'ok': False, 'error': f"This daemon validates {sys.executable}, not {message.get('executable')}"}
+            return self.run(op, message.get('options', {}))
+        return {'ok': False, 'error': f"Unknown op: {op!r}"}
+
+    def run(self, op: str, options: dict) -> dict:
+        from argparse import Namespace
+        from .batch import _timed, summarize
+        from .cli import _generate_script, _validate_script
+        from .resolver import clear_classification_cache
+
+        args = Namespace(**options)
+        args.non_interactive = True  # nobody is at the daemon's stdin
+        scripts = [Path(script) for script in args.scripts]
+
+        def task(script_path):
+            with self._script_lock(script_path):
+                # Files may have been added or removed next to the script
+                # since the last request.
+                clear_classification_cache(script_path.parent)
+                if op == 'generate':
+                    return _generate_script(args, script_path, self.scan_cache)
+                validate = lambda: _validate_script(args, script_path, cache=self.scan_cache, load=self.lockfiles.load)
+                if args.fix_missing:
+                    with self.install_lock:
+                        return validate()
+                return validate()
+
+        start = monotonic()
+        results, output = self.output.collect(lambda: [_timed(task, script) for script in scripts])
+        self.requests += 1
+        return {'ok': True, 'results': results, 'output': output,
+                'summary': summarize(op, results, monotonic() - start)}
+
+    def serve(self):
+        import socketserver
+        from .batch import ThreadOutput
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        response = daemon.handle(json.loads(line))
+                    except Exception as e:
+                        response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                    _send(self.connection, response)
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        self._claim_socket()
+        self.output = sys.stdout = ThreadOutput(sys.stdout)
+        self.warm()
+        old_umask = os.umask(0o177)  # socket is owner-only
+        try:
+            self.server = Server(str(self.path), Handler)
+        finally:
+            os.umask(old_umask)
+        threading.Thread(target=self.watch, daemon=True).start()
+        print(f"[pylock] Serving on {self.path} (pid {os.getpid()})")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stopping.set()
+            self.server.server_close()
+            sys.stdout = self.output.stream
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+            print("[pylock] Daemon stopped.")
+
+    def _claim_socket(self):
+        # A leftover socket file from a crashed daemon is removed; a live
+        # daemon on the same path is an error.
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            return
+        try:
+            request(self.path, {'op': 'ping'})
+        except DaemonError:
+            self.path.unlink()
+            return
+        raise DaemonError(f"A pylock daemon is already serving {self.path}")
+
+
+def wait_until_ready(path, timeout: float = 10.0):
+    deadline = monotonic() + timeout
+    while True:
+        try:
+            return request(path, {'op': 'ping'})
+        except DaemonError:
+            if monotonic() > deadline:
+                raise
+            sleep(0.05)
+
+
+def serve_main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="pylock serve",
+                                     description="Keep pylock's caches warm and answer requests over a Unix socket.")
+    parser.add_argument('--socket', default=str(default_socket_path()))
+    parser.add_argument('--poll', type=float, default=DEFAULT_POLL_SECONDS,
+                        help="Seconds between checks of the installed packages")
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, 'AF_UNIX'):
+        print("[pylock] Error: pylock serve needs Unix domain sockets", file=sys.stderr)
+        sys.exit(1)
+    try:
+        PylockServer(args.socket, poll=args.poll, no_cache=args.no_cache).serve()
+    except DaemonError as e:
+        print(f"[pylock] Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -1,7 +1,11 @@
 import ast
 import builtins
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
 from dataclasses import dataclass
+from .profiling import span
 
 @dataclass
 class ImportReference:
@@ -18,113 +22,441 @@ class SymbolReference:
     line: int
     context: str
 
-def scan_script_for_imports(filepath: Path) -> tuple[list[ImportReference], list[SymbolReference]]:
-    refs = []
-    used_references = []
-    declared_symbols = set()
-    BUILTIN_SYMBOLS = set(dir(builtins))
-
-    with open(filepath, 'r', encoding='utf-8') as f:
-        try:
-            tree = ast.parse(f.read(), filename=str(filepath))
-        except SyntaxError as e:
-            print(f"[ERROR] Failed to parse {filepath}: {e}")
-            return refs, []
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                refs.append(ImportReference(
-                    module=alias.name,
-                    file=str(filepath),
-                    line=node.lineno,
-                    import_type='import',
-                    imported_symbols=[alias.asname] if alias.asname else []
-                ))
-                declared_symbols.add(alias.asname or alias.name.split('.')[0])
-
-        elif isinstance(node, ast.ImportFrom):
-            if node.level and not node.module:
-                module = '.' * node.level
-                symbols = [alias.name for alias in node.names]
+# Bump whenever scan results change for the same source so cached scans are discarded.
+SCANNER_VERSION = 2
+
+def scan_script_for_imports(filepath: Path, cache=None) -> tuple[list[ImportReference], list[SymbolReference]]:
+    with open(filepath, 'rb') as f:
+        data = f.read()
+
+    key = None
+    if cache is not None:
+        key = cache.key(data)
+        compact = cache.get(key)
+        if compact is not None:
+            return _expand_compact(filepath, compact)
+
+    try:
+        refs, unbound = scan_source_for_imports(data.decode('utf-8'), filepath)
+    except SyntaxError as e:
+        print(f"[ERROR] Failed to parse {filepath}: {e}")
+        return [], []
+
+    if cache is not None:
+        cache.put(key, _compact(refs, unbound))
+    return refs, unbound
+
+BUILTIN_SYMBOLS = frozenset(dir(builtins))
+
+# Names every module, class body or method can see without defining them.
+IMPLICIT_SYMBOLS = frozenset({
+    '__file__', '__cached__', '__builtins__', '__annotations__', '__path__',
+    '__qualname__', '__module__', '__class__',
+})
+
+
+class _Scope:
+    __slots__ = ('kind', 'parent', 'declared', 'uses', 'globals', 'star')
+
+    def __init__(self, kind: str, parent: '_Scope' = None):
+        self.kind = kind
+        self.parent = parent
+        self.declared = set()
+        self.uses = {}
+        self.globals = set()
+        self.star = False
+
+    def enclosing(self) -> '_Scope':
+        # Class bodies are invisible to the scopes nested inside them.
+        scope = self.parent
+        while scope is not None and scope.kind == 'class':
+            scope = scope.parent
+        return scope
+
+
+class _ImportScanner(ast.NodeVisitor):
+    def __init__(self, filepath: Path):
+        self.file = str(filepath)
+        self.refs = []
+        self.module_scope = _Scope('module')
+        self.scope = self.module_scope
+        self.unbound = {}
+
+    # -- scope bookkeeping -------------------------------------------------
+
+    def _bind(self, name: str, scope: _Scope = None):
+        scope = scope or self.scope
+        if name in scope.globals:
+            scope = self.module_scope
+        scope.declared.add(name)
+
+    def _use(self, name: str, line: int, context: str, scope: _Scope = None):
+        scope = scope or self.scope
+        if name in scope.globals:
+            scope = self.module_scope
+        seen = scope.uses.get(name)
+        if seen is None or line < seen[0]:
+            scope.uses[name] = (line, context)
+
+    def _push(self, kind: str):
+        self.scope = _Scope(kind, self.scope)
+
+    def _pop(self):
+        scope = self.scope
+        self.scope = scope.parent
+        self._resolve(scope)
+
+    def _resolve(self, scope: _Scope):
+        # Resolution waits until a scope is closed so later definitions (for
+        # example a helper defined below its caller) are already known.
+        target = scope.enclosing()
+        for name, (line, context) in scope.uses.items():
+            if name in scope.declared:
+                continue
+            if target is not None:
+                self._use(name, line, context, target)
+            elif not scope.star and name not in BUILTIN_SYMBOLS and name not in IMPLICIT_SYMBOLS:
+                self.unbound[name] = (line, context)
+
+    def _bind_arguments(self, args: ast.arguments):
+        for arg in (*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg):
+            if arg is not None:
+                self._bind(arg.arg)
+
+    def _visit_signature(self, args: ast.arguments, returns=None):
+        # Defaults and annotations are evaluated in the enclosing scope.
+        for default in (*args.defaults, *args.kw_defaults):
+            if default is not None:
+                self.visit(default)
+        for arg in (*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg):
+            if arg is not None and arg.annotation is not None:
+                self.visit(arg.annotation)
+        if returns is not None:
+            self.visit(returns)
+
+    def _add_ref(self, module: str, line: int, import_type: str, symbols: list[str]):
+        self.refs.append(ImportReference(
+            module=module,
+            file=self.file,
+            line=line,
+            import_type=import_type,
+            imported_symbols=symbols
+        ))
+
+    def scan(self, tree: ast.AST) -> tuple[list[ImportReference], list[SymbolReference]]:
+        self.visit(tree)
+        self._resolve(self.module_scope)
+        unbound = [
+            SymbolReference(name=name, file=self.file, line=line, context=context)
+            for name, (line, context) in self.unbound.items()
+        ]
+        unbound.sort(key=lambda ref: ref.line)
+        return self.refs, unbound
+
+    # -- imports -----------------------------------------------------------
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self._add_ref(alias.name, node.lineno, 'import', [alias.asname] if alias.asname else [])
+            self._bind(alias.asname or alias.name.split('.')[0])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.level and not node.module:
+            module = '.' * node.level
+        else:
+            module = f"{'.' * node.level}{node.module}" if node.level else node.module
+        self._add_ref(module, node.lineno, 'from', [alias.name for alias in node.names])
+        for alias in node.names:
+            if alias.name == '*':
+                self.scope.star = True
             else:
-                module = f"{'.' * node.level}{node.module}" if node.level else node.module
-                symbols = [alias.name for alias in node.names]
-
-            refs.append(ImportReference(
-                module=module,
-                file=str(filepath),
-                line=node.lineno,
-                import_type='from',
-                imported_symbols=symbols
-            ))
-            declared_symbols.update(symbols)
-
-        elif isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and node.func.id == '__import__':
-                if len(node.args) >= 1 and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
-                    refs.append(ImportReference(
-                        module=node.args[0].value,
-                        file=str(filepath),
-                        line=node.lineno,
-                        import_type='dynamic',
-                        imported_symbols=[]
-                    ))
-                    declared_symbols.add(node.args[0].value)
-
-            elif isinstance(node.func, ast.Attribute) and node.func.attr == 'import_module':
-                if hasattr(node.func.value, 'id') and node.func.value.id == 'importlib':
-                    if len(node.args) >= 1 and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
-                        refs.append(ImportReference(
-                            module=node.args[0].value,
-                            file=str(filepath),
-                            line=node.lineno,
-                            import_type='dynamic',
-                            imported_symbols=[]
-                        ))
-                        declared_symbols.add(node.args[0].value)
-
-        elif isinstance(node, ast.Name):
-            if isinstance(node.ctx, ast.Load):
-                used_references.append(SymbolReference(
-                    name=node.id,
-                    file=str(filepath),
-                    line=node.lineno,
-                    context='load'
-                ))
-
-        elif isinstance(node, ast.Attribute):
-            if isinstance(node.value, ast.Name):
-                used_references.append(SymbolReference(
-                    name=node.value.id,
-                    file=str(filepath),
-                    line=node.lineno,
-                    context='attribute'
-                ))
-
-        elif isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    declared_symbols.add(target.id)
-
-        elif isinstance(node, ast.With):
-            for item in node.items:
-                if item.optional_vars and isinstance(item.optional_vars, ast.Name):
-                    declared_symbols.add(item.optional_vars.id)
-
-    imported_modules = {ref.module.split('.')[0] for ref in refs}
-    imported_aliases = {
-        sym for ref in refs if ref.imported_symbols
-        for sym in ref.imported_symbols
-    }
-    all_imported = imported_modules.union(imported_aliases)
-    all_known = all_imported.union(declared_symbols).union(BUILTIN_SYMBOLS)
-
-    seen = set()
-    unbound_symbols = []
-    for ref in used_references:
-        if ref.name not in all_known and ref.name not in seen:
-            unbound_symbols.append(ref)
-            seen.add(ref.name)
+                self._bind(alias.asname or alias.name)
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        is_dunder = isinstance(func, ast.Name) and func.id == '__import__'
+        is_importlib = (
+            isinstance(func, ast.Attribute) and func.attr == 'import_module'
+            and isinstance(func.value, ast.Name) and func.value.id == 'importlib'
+        )
+        if (is_dunder or is_importlib) and node.args:
+            arg = node.args[0]
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                self._add_ref(arg.value, node.lineno, 'dynamic', [])
+                self.module_scope.declared.add(arg.value)
+        self.generic_visit(node)
+
+    # -- names -------------------------------------------------------------
+
+    def visit_Name(self, node: ast.Name):
+        if isinstance(node.ctx, ast.Load):
+            self._use(node.id, node.lineno, 'load')
+        elif isinstance(node.ctx, ast.Store):
+            self._bind(node.id)
+
+    def visit_Attribute(self, node: ast.Attribute):
+        if isinstance(node.value, ast.Name) and isinstance(node.value.ctx, ast.Load):
+            self._use(node.value.id, node.lineno, 'attribute')
+        else:
+            self.visit(node.value)
+
+    def visit_Global(self, node: ast.Global):
+        self.scope.globals.update(node.names)
+
+    def visit_Nonlocal(self, node: ast.Nonlocal):
+        self.scope.declared.update(node.names)
+
+    def visit_NamedExpr(self, node: ast.NamedExpr):
+        self.visit(node.value)
+        scope = self.scope
+        while scope.kind == 'comprehension':
+            scope = scope.parent
+        self._bind(node.target.id, scope)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        if node.name:
+            self._bind(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchAs(self, node):
+        if node.name:
+            self._bind(node.name)
+        self.generic_visit(node)
 
-    return refs, unbound_symbols
+    def visit_MatchStar(self, node):
+        if node.name:
+            self._bind(node.name)
+
+    def visit_MatchMapping(self, node):
+        if node.rest:
+            self._bind(node.rest)
+        self.generic_visit(node)
+
+    # -- scopes ------------------------------------------------------------
+
+    def _visit_function(self, node):
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self._visit_signature(node.args, node.returns)
+        self._bind(node.name)
+        self._push('function')
+        for param in getattr(node, 'type_params', ()):
+            self._bind(param.name)
+        self._bind_arguments(node.args)
+        for stmt in node.body:
+            self.visit(stmt)
+        self._pop()
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def visit_Lambda(self, node: ast.Lambda):
+        self._visit_signature(node.args)
+        self._push('function')
+        self._bind_arguments(node.args)
+        self.visit(node.body)
+        self._pop()
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        for expr in (*node.decorator_list, *node.bases, *node.keywords):
+            self.visit(expr)
+        self._bind(node.name)
+        self._push('class')
+        for param in getattr(node, 'type_params', ()):
+            self._bind(param.name)
+        for stmt in node.body:
+            self.visit(stmt)
+        self._pop()
+
+    def _visit_comprehension(self, node):
+        generators = node.generators
+        # The first iterable is evaluated in the enclosing scope.
+        self.visit(generators[0].iter)
+        self._push('comprehension')
+        for i, generator in enumerate(generators):
+            if i:
+                self.visit(generator.iter)
+            self.visit(generator.target)
+            for condition in generator.ifs:
+                self.visit(condition)
+        if isinstance(node, ast.DictComp):
+            self.visit(node.key)
+            self.visit(node.value)
+        else:
+            self.visit(node.elt)
+        self._pop()
+
+    visit_ListComp = _visit_comprehension
+    visit_SetComp = _visit_comprehension
+    visit_GeneratorExp = _visit_comprehension
+    visit_DictComp = _visit_comprehension
+
+
+def scan_source_for_imports(source: str, filepath: Path) -> tuple[list[ImportReference], list[SymbolReference]]:
+    with span('parse', file=str(filepath)):
+        tree = ast.parse(source, filename=str(filepath))
+    with span('symbols', file=str(filepath)):
+        return _ImportScanner(filepath).scan(tree)
+
+
+def is_package_dir(path: Path) -> bool:
+    # The one rule for "this directory is a local package": a regular package
+    # (__init__.py) or a namespace package with at least one module in it. A
+    # plain data directory does not shadow an installed package.
+    return path.is_dir() and ((path / '__init__.py').is_file() or any(path.glob('*.py')))
+
+
+def _module_files(base: Path, dotted: str) -> list[Path] | None:
+    # Files executed when importing `dotted` relative to `base`, or None when
+    # nothing by that name lives under `base`.
+    parts = dotted.split('.') if dotted else []
+    files = []
+    current = base
+    for i, part in enumerate(parts):
+        current = current / part
+        module_file = current.parent / f"{part}.py"
+        init = current / '__init__.py'
+        if init.is_file():
+            files.append(init)
+        elif module_file.is_file():
+            files.append(module_file)
+            return files
+        elif is_package_dir(current):
+            continue  # namespace package: nothing runs on import
+        elif i == 0:
+            return None
+        else:
+            # `import pkg.attr` style reference to something that is not a submodule.
+            return files
+    return files
+
+
+def _local_import_targets(ref: ImportReference, filepath: Path, root: Path) -> list[Path] | None:
+    if ref.module.startswith('.'):
+        level = len(ref.module) - len(ref.module.lstrip('.'))
+        base = filepath.parent
+        for _ in range(level - 1):
+            base = base.parent
+        name = ref.module[level:]
+        targets = _module_files(base, name) or []
+        if not name:
+            init = base / '__init__.py'
+            if init.is_file():
+                targets.append(init)
+        package = base.joinpath(*name.split('.')) if name else base
+        for symbol in ref.imported_symbols or []:
+            targets.extend(_module_files(package, symbol) or [])
+        return targets
+
+    # Absolute imports only resolve against the project root, which is what
+    # Python puts on sys.path when the entry script runs.
+    targets = _module_files(root, ref.module)
+    if targets is not None and ref.import_type == 'from':
+        package = root.joinpath(*ref.module.split('.'))
+        for symbol in ref.imported_symbols or []:
+            targets.extend(_module_files(package, symbol) or [])
+    return targets
+
+
+def _compact(refs: list[ImportReference], unbound: list[SymbolReference]) -> tuple:
+    # Plain tuples keep pickled worker results and cache entries small; the
+    # file path is implied by the caller.
+    return (
+        [(r.module, r.line, r.import_type, tuple(r.imported_symbols or ())) for r in refs],
+        [(s.name, s.line, s.context) for s in unbound],
+    )
+
+
+def _scan_file_compact(filepath: str, cache=None) -> tuple:
+    return _compact(*scan_script_for_imports(Path(filepath), cache=cache))
+
+
+def _expand_compact(filepath: Path, compact: tuple) -> tuple[list[ImportReference], list[SymbolReference]]:
+    file = str(filepath)
+    refs = [
+        ImportReference(module=module, file=file, line=line, import_type=import_type, imported_symbols=list(symbols))
+        for module, line, import_type, symbols in compact[0]
+    ]
+    unbound = [SymbolReference(name=name, file=file, line=line, context=context) for name, line, context in compact[1]]
+    return refs, unbound
+
+
+@contextmanager
+def _file_scanner(workers: int = 1, cache=None):
+    if not workers or workers <= 1:
+        yield lambda paths: [scan_script_for_imports(path, cache=cache) for path in paths]
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def scan(paths):
+            if len(paths) == 1:
+                return [scan_script_for_imports(paths[0], cache=cache)]
+            chunksize = max(1, len(paths) // (workers * 4))
+            results = pool.map(partial(_scan_file_compact, cache=cache), [str(path) for path in paths], chunksize=chunksize)
+            return [_expand_compact(path, compact) for path, compact in zip(paths, results)]
+        yield scan
+
+
+def scan_files_for_imports(paths: list[Path], workers: int = 1, cache=None) -> dict[Path, tuple[list[ImportReference], list[SymbolReference]]]:
+    paths = [Path(path) for path in paths]
+    with span('scan', files=len(paths), workers=workers), _file_scanner(workers, cache) as scan:
+        return dict(zip(paths, scan(paths)))
+
+
+def walk_project_imports(entry: Path, root: Path = None, workers: int = 1, cache=None, recorded=None, follow: bool = True):
+    # Yields (path, refs, external refs, unbound symbols) for the entry and,
+    # with `follow`, every project file it reaches through local imports.
+    # `recorded(path)` may return the refs of a file whose earlier parse is
+    # still valid; that file is not parsed and yields None for unbound. Where
+    # imports point is always resolved against the current tree.
+    entry = Path(entry)
+    root = Path(root).resolve() if root else entry.resolve().parent
+    frontier = [entry]
+    seen = {entry}
+
+    with _file_scanner(workers, cache) as scan:
+        # Breadth-first by level so each level can be parsed in parallel while
+        # the merged output keeps the same order as a serial scan.
+        while frontier:
+            known = {}
+            for filepath in list(frontier):
+                try:
+                    file_refs = recorded(filepath) if recorded else None
+                except FileNotFoundError:
+                    if filepath == entry:
+                        raise
+                    frontier.remove(filepath)  # removed since its importer was resolved
+                    continue
+                known[filepath] = None if file_refs is None else (file_refs, None)
+            to_scan = [filepath for filepath in frontier if known[filepath] is None]
+            if to_scan:
+                with span('scan', files=len(to_scan), workers=workers):
+                    known.update(zip(to_scan, scan(to_scan)))
+
+            next_frontier = []
+            for filepath in frontier:
+                file_refs, file_unbound = known[filepath]
+                external = []
+                for ref in file_refs:
+                    targets = _local_import_targets(ref, filepath, root) if follow else None
+                    if targets is None:
+                        external.append(ref)
+                        continue
+                    for target in targets:
+                        target = target.resolve()
+                        if target not in seen:
+                            seen.add(target)
+                            next_frontier.append(target)
+                yield filepath, file_refs, external, file_unbound
+            frontier = next_frontier
+
+
+def scan_project_for_imports(entry: Path, root: Path = None, workers: int = 1, cache=None) -> tuple[list[ImportReference], list[SymbolReference], list[Path]]:
+    refs = []
+    unbound_symbols = []
+    scanned = []
+    for filepath, _, external, file_unbound in walk_project_imports(Path(entry).resolve(), root, workers, cache):
+        scanned.append(filepath)
+        refs.extend(external)
+        unbound_symbols.extend(file_unbound)
+    return refs, unbound_symbols, scanned
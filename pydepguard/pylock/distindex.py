@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from .cache import user_cache_dir
+
+INDEX_VERSION = 1
+
+_METADATA_SUFFIXES = ('.dist-info', '.egg-info', '.data')
+_EXTENSION_SUFFIXES = ('.so', '.pyd')
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def normalize_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class DistributionIndex:
+    def __init__(self, modules: dict[str, list[str]], signature: str):
+        self.modules = modules
+        self.signature = signature
+
+    def lookup(self, module_name: str) -> str | None:
+        names = self.modules.get(module_name)
+        return names[0] if names else None
+
+    def distributions_for(self, module_name: str) -> list[str]:
+        return list(self.modules.get(module_name, []))
+
+    def to_dict(self) -> dict:
+        return {'version': INDEX_VERSION, 'signature': self.signature, 'modules': self.modules}
+
+
+def search_paths() -> list[str]:
+    # Same entries importlib.metadata searches, minus the cwd, whose mtime
+    # churns with every file the user (or pylock itself) writes there. It is
+    # '' for `python -c` but an absolute path under `python -m`.
+    try:
+        cwd = os.path.realpath(os.getcwd())
+    except OSError:
+        cwd = None
+    paths = []
+    for entry in sys.path:
+        if entry and entry not in paths and os.path.isdir(entry) and os.path.realpath(entry) != cwd:
+            paths.append(entry)
+    return paths
+
+
+def environment_signature(paths: list[str] = None) -> str:
+    digest = hashlib.sha256(sys.executable.encode())
+    for path in paths if paths is not None else search_paths():
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        digest.update(f"\0{path}\0{mtime}".encode())
+    return digest.hexdigest()
+
+
+def index_path(paths: list[str] = None) -> Path:
+    key = "\0".join([sys.executable, *(paths if paths is not None else search_paths())])
+    return user_cache_dir() / f"distindex-{hashlib.sha256(key.encode()).hexdigest()[:16]}.json"
+
+
+def top_level_modules(dist) -> set[str]:
+    try:
+        text = dist.read_text("top_level.txt")
+    except Exception:
+        text = None
+    if text:
+        return {line.strip() for line in text.splitlines() if line.strip()}
+
+    # Wheels built by modern backends no longer ship top_level.txt; fall back
+    # to the first path component of every file listed in RECORD.
+    names = set()
+    try:
+        files = dist.files or []
+    except Exception:
+        files = []
+    for file in files:
+        parts = file.parts
+        if not parts or parts[0] in ('..', '__pycache__') or parts[0].endswith(_METADATA_SUFFIXES):
+            continue
+        top = parts[0]
+        if len(parts) == 1:
+            if top.endswith('.py'):
+                top = top[:-3]
+            elif top.endswith(_EXTENSION_SUFFIXES):
+                top = top.split('.')[0]
+            else:
+                continue
+        if top.isidentifier():
+            names.add(top)
+    return names
+
+
+def build_index(signature: str) -> DistributionIndex:
+    import importlib.metadata
+    modules = {}
+    for dist in importlib.metadata.distributions():
+        try:
+            name = dist.metadata["Name"]
+        except Exception:
+            continue
+        if not name:
+            continue
+        for module in sorted(top_level_modules(dist)):
+            owners = modules.setdefault(module, [])
+            if name not in owners:
+                owners.append(name)
+    return DistributionIndex(modules, signature)
+
+
+def _load_index(path: Path, signature: str) -> DistributionIndex | None:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != INDEX_VERSION or data.get('signature') != signature:
+        return None
+    return DistributionIndex(data.get('modules', {}), signature)
+
+
+def _write_index(path: Path, index: DistributionIndex):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index.to_dict(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[pylock.WARN] Failed to write distribution index: {e}")
+
+
+def get_distribution_index(refresh: bool = False) -> DistributionIndex:
+    global _index
+    paths = search_paths()
+    signature = environment_signature(paths)
+    with _index_lock:
+        if not refresh and _index is not None and _index.signature == signature:
+            return _index
+
+        path = index_path(paths)
+        index = None if refresh else _load_index(path, signature)
+        if index is None:
+            index = build_index(signature)
+            _write_index(path, index)
+        _index = index
+        return index
+
+
+def lookup_distribution(module_name: str) -> str | None:
+    return get_distribution_index().lookup(module_name)
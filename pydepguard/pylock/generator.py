@@ -0,0 +1,143 @@
+import hashlib
+import os
+from pathlib import Path
+from .distindex import environment_signature
+
+
+def file_state(path, recorded: dict = None) -> tuple[dict, bool]:
+    # Returns the file's (mtime_ns, size, sha256) record and whether its
+    # content differs from `recorded`. A matching stat skips hashing; a touch
+    # without edits costs one hash and is not treated as a change.
+    stat = os.stat(path)
+    if recorded and recorded.get('mtime_ns') == stat.st_mtime_ns and recorded.get('size') == stat.st_size:
+        return recorded, False
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    state = {'sha256': digest, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+    if recorded and recorded.get('sha256') == digest:
+        return dict(recorded, **state), False
+    return state, True
+
+
+def _previous_lockfile(lm):
+    if not lm.exists():
+        return None
+    try:
+        return lm.load()
+    except (OSError, ValueError) as e:
+        print(f"[pylock.WARN] Ignoring unreadable lockfile {lm.lockfile_path}: {e}")
+        return None
+
+
+def _pins(deps) -> dict:
+    return {name: info.get('version') for name, info in deps.items()}
+
+
+def generate(lm, script_path, *, project=False, workers=1, cache=None, force=False, previous=None,
+             only_if_deps_changed=False, locked=None):
+    # Returns (deps, unbound symbols, files, rescanned files), or None when no
+    # source file and no installed package changed since the last run.
+    # `previous` replaces the lockfile on disk as the baseline (--watch keeps
+    # it in memory); with `only_if_deps_changed` the file is only rewritten
+    # when a dependency or its version changed, and lm.lockfile holds the
+    # up-to-date content either way. With `locked` (a lockfile), its entries
+    # are kept exactly as pinned and only new imports are looked up.
+    from . import depscan
+    from .utils import enrich_dependencies
+
+    script_path = Path(script_path)
+    mode = 'project' if project else 'script'
+    if locked is not None:
+        # Copied before a reload can unmap a binary lockfile's deps.
+        locked = {'deps': dict(locked.get('deps', {})), 'meta': dict(locked.get('meta', {}))}
+    if previous is None:
+        previous = None if force else _previous_lockfile(lm)
+    if previous and previous.get('meta', {}).get('mode') != mode:
+        # Recorded in the other mode (or before modes were recorded): the
+        # per-file contributions do not match what this scan would produce.
+        previous = None
+    meta = previous.get('meta', {}) if previous else {}
+    recorded_sources = meta.get('sources', {})
+    signature = environment_signature()
+    # Versions and trees of already-locked packages are only reusable while
+    # the installed environment is the one they were read from.
+    same_environment = bool(previous) and meta.get('env_signature') == signature
+    known = previous['deps'] if same_environment else {}
+    saved_signature = signature
+    if locked is not None:
+        # The pins are the gate --strict checks against; what happens to be
+        # installed now must not overwrite them.
+        known = locked.get('deps', {})
+        saved_signature = locked.get('meta', {}).get('env_signature')
+
+    entry = script_path.resolve() if project else script_path
+    refs, unbound, files, rescanned = [], [], [], []
+    states, sources = {}, {}
+
+    def recorded(path):
+        # Unchanged files are not parsed again: their imports come from the
+        # lockfile and are resolved against the current tree by the walk.
+        key = lm._relative(path)
+        state, changed = file_state(path, recorded_sources.get(key))
+        states[path] = (key, state)
+        if changed or 'refs' not in state or 'unbound' not in state:
+            return None
+        return [
+            depscan.ImportReference(module=module, file=str(path), line=line, import_type=import_type,
+                                    imported_symbols=symbols)
+            for module, line, import_type, symbols in state['refs']
+        ]
+
+    walk = depscan.walk_project_imports(entry, script_path.parent.resolve(), workers=workers, cache=cache,
+                                        recorded=recorded, follow=project)
+    for path, file_refs, external, file_unbound in walk:
+        key, state = states[path]
+        files.append(path)
+        if file_unbound is not None:
+            rescanned.append(path)
+            state = dict(state, refs=[[ref.module, ref.line, ref.import_type, list(ref.imported_symbols or [])]
+                                      for ref in file_refs],
+                         unbound=[[sym.name, sym.line, sym.context] for sym in file_unbound])
+        else:
+            # Findings are part of the file's contribution, reused or not.
+            file_unbound = [depscan.SymbolReference(name=name, file=str(path), line=line, context=context)
+                            for name, line, context in state['unbound']]
+        unbound.extend(file_unbound)
+        sources[key] = state
+        refs.extend(external)
+
+    if same_environment and sources == recorded_sources:
+        return None
+
+    deps = enrich_dependencies(refs, project_root=script_path.parent, known=known)
+    write = not (only_if_deps_changed and previous and _pins(previous['deps']) == _pins(deps))
+    lm.save(deps, files=files if project else None, sources=sources, env_signature=saved_signature, mode=mode,
+            write=write)
+    return deps, unbound, files, rescanned
+
+
+def is_stale(lm, script_path, lockfile) -> bool:
+    # One stat (plus a hash when the stat moved) on the common path.
+    recorded = lockfile.get('meta', {}).get('sources', {}).get(lm._relative(script_path))
+    return file_state(script_path, recorded)[1]
+
+
+def refresh_lockfile(lm, script_path, lockfile, cache=None):
+    script_path = Path(script_path)
+    meta = lockfile.get('meta', {})
+    print(f"[pylock] {script_path.name} changed since its lockfile was generated; rescanning.")
+    before = _pins(lockfile.get('deps', {}))
+    generate(lm, script_path, project=meta.get('mode') == 'project' or 'files' in meta, cache=cache,
+             locked=lockfile)
+    refreshed = lm.lockfile if lm.lockfile is not None else lm.load()
+    after = _pins(refreshed['deps'])
+    added = sorted(set(after) - set(before))
+    removed = sorted(set(before) - set(after))
+    bumped = sorted(f"{name} {before[name]} -> {after[name]}"
+                    for name in set(after) & set(before) if after[name] != before[name])
+    for label, names in (("New dependencies", added), ("No longer imported", removed), ("Version changed", bumped)):
+        if names:
+            print(f"[pylock] {label}: {', '.join(names)}")
+    if after == before:
+        print("[pylock] Dependency set unchanged.")
+    return refreshed
@@ -2,26 +2,61 @@ import json
 import os
 from pathlib import Path
 from datetime import datetime, timezone
+from . import binlock
+from .profiling import span
+
+LOCK_FORMATS = ('json', 'binary')
+_LOCK_SUFFIXES = {'json': '.lck', 'binary': '.lckb'}
 
 class LockfileManager:
-    def __init__(self, script_path):
+    def __init__(self, script_path, lock_format='json'):
+        if lock_format not in LOCK_FORMATS:
+            raise ValueError(f"[pylock] Unknown lockfile format: {lock_format}")
         self.script_path = Path(script_path)
         self.script_name = self.script_path.stem
-        self.lockfile_name = f"{self.script_name}_dep.lck"
+        self.lock_format = lock_format
         self.lockfile_dir = self.script_path.parent / ".pylock"
         self.lockfile_dir.mkdir(exist_ok=True)
+        self.lockfile_name = self._name(lock_format)
         self.lockfile_path = self.lockfile_dir / self.lockfile_name
         self.lockfile = None
 
+    def _name(self, lock_format):
+        return f"{self.script_name}_dep{_LOCK_SUFFIXES[lock_format]}"
+
     def exists(self):
         return self.lockfile_path.exists()
 
     def load(self):
-        with open(self.lockfile_path, 'r') as f:
-            self.lockfile = json.load(f)
+        self.close()
+        with span('lockfile.load', path=str(self.lockfile_path)):
+            if self.lock_format == 'binary':
+                # deps is a read-only mapping over the mmapped file; entries are
+                # decoded on first access.
+                self.lockfile = binlock.load(self.lockfile_path)
+            else:
+                with open(self.lockfile_path, 'r') as f:
+                    self.lockfile = json.load(f)
         return self.lockfile
 
-    def save(self, deps_info):
+    def close(self):
+        if self.lockfile is not None and isinstance(self.lockfile.get('deps'), binlock.LazyDeps):
+            self.lockfile['deps'].close()
+            self.lockfile = None
+
+    def convert(self):
+        # Rewrites the lockfile kept in the other format into this one.
+        source = self.lockfile_dir / self._name('json' if self.lock_format == 'binary' else 'binary')
+        if not source.exists():
+            raise FileNotFoundError(source)
+        self.close()
+        if self.lock_format == 'binary':
+            binlock.json_to_binary(source, self.lockfile_path)
+        else:
+            binlock.binary_to_json(source, self.lockfile_path)
+        return self.lockfile_path
+
+    def save(self, deps_info, files=None, sources=None, env_signature=None, mode=None, write=True):
         enriched_deps = {}
         for dep, info in deps_info.items():
             enriched_deps[dep] = {
@@ -29,6 +64,16 @@ class LockfileManager:
                 'origin': info.get('origin', 'unknown'),
                 'tree': info.get('tree', [])
             }
+            if info.get('origins'):
+                enriched_deps[dep]['origins'] = list(info['origins'])
+            if info.get('transitive'):
+                enriched_deps[dep]['transitive'] = dict(info['transitive'])
+            if info.get('digest'):
+                # Digest of the dist's RECORD; --verify-hashes checks files against it.
+                enriched_deps[dep]['digest'] = info['digest']
+            if info.get('distribution'):
+                # The dist the version was read from, so --fix-missing installs that one.
+                enriched_deps[dep]['distribution'] = info['distribution']
 
         lockfile_content = {
             'meta': {
@@ -39,6 +84,58 @@ class LockfileManager:
             },
             'deps': enriched_deps
         }
-        with open(self.lockfile_path, 'w') as f:
-            json.dump(lockfile_content, f, indent=4)
-        print(f"Generated new lockfile: {self.lockfile_path}")
\ No newline at end of file
+        if files:
+            lockfile_content['meta']['files'] = [self._relative(path) for path in files]
+        if sources:
+            # Per-file content hashes and contributions for incremental --generate.
+            lockfile_content['meta']['sources'] = sources
+        if env_signature:
+            lockfile_content['meta']['env_signature'] = env_signature
+        if mode:
+            # 'project' or 'script'; sources recorded in one mode are not reused by the other.
+            lockfile_content['meta']['mode'] = mode
+        if not write:
+            self.lockfile = lockfile_content
+            return
+        self._write(lockfile_content)
+        print(f"Generated new lockfile: {self.lockfile_path}")
+
+    def record_environment(self, environment):
+        lockfile = self.lockfile if self.lockfile is not None else self.load()
+        meta = lockfile.setdefault('meta', {})
+        if meta.get('environment') == environment:
+            return
+        meta['environment'] = environment
+        try:
+            self._write(lockfile)
+        except OSError as e:
+            # Only the next run's fast path is lost; validation itself passed.
+            print(f"[pylock.WARN] Could not record the validated environment in {self.lockfile_path}: {e}")
+
+    def _relative(self, path):
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.script_path.parent.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _write(self, lockfile_content):
+        with span('lockfile.write', path=str(self.lockfile_path)):
+            if self.lock_format == 'binary':
+                # Materialize before unmapping the file we are about to replace.
+                lockfile_content = binlock.to_json(lockfile_content)
+                self.close()
+                binlock.write(self.lockfile_path, lockfile_content)
+            else:
+                # Written beside the lockfile and renamed over it, so readers
+                # (--run, the daemon, a second --watch) never see a partial file.
+                tmp_path = self.lockfile_path.with_name(f"{self.lockfile_name}.{os.getpid()}.tmp")
+                try:
+                    with open(tmp_path, 'w') as f:
+                        json.dump(lockfile_content, f, indent=4)
+                    os.replace(tmp_path, self.lockfile_path)
+                except OSError:
+                    if tmp_path.exists():
+                        tmp_path.unlink()
+                    raise
+        self.lockfile = lockfile_content
\ No newline at end of file
@@ -0,0 +1,214 @@
+import os
+import platform
+import re
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
+from .distindex import normalize_name
+
+# Minimal PEP 508 support: enough to read the Requires-Dist entries of
+# installed distributions without depending on `packaging`.
+
+_NAME_RE = re.compile(r"\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*(?:\[([^\]]*)\])?")
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<string>'[^']*'|"[^"]*")
+      | (?P<op>===|==|!=|<=|>=|~=|<|>)
+      | (?P<paren>[()])
+      | (?P<word>[A-Za-z_][A-Za-z0-9_.]*)
+    )""", re.VERBOSE)
+
+_VERSION_VARIABLES = {'python_version', 'python_full_version', 'implementation_version'}
+
+
+@dataclass(frozen=True)
+class Requirement:
+    name: str
+    extras: frozenset = field(default_factory=frozenset)
+    marker: str = ''
+
+
+def parse_requirement(text: str) -> Requirement | None:
+    spec, _, marker = text.partition(';')
+    match = _NAME_RE.match(spec)
+    if not match:
+        return None
+    extras = frozenset(normalize_name(e.strip()) for e in (match.group(2) or '').split(',') if e.strip())
+    return Requirement(name=match.group(1), extras=extras, marker=marker.strip())
+
+
+@lru_cache(maxsize=1)
+def default_environment() -> dict:
+    impl = sys.implementation.version
+    impl_version = f"{impl.major}.{impl.minor}.{impl.micro}"
+    if impl.releaselevel != 'final':
+        impl_version += f"{impl.releaselevel[0]}{impl.serial}"
+    return {
+        'implementation_name': sys.implementation.name,
+        'implementation_version': impl_version,
+        'os_name': os.name,
+        'platform_machine': platform.machine(),
+        'platform_release': platform.release(),
+        'platform_system': platform.system(),
+        'platform_version': platform.version(),
+        'platform_python_implementation': platform.python_implementation(),
+        'python_full_version': platform.python_version(),
+        'python_version': '.'.join(platform.python_version_tuple()[:2]),
+        'sys_platform': sys.platform,
+    }
+
+
+def _tokenize(marker: str) -> list[tuple[str, str]]:
+    tokens = []
+    pos = 0
+    marker = marker.rstrip()
+    while pos < len(marker):
+        match = _TOKEN_RE.match(marker, pos)
+        if not match:
+            raise ValueError(f"Invalid marker: {marker!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+def _version_key(value: str) -> tuple[int, ...] | None:
+    match = re.match(r"\d+(?:\.\d+)*", value.strip())
+    if not match:
+        return None
+    return tuple(int(part) for part in match.group(0).split('.'))
+
+
+def _compare_versions(left: str, op: str, right: str) -> bool | None:
+    if right.endswith('.*') and op in ('==', '!='):
+        prefix = _version_key(right[:-2])
+        lkey = _version_key(left)
+        if prefix is None or lkey is None:
+            return None
+        matched = lkey[:len(prefix)] == prefix
+        return matched if op == '==' else not matched
+
+    lkey, rkey = _version_key(left), _version_key(right)
+    if lkey is None or rkey is None:
+        return None
+    width = max(len(lkey), len(rkey))
+    lkey = lkey + (0,) * (width - len(lkey))
+    padded = rkey + (0,) * (width - len(rkey))
+    if op == '~=':
+        return lkey >= padded and lkey[:len(rkey) - 1] == rkey[:-1]
+    return {
+        '==': lkey == padded, '!=': lkey != padded,
+        '<': lkey < padded, '<=': lkey <= padded,
+        '>': lkey > padded, '>=': lkey >= padded,
+    }.get(op)
+
+
+def _compare(left: str, op: str, right: str, version: bool) -> bool:
+    if op == 'in':
+        return left in right
+    if op == 'not in':
+        return left not in right
+    if op == '===':
+        return left == right
+    if version:
+        result = _compare_versions(left, op, right)
+        if result is not None:
+            return result
+    if op == '==':
+        return left == right
+    if op == '!=':
+        return left != right
+    raise ValueError(f"Cannot compare {left!r} {op} {right!r}")
+
+
+class _MarkerParser:
+    def __init__(self, tokens, environment):
+        self.tokens = tokens
+        self.pos = 0
+        self.environment = environment
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self) -> bool:
+        result = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise ValueError("Unexpected trailing tokens in marker")
+        return result
+
+    def parse_or(self) -> bool:
+        result = self.parse_and()
+        while self.peek() == ('word', 'or'):
+            self.take()
+            rhs = self.parse_and()
+            result = result or rhs
+        return result
+
+    def parse_and(self) -> bool:
+        result = self.parse_atom()
+        while self.peek() == ('word', 'and'):
+            self.take()
+            rhs = self.parse_atom()
+            result = result and rhs
+        return result
+
+    def parse_atom(self) -> bool:
+        if self.peek() == ('paren', '('):
+            self.take()
+            result = self.parse_or()
+            if self.take() != ('paren', ')'):
+                raise ValueError("Unbalanced parentheses in marker")
+            return result
+
+        left, left_var = self.parse_value()
+        kind, value = self.take()
+        if kind == 'op':
+            op = value
+        elif (kind, value) == ('word', 'in'):
+            op = 'in'
+        elif (kind, value) == ('word', 'not') and self.take() == ('word', 'in'):
+            op = 'not in'
+        else:
+            raise ValueError("Expected a marker operator")
+        right, right_var = self.parse_value()
+
+        version = bool({left_var, right_var} & _VERSION_VARIABLES)
+        left_value = self.resolve(left, left_var)
+        right_value = self.resolve(right, right_var)
+        if 'extra' in (left_var, right_var):
+            left_value, right_value = normalize_name(left_value), normalize_name(right_value)
+        return _compare(left_value, op, right_value, version)
+
+    def parse_value(self):
+        kind, value = self.take()
+        if kind == 'string':
+            return value[1:-1], None
+        if kind == 'word':
+            return value, value
+        raise ValueError("Expected a marker value")
+
+    def resolve(self, value, variable):
+        if variable is None:
+            return value
+        if variable not in self.environment:
+            raise ValueError(f"Unknown marker variable: {variable}")
+        return self.environment[variable]
+
+
+def evaluate_marker(marker: str, environment: dict = None, extras=()) -> bool:
+    if not marker:
+        return True
+    env = dict(environment or default_environment())
+    tokens = _tokenize(marker)
+    # A requirement guarded by `extra == "x"` applies when any requested
+    # extra satisfies it; with no extras, `extra` is the empty string.
+    for extra in sorted(extras) or ['']:
+        env['extra'] = extra
+        if _MarkerParser(tokens, env).parse():
+            return True
+    return False
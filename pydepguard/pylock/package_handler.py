@@ -1,47 +1,47 @@
 import subprocess
 import sys
-import importlib.metadata
-import importlib.resources as resources
-import json
-import re
-from .cache import KNOWN_DEP_MAP
+from .aliases import load_aliases, lookup_alias
+from .distindex import lookup_distribution, normalize_name
+from .profiling import span
 
 
 
 def guess_distribution_name(module_name: str):
-    for dist in importlib.metadata.distributions():
-        try:
-            top_levels = dist.read_text("top_level.txt")
-            if top_levels:
-                names = [line.strip() for line in top_levels.splitlines()]
-                if module_name in names:
-                    return dist.metadata["Name"]
-        except Exception:
-            continue
-    return None
-
+    return lookup_distribution(module_name)
 
-def install_package(package: str, version: str = None, _is_retry=False):
 
-    mapped = KNOWN_DEP_MAP.get(package.lower())
+def resolve_pip_name(package: str, version: str = None, distribution: str = None) -> tuple[str, str]:
+    # `distribution` is the dist the lockfile pinned; it beats the alias
+    # table, which is only a guess and may name a different project.
+    mapped = distribution or lookup_alias(package)
 
-    if mapped and mapped.lower() != package.lower():
+    if mapped and normalize_name(mapped) != normalize_name(package):
         print(f"[pylock] Using mapped pip name: {package} → {mapped}")
         package = mapped
-        version = ""
+        if not distribution:
+            # The pin was read from whatever provided the module, which need
+            # not be the aliased project.
+            version = ""
 
     if version == "unknown":
         version = ""
 
+    return package, version
+
+
+def install_package(package: str, version: str = None, distribution: str = None, _is_retry=False):
+
+    package, version = resolve_pip_name(package, version, distribution)
     pkg = f"{package}=={version}" if version else package
 
     print(f"[pylock] Installing {pkg} ...")
 
-    result = subprocess.run(
-        [sys.executable, "-m", "pip", "install", pkg],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
+    with span('install', packages=[pkg]):
+        result = subprocess.run(
+            [sys.executable, "-m", "pip", "install", pkg],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
 
     if result.returncode == 0:
         version = extract_installed_version(result.stdout, package)
@@ -62,27 +62,112 @@ def install_package(package: str, version: str = None, _is_retry=False):
     raise RuntimeError(f"[pylock] Failed to install {package}")
 
 
-def ensure_package(module_name: str, version: str = None):
+def install_packages(packages: list[tuple[str, str]], distributions: dict = None) -> dict[str, Exception | None]:
+    outcomes = {}
+    if not packages:
+        return outcomes
+
+    distributions = distributions or {}
+    requirements = {}
+    for module, version in packages:
+        package, version = resolve_pip_name(module, version, distributions.get(module))
+        requirements[module] = (package, f"{package}=={version}" if version else package)
+    pkgs = [pkg for _, pkg in requirements.values()]
+
+    print(f"[pylock] Installing {len(pkgs)} packages in one batch: {' '.join(pkgs)} ...")
+
+    with span('install', packages=pkgs):
+        result = subprocess.run(
+            [sys.executable, "-m", "pip", "install", *pkgs],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    if result.returncode == 0:
+        for module, (package, pkg) in requirements.items():
+            version = extract_installed_version(result.stdout, package)
+            print(f"[pylock] Installed {pkg} ({version}) successfully.")
+            outcomes[module] = None
+        return outcomes
+
+    stderr = result.stderr.decode().strip()
+    print(f"[pylock] Batch installation error: {stderr}")
+    print("[pylock] Falling back to per-package installation for the remaining packages.")
+
+    for module, version in packages:
+        try:
+            ensure_package(module, version, distributions.get(module))
+            outcomes[module] = None
+        except Exception as e:
+            outcomes[module] = e
+    return outcomes
+
+
+def install_packages_offline(packages: list[tuple[str, str]], wheelhouse) -> dict[str, Exception | None]:
+    outcomes = {}
+    if not packages:
+        return outcomes
+
+    from .wheelhouse import get_wheelhouse_index, resolve_pins
+    index = get_wheelhouse_index(wheelhouse)
+    resolved, unsatisfiable = resolve_pins(index, packages)
+    # Report everything the wheelhouse cannot provide before installing anything.
+    for module, reason in unsatisfiable.items():
+        print(f"[pylock.CRIT] Not satisfiable from wheelhouse {index.directory}: {module}: {reason}")
+        outcomes[module] = RuntimeError(f"[pylock] {module} is not available in the wheelhouse")
+    if not resolved:
+        return outcomes
+
+    pkgs = [f"{wheel.name}=={wheel.version}" for wheel in resolved.values()]
+    print(f"[pylock] Installing {len(pkgs)} packages from {index.directory}: {' '.join(pkgs)} ...")
+
+    with span('install', packages=pkgs, wheelhouse=str(index.directory)):
+        result = subprocess.run(
+            [sys.executable, "-m", "pip", "install", "--no-index", "--find-links", str(index.directory), *pkgs],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    if result.returncode == 0:
+        for module, wheel in resolved.items():
+            print(f"[pylock] Installed {wheel.name}=={wheel.version} from {wheel.filename} successfully.")
+            outcomes[module] = None
+        return outcomes
+
+    # Offline means no per-package retry against an index.
+    stderr = result.stderr.decode().strip()
+    print(f"[pylock] Offline installation error: {stderr}")
+    for module in resolved:
+        outcomes[module] = RuntimeError(f"[pylock] Failed to install {module} from the wheelhouse")
+    return outcomes
+
+
+def is_importable(module_name: str) -> bool:
     try:
         __import__(module_name)
         return True
     except ImportError:
-        print(f"[pylock] {module_name} not found. Attempting install...")
-        return install_package(module_name, version)
+        return False
+
+
+def ensure_package(module_name: str, version: str = None, distribution: str = None):
+    if is_importable(module_name):
+        return True
+    print(f"[pylock] {module_name} not found. Attempting install...")
+    return install_package(module_name, version, distribution)
 
 def load_known_depmap():
-    try:
-        with resources.files("pydepguard.pylock").joinpath("known_deps.pydepcache").open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"[pylock.WARN] Failed to load known dependency map: {e}")
-        return {}
+    return load_aliases()
     
 
 def extract_installed_version(stdout: bytes, package_name: str) -> str | None:
     text = stdout.decode("utf-8")
-    pattern = rf"Successfully installed {re.escape(package_name)}-([\w\.\-]+)"
-    match = re.search(pattern, text)
-    if match:
-        return match.group(1)
-    return None
\ No newline at end of file
+    wanted = normalize_name(package_name)
+    for line in text.splitlines():
+        if not line.startswith("Successfully installed "):
+            continue
+        for item in line.split()[2:]:
+            name, _, version = item.rpartition("-")
+            if normalize_name(name) == wanted:
+                return version
+    return None
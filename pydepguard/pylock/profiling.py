@@ -0,0 +1,132 @@
+import json
+import threading
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+# Span API used across pylock. With no hook registered, span() returns a
+# shared no-op context manager, so instrumented code pays one function call.
+#
+#   from pydepguard.pylock import profiling
+#   profiling.add_hook(lambda span: metrics.timing(span.name, span.duration, **span.attrs))
+#
+# Hooks receive each finished Span on the thread that ran it. Work done in
+# --workers processes is reported as one 'scan' span by the parent.
+
+REPORT_VERSION = 1
+
+_hooks = []
+_local = threading.local()
+_NULL = nullcontext()
+
+
+class Span:
+    __slots__ = ('name', 'attrs', 'parent', 'thread', 'start', 'end')
+
+    def __init__(self, name: str, attrs: dict, parent: str | None):
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.thread = threading.current_thread().name
+        self.start = perf_counter()
+        self.end = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else perf_counter()) - self.start
+
+
+def add_hook(hook):
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    _hooks.remove(hook)
+
+
+def enabled() -> bool:
+    return bool(_hooks)
+
+
+def span(name: str, **attrs):
+    if not _hooks:
+        return _NULL
+    return _span(name, attrs)
+
+
+@contextmanager
+def _span(name, attrs):
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    current = Span(name, attrs, stack[-1].name if stack else None)
+    stack.append(current)
+    try:
+        yield current
+    finally:
+        current.end = perf_counter()
+        stack.pop()
+        for hook in list(_hooks):
+            try:
+                hook(current)
+            except Exception as e:
+                print(f"[pylock.WARN] Profiling hook {hook!r} failed: {e}")
+
+
+class Recorder:
+    # A hook that keeps every span and turns them into the --profile report.
+    def __init__(self):
+        self.started = perf_counter()
+        self.spans = []
+        self.lock = threading.Lock()
+
+    def __call__(self, finished: Span):
+        with self.lock:
+            self.spans.append(finished)
+
+    def report(self) -> dict:
+        phases = {}
+        for item in self.spans:
+            phase = phases.setdefault(item.name, {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            phase['count'] += 1
+            phase['total_seconds'] += item.duration
+            phase['max_seconds'] = max(phase['max_seconds'], item.duration)
+        for phase in phases.values():
+            phase['total_seconds'] = round(phase['total_seconds'], 6)
+            phase['max_seconds'] = round(phase['max_seconds'], 6)
+        return {
+            'version': REPORT_VERSION,
+            'total_seconds': round(perf_counter() - self.started, 6),
+            'phases': dict(sorted(phases.items(), key=lambda item: -item[1]['total_seconds'])),
+            'spans': [
+                {'name': item.name, 'parent': item.parent, 'thread': item.thread,
+                 'start': round(item.start - self.started, 6), 'seconds': round(item.duration, 6),
+                 **({'attrs': item.attrs} if item.attrs else {})}
+                for item in sorted(self.spans, key=lambda item: item.start)
+            ],
+        }
+
+
+@contextmanager
+def session(report_path: str = None, cprofile_path: str = None):
+    # Records spans (and optionally a cProfile run) for the duration of the
+    # block and writes them out even when the block exits via sys.exit.
+    recorder = Recorder() if report_path else None
+    profiler = None
+    if recorder:
+        add_hook(recorder)
+    if cprofile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield recorder
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(cprofile_path)
+            print(f"[pylock] cProfile stats written to {cprofile_path} (view with `python -m pstats`)")
+        if recorder:
+            remove_hook(recorder)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(recorder.report(), f, indent=2)
+            print(f"[pylock] Timing report written to {report_path}")
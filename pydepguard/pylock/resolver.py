@@ -1,8 +1,186 @@
+import importlib.metadata
+import os
 import sys
 import sysconfig
+from functools import lru_cache
+from pathlib import Path
+from .depscan import is_package_dir
+from .distindex import environment_signature, get_distribution_index, normalize_name, search_paths
+from .markers import default_environment, evaluate_marker, parse_requirement
+
+STDLIB = 'stdlib'
+LOCAL = 'local'
+THIRD_PARTY = 'third-party'
+UNRESOLVABLE = 'unresolvable'
+
+STDLIB_MODULES = frozenset(sys.stdlib_module_names) | frozenset(sys.builtin_module_names)
+
+_EXTENSION_SUFFIXES = ('.so', '.pyd')
+
+
+def _stdlib_paths() -> set[str]:
+    paths = sysconfig.get_paths()
+    stdlib = {os.path.normcase(os.path.realpath(paths[key])) for key in ('stdlib', 'platstdlib') if key in paths}
+    stdlib.update(os.path.join(path, 'lib-dynload') for path in list(stdlib))
+    return stdlib
+
+
+def _importable_names(directory: str) -> set[str]:
+    names = set()
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return names
+    for entry in entries:
+        name = entry.name
+        if entry.is_dir():
+            if name.isidentifier():
+                names.add(name)
+        elif name.endswith('.py'):
+            names.add(name[:-3])
+        elif name.endswith(_EXTENSION_SUFFIXES):
+            names.add(name.split('.')[0])
+    return names
+
+
+@lru_cache(maxsize=4)
+def _third_party_names(signature: str) -> frozenset:
+    # Precomputed once per environment: everything importable from the
+    # non-stdlib search paths plus the module index (which also covers
+    # editable installs that live outside site-packages).
+    stdlib = _stdlib_paths()
+    names = set(get_distribution_index().modules)
+    for path in search_paths():
+        if os.path.normcase(os.path.realpath(path)) not in stdlib:
+            names.update(_importable_names(path))
+    return frozenset(names)
+
+
+def third_party_names() -> frozenset:
+    return _third_party_names(environment_signature())
+
+
+def _is_local(top: str, project_root: str) -> bool:
+    root = Path(project_root)
+    return (root / f"{top}.py").is_file() or is_package_dir(root / top)
+
+
+# Local answers per project root; dropped by clear_classification_cache(root)
+# whenever that project's files may have changed.
+_local_tops = {}
+
+
+def _is_local_cached(top: str, project_root: str) -> bool:
+    known = _local_tops.setdefault(project_root, {})
+    if top not in known:
+        known[top] = _is_local(top, project_root)
+    return known[top]
+
+
+@lru_cache(maxsize=4096)
+def _classify(top: str, signature: str) -> str:
+    # Keyed on the environment signature, so an install or uninstall is a
+    # cache miss rather than a stale answer.
+    if top in STDLIB_MODULES:
+        return STDLIB
+    if top in _third_party_names(signature):
+        return THIRD_PARTY
+    return UNRESOLVABLE
+
+
+def classify_module(module: str, project_root=None, signature: str = None) -> str:
+    if not module or module.startswith('.'):
+        return LOCAL
+    top = module.split('.')[0]
+    if top in STDLIB_MODULES:
+        return STDLIB
+    if project_root and _is_local_cached(top, str(project_root)):
+        return LOCAL
+    return _classify(top, signature or environment_signature())
+
+
+def clear_classification_cache(project_root=None):
+    # With a project root only that project's local answers are dropped;
+    # without one everything is.
+    if project_root is not None:
+        _local_tops.pop(str(project_root), None)
+        return
+    _local_tops.clear()
+    _classify.cache_clear()
+    _third_party_names.cache_clear()
+
 
 def is_stdlib_module(module: str) -> bool:
-    return module in sys.builtin_module_names or module in sysconfig.get_paths()['stdlib']
+    return classify_module(module) == STDLIB
 
 def resolve_top_level_package(module: str) -> str:
     return module.split('.')[0]
+
+
+@lru_cache(maxsize=1024)
+def _installed_requirements(name: str, signature: str) -> tuple[str, str, tuple] | None:
+    # (display name, version, parsed requirements) for one installed
+    # distribution; memoized per environment so shared nodes are read once.
+    try:
+        dist = importlib.metadata.distribution(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+    requirements = tuple(
+        req for req in (parse_requirement(text) for text in dist.requires or []) if req is not None
+    )
+    return dist.metadata['Name'] or name, dist.version, requirements
+
+
+def _applies(requirement, extras, environment) -> bool:
+    try:
+        return evaluate_marker(requirement.marker, environment, extras)
+    except ValueError as e:
+        print(f"[pylock.WARN] Could not evaluate marker for {requirement.name}: {e}")
+        return True
+
+
+def direct_requirements(dist_name: str, extras=(), environment=None, signature=None) -> list[str]:
+    info = _installed_requirements(normalize_name(dist_name), signature or environment_signature())
+    if info is None:
+        return []
+    environment = environment or default_environment()
+    extras = frozenset(normalize_name(e) for e in extras)
+    names = []
+    for req in info[2]:
+        if req.name not in names and _applies(req, extras, environment):
+            names.append(req.name)
+    return names
+
+
+def resolve_transitive(dist_name: str, extras=(), environment=None, signature=None) -> dict[str, str]:
+    # Walks Requires-Dist through the installed distributions, evaluating
+    # markers for this interpreter, and pins every node reached (the root
+    # excluded). Nodes that are required but not installed pin to 'unknown'.
+    signature = signature or environment_signature()
+    environment = environment or default_environment()
+    root = normalize_name(dist_name)
+    pins = {}
+    evaluated = {}
+    queue = [(root, frozenset(normalize_name(e) for e in extras))]
+
+    while queue:
+        name, wanted = queue.pop(0)
+        # '' stands for the base requirements; extras seen on a later edge
+        # only add the requirements gated on them.
+        pending = (wanted | {''}) - evaluated.setdefault(name, set())
+        if not pending:
+            continue
+        evaluated[name].update(pending)
+
+        info = _installed_requirements(name, signature)
+        if info is None:
+            pins.setdefault(name, 'unknown')
+            continue
+        display, version, requirements = info
+        if name != root:
+            pins[display] = version
+        for req in requirements:
+            if _applies(req, pending, environment):
+                queue.append((normalize_name(req.name), req.extras))
+
+    return dict(sorted(pins.items(), key=lambda item: normalize_name(item[0])))
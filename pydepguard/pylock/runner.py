@@ -1,16 +1,120 @@
+import codecs
+import os
 import subprocess
 import sys
+import threading
+
+OUTPUT_MODES = ('stream', 'inherit', 'buffer')
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _pump(pipe, stream):
+    # Forward whatever the child has written so far; memory use is bounded by
+    # one chunk no matter how much the script logs.
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    try:
+        for chunk in iter(lambda: pipe.read1(STREAM_CHUNK_SIZE), b''):
+            stream.write(decoder.decode(chunk))
+            stream.flush()
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            stream.write(tail)
+            stream.flush()
+    finally:
+        pipe.close()
+
+
+def _wait(process):
+    try:
+        return process.wait()
+    except KeyboardInterrupt:
+        # The child shares our process group and got the same SIGINT.
+        return process.wait()
+
+
+def execute_script(script_path, output='stream'):
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"[pylock] Unknown output mode: {output}")
 
-def execute_script(script_path):
     print(f"Running {script_path}...")
-    process = subprocess.Popen([sys.executable, script_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    stdout, stderr = process.communicate()
 
-    if stdout:
-        print(stdout.decode(), end='')
-    if stderr:
-        print(stderr.decode(), end='', file=sys.stderr)
+    if output == 'inherit':
+        sys.stdout.flush()
+        sys.stderr.flush()
+        process = subprocess.Popen([sys.executable, script_path])
+        rc = _wait(process)
+
+    elif output == 'buffer':
+        process = subprocess.Popen([sys.executable, script_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = process.communicate()
+
+        if stdout:
+            print(stdout.decode(), end='')
+        if stderr:
+            print(stderr.decode(), end='', file=sys.stderr)
+        rc = process.returncode
+
+    else:
+        sys.stdout.flush()
+        env = dict(os.environ, PYTHONUNBUFFERED='1')
+        process = subprocess.Popen(
+            [sys.executable, script_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+        )
+        stderr_thread = threading.Thread(target=_pump, args=(process.stderr, sys.stderr), daemon=True)
+        stderr_thread.start()
+        try:
+            _pump(process.stdout, sys.stdout)
+        except KeyboardInterrupt:
+            pass
+        stderr_thread.join()
+        rc = _wait(process)
+
+    if rc != 0:
+        print(f"Script exited with return code {rc}")
+    return rc
+
+
+def _exit_code(exc: SystemExit) -> int:
+    # Mirrors how the interpreter turns SystemExit into a process exit status.
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def run_script_in_process(script_path):
+    import runpy
+    import traceback
+
+    print(f"Running {script_path} in-process...")
+    path = os.path.abspath(script_path)
+    saved_argv = sys.argv[:]
+    saved_path = sys.path[:]
+    sys.argv = [str(script_path)]
+    sys.path.insert(0, os.path.dirname(path))
+
+    try:
+        runpy.run_path(path, run_name='__main__')
+        rc = 0
+    except SystemExit as e:
+        rc = _exit_code(e)
+    except KeyboardInterrupt:
+        traceback.print_exc()
+        rc = 130
+    except BaseException:
+        traceback.print_exc()
+        rc = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
 
-    rc = process.returncode
     if rc != 0:
-        print(f"Script exited with return code {rc}")
\ No newline at end of file
+        print(f"Script exited with return code {rc}")
+    return rc
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from .cache import user_cache_dir
+from .depscan import SCANNER_VERSION
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+MEMORY_SCAN_ENTRIES = 4096
+
+
+class ScanCache:
+    def __init__(self, directory: Path = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory) if directory else user_cache_dir() / "scan"
+        self.max_bytes = max_bytes
+        self._written = 0
+
+    def key(self, data: bytes) -> str:
+        # Results depend on the source bytes, the grammar ast.parse accepts,
+        # and the scanner itself.
+        salt = f"{SCANNER_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}\0".encode()
+        return hashlib.sha256(salt + data).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str):
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # LRU: a hit makes this entry the most recently used.
+        except OSError:
+            pass
+        return entry['refs'], entry['unbound']
+
+    def put(self, key: str, compact: tuple):
+        path = self._entry_path(key)
+        payload = json.dumps({'refs': compact[0], 'unbound': compact[1]}, separators=(',', ':'))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[pylock.WARN] Failed to write scan cache entry: {e}")
+            return
+        self._written += len(payload)
+        if self._written > self.max_bytes // 10:
+            self.prune()
+
+    def entries(self) -> list[tuple[float, int, Path]]:
+        found = []
+        if not self.directory.is_dir():
+            return found
+        for bucket in os.scandir(self.directory):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith('.json'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:  # pruned by another worker meanwhile
+                        continue
+                    found.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        return found
+
+    def prune(self):
+        self._written = 0
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+class MemoryScanCache(ScanCache):
+    # The daemon's cache: recent entries in memory in front of the disk cache.
+    # Keys are content hashes, so entries never go stale; the disk cache
+    # survives restarts.
+    def __init__(self, directory: Path = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_entries: int = MEMORY_SCAN_ENTRIES):
+        super().__init__(directory, max_bytes)
+        self.max_entries = max_entries
+        self.memory = {}
+
+    def __getstate__(self):
+        # --workers processes get the disk cache only, not a copy of memory.
+        return dict(self.__dict__, memory={})
+
+    def get(self, key):
+        found = self.memory.get(key)
+        if found is None:
+            found = super().get(key)
+            if found is not None:
+                self._remember(key, found)
+        return found
+
+    def put(self, key, compact):
+        super().put(key, compact)
+        self._remember(key, (compact[0], compact[1]))
+
+    def _remember(self, key, value):
+        if len(self.memory) >= self.max_entries:
+            self.memory.pop(next(iter(self.memory)))
+        self.memory[key] = value
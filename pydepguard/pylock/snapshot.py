@@ -0,0 +1,158 @@
+import hashlib
+import os
+import sys
+import threading
+from .distindex import environment_signature, lookup_distribution, normalize_name, search_paths
+
+_METADATA_FILES = {'.dist-info': 'METADATA', '.egg-info': 'PKG-INFO'}
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+class InstalledDistribution:
+    # A plain class: @dataclass would pull inspect, ast and tokenize onto the
+    # --run path.
+    __slots__ = ('name', 'version', 'location', 'path')
+
+    def __init__(self, name: str, version: str, location: str, path: str):
+        self.name = name
+        self.version = version
+        self.location = location
+        self.path = path
+
+    def _key(self):
+        return self.name, self.version, self.location, self.path
+
+    def __eq__(self, other):
+        return isinstance(other, InstalledDistribution) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"InstalledDistribution(name={self.name!r}, version={self.version!r}, location={self.location!r}, path={self.path!r})"
+
+
+class EnvironmentSnapshot:
+    def __init__(self, distributions: dict[str, InstalledDistribution], signature: str):
+        self.distributions = distributions
+        self.signature = signature
+
+    def __len__(self):
+        return len(self.distributions)
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def get(self, name: str) -> InstalledDistribution | None:
+        return self.distributions.get(normalize_name(name))
+
+    def find(self, name: str) -> InstalledDistribution | None:
+        # Lockfile keys are import names, so fall back to the module index
+        # for packages like yaml -> PyYAML.
+        installed = self.get(name)
+        if installed is None:
+            dist_name = lookup_distribution(name)
+            if dist_name:
+                installed = self.get(dist_name)
+        return installed
+
+
+def _read_name_version(metadata_path: str) -> tuple[str | None, str | None]:
+    name = version = None
+    try:
+        with open(metadata_path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if not line.strip():
+                    break
+                key, _, value = line.partition(':')
+                if key == 'Name':
+                    name = value.strip()
+                elif key == 'Version':
+                    version = value.strip()
+                if name and version:
+                    break
+    except OSError:
+        pass
+    return name, version
+
+
+def _metadata_path(entry: os.DirEntry) -> str | None:
+    for suffix, filename in _METADATA_FILES.items():
+        if entry.name.endswith(suffix):
+            return os.path.join(entry.path, filename) if entry.is_dir() else entry.path
+    return None
+
+
+def build_snapshot(paths: list[str] = None, signature: str = None) -> EnvironmentSnapshot:
+    paths = search_paths() if paths is None else paths
+    distributions = {}
+    for location in paths:
+        try:
+            entries = sorted(os.scandir(location), key=lambda e: e.name)
+        except OSError:
+            continue
+        for entry in entries:
+            metadata_path = _metadata_path(entry)
+            if metadata_path is None:
+                continue
+            name, version = _read_name_version(metadata_path)
+            if not name:
+                continue
+            # First match on sys.path wins, same as importlib.metadata.
+            distributions.setdefault(normalize_name(name), InstalledDistribution(
+                name=name,
+                version=version,
+                location=location,
+                path=entry.path,
+            ))
+    return EnvironmentSnapshot(distributions, signature or environment_signature(paths))
+
+
+def get_snapshot(refresh: bool = False) -> EnvironmentSnapshot:
+    global _snapshot
+    paths = search_paths()
+    signature = environment_signature(paths)
+    with _snapshot_lock:
+        if refresh or _snapshot is None or _snapshot.signature != signature:
+            _snapshot = build_snapshot(paths, signature)
+        return _snapshot
+
+
+def fingerprint_paths(dist_paths: list[str]) -> str | None:
+    digest = hashlib.sha256(f"{sys.executable}\0{sys.version}".encode())
+    for path in search_paths():
+        digest.update(f"\0{path}".encode())
+    for path in sorted(set(dist_paths)):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        digest.update(f"\0{path}\0{mtime}".encode())
+    return digest.hexdigest()
+
+
+def environment_fingerprint(dep_names) -> dict | None:
+    snap = get_snapshot()
+    dist_paths = []
+    for dep in dep_names:
+        installed = snap.find(dep)
+        if installed is None:
+            return None
+        dist_paths.append(installed.path)
+    fingerprint = fingerprint_paths(dist_paths)
+    if fingerprint is None:
+        return None
+    return {
+        'interpreter': sys.executable,
+        'python': sys.version.split()[0],
+        'fingerprint': fingerprint,
+        'dist_paths': sorted(set(dist_paths)),
+    }
+
+
+def environment_matches(environment: dict | None) -> bool:
+    if not environment or environment.get('interpreter') != sys.executable:
+        return False
+    return fingerprint_paths(environment.get('dist_paths', [])) == environment.get('fingerprint')
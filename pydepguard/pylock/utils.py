@@ -1,12 +1,15 @@
 import importlib.metadata
+from functools import lru_cache
 from importlib.util import find_spec
 from pathlib import Path
-import sysconfig
-import sys
 import ast
 import re
 from typing import List, Dict
 from .depscan import ImportReference
+from .distindex import environment_signature, lookup_distribution
+from .hashing import record_digest
+from .profiling import span
+from .resolver import classify_module, direct_requirements, resolve_transitive, LOCAL, STDLIB
 
 
 def strip_extras(requirement: str) -> str:
@@ -14,35 +17,70 @@ def strip_extras(requirement: str) -> str:
 
 
 
-def enrich_dependencies(imports: List[ImportReference]) -> Dict[str, dict]:
-    enriched = {}
+@lru_cache(maxsize=1024)
+def _distribution_info(top_package: str, signature: str) -> tuple[str, tuple[str, ...], tuple, str | None, str | None]:
+    # Keyed on the environment signature so an install between calls is seen.
+    try:
+        dist = find_distribution(top_package)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown", (), (), None, None
+    name = dist.metadata['Name'] or top_package
+    tree = direct_requirements(name, signature=signature)
+    transitive = resolve_transitive(name, signature=signature)
+    record = dist.read_text('RECORD')
+    digest = record_digest(record) if record else None
+    return dist.version, tuple(sorted(set(tree))), tuple(transitive.items()), digest, dist.metadata['Name']
 
-    for ref in imports:
-        top_package = ref.module.split('.')[0]
-        if is_stdlib_module(top_package):
-            continue
 
-        try:
-            dist = importlib.metadata.distribution(top_package)
-            version = dist.version
-            requires = dist.requires or []
-            transitive = [strip_extras(r) for r in requires if r and not r.startswith('extra')]
-        except importlib.metadata.PackageNotFoundError:
-            version = "unknown"
-            transitive = []
+def enrich_dependencies(imports: List[ImportReference], project_root=None, known=None) -> Dict[str, dict]:
+    grouped = {}
+    signature = environment_signature()
+    with span('classify', imports=len(imports)):
+        for ref in imports:
+            top_package = ref.module.split('.')[0]
+            root = project_root or Path(ref.file).parent
+            if classify_module(ref.module, root, signature) in (STDLIB, LOCAL):
+                continue
+            origins = grouped.setdefault(top_package, [])
+            origin = f"{ref.file}:{ref.line}"
+            if origin not in origins:
+                origins.append(origin)
 
+    enriched = {}
+    for top_package, origins in grouped.items():
+        if known and top_package in known:
+            # Already locked against this environment; only origins change.
+            previous = known[top_package]
+            version, tree, transitive = previous['version'], previous.get('tree', []), previous.get('transitive', {})
+            digest, distribution = previous.get('digest'), previous.get('distribution')
+        else:
+            with span('enrich', package=top_package):
+                version, tree, transitive, digest, distribution = _distribution_info(top_package, signature)
         enriched[top_package] = {
             'version': version,
-            'origin': f"{ref.file}:{ref.line}",
-            'tree': sorted(set(transitive))
+            'origin': origins[0],
+            'origins': origins,
+            'tree': list(tree),
+            'transitive': dict(transitive)
         }
+        if digest:
+            enriched[top_package]['digest'] = digest
+        if distribution:
+            enriched[top_package]['distribution'] = distribution
 
     return enriched
 
+def find_distribution(module_name: str) -> importlib.metadata.Distribution:
+    try:
+        return importlib.metadata.distribution(module_name)
+    except importlib.metadata.PackageNotFoundError:
+        dist_name = lookup_distribution(module_name)
+        if not dist_name:
+            raise
+        return importlib.metadata.distribution(dist_name)
+
 def is_stdlib_module(module: str) -> bool:
-    import importlib.util
-    spec = importlib.util.find_spec(module)
-    return spec is not None and 'site-packages' not in (spec.origin or '')
+    return classify_module(module) == STDLIB
 
 def resolve_symbol_dependencies(symbol_fqname: str) -> List[str]:
     parts = symbol_fqname.split('.')
@@ -1,14 +1,23 @@
-import importlib.metadata
-import subprocess
-from .package_handler import ensure_package, install_package
+from functools import partial
+from .package_handler import ensure_package, install_package, install_packages, install_packages_offline, is_importable
+from .profiling import span
+from .snapshot import environment_fingerprint, environment_matches, get_snapshot
+
+def resolve_installed_package_info(package_name: str, pip_fallback: bool = False) -> dict:
+    # Only reached when the snapshot has no entry, so these stay off the
+    # startup path.
+    import importlib.metadata
+    import subprocess
 
-def resolve_installed_package_info(package_name: str) -> dict:
     try:
         version = importlib.metadata.version(package_name)
         return {'available': True, 'version': version, 'source': 'importlib'}
     except importlib.metadata.PackageNotFoundError:
         pass
 
+    if not pip_fallback:
+        return {'available': False, 'version': None, 'source': 'none'}
+
     result = subprocess.run(['pip', 'show', package_name], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     if result.returncode == 0:
         output = result.stdout.decode('utf-8')
@@ -21,8 +30,12 @@ def resolve_installed_package_info(package_name: str) -> dict:
 
     return {'available': False, 'version': None, 'source': 'none'}
 
-def check_package_availability(package, expected_version=None):
-    info = resolve_installed_package_info(package)
+def check_package_availability(package, expected_version=None, pip_fallback=False):
+    installed = get_snapshot().find(package)
+    if installed is not None:
+        info = {'available': True, 'version': installed.version, 'source': 'snapshot'}
+    else:
+        info = resolve_installed_package_info(package, pip_fallback=pip_fallback)
 
     return {
         'available': info['available'],
@@ -31,15 +44,98 @@ def check_package_availability(package, expected_version=None):
         'source': info['source']
     }
 
-def validate_environment(lockfile, *, strict=True, interactive=True, on_error='abort', fix_missing=False):
+def expand_transitive(deps):
+    # Direct entries first, then every pinned transitive node not already
+    # listed, so the whole graph goes through the same checks and policy.
+    expanded = dict(deps)
+    for info in deps.values():
+        for name, version in (info.get('transitive') or {}).items():
+            if name not in expanded and version != 'unknown':
+                expanded[name] = {'version': version}
+    return expanded
+
+def verify_hashes(deps, jobs=None, on_error='abort'):
+    # Re-hashes every file a locked dependency installed and compares it with
+    # the dist's RECORD, which in turn must match the digest in the lockfile.
+    from .hashing import verify_distributions
+
+    snap = get_snapshot()
+    targets = []
+    for dep, info in deps.items():
+        installed = snap.find(dep)
+        if not info.get('digest') or installed is None:
+            continue
+        targets.append((dep, installed.path, installed.location, info['digest']))
+
+    with span('verify_hashes', dependencies=len(targets)):
+        problems = verify_distributions(targets, jobs=jobs)
+    ok = True
+    for dep, found in problems.items():
+        if not found:
+            continue
+        ok = False
+        msg = f"[pylock.CRIT] Hash verification failed for {dep}: {len(found)} problem(s), first: {found[0]}"
+        print(msg)
+        if on_error == 'abort':
+            raise RuntimeError(f"[pylock] Installed files of {dep} do not match the lockfile")
+    if ok:
+        print(f"[pylock] Verified installed files of {len(targets)} dependencies.")
+    return ok
+
+def _check_dependency(dep, info, pip_fallback=False):
+    try:
+        with span('validate.dependency', dependency=dep):
+            return check_package_availability(dep, info.get('version'), pip_fallback=pip_fallback), None
+    except Exception as e:
+        return None, e
+
+def validate_environment(lockfile, *, strict=True, interactive=True, on_error='abort', fix_missing=False,
+                         batch_install=False, jobs=1, pip_fallback=False, revalidate=False, transitive=False,
+                         check_hashes=False, wheelhouse=None):
     if not isinstance(lockfile, dict) or 'deps' not in lockfile:
         raise ValueError("[pylock] Invalid lockfile format: 'deps' key missing")
 
-    for dep, info in lockfile['deps'].items():
-        try:
-            result = check_package_availability(dep, info.get('version'))
-        except Exception as e:
-            print(f"[pylock] Error checking {dep}: {e}")
+    deps = lockfile['deps']
+    if transitive:
+        deps = expand_transitive(deps)
+    recorded = lockfile.get('meta', {}).get('environment')
+    if not revalidate and environment_matches(recorded) and (recorded.get('transitive') or not transitive):
+        print("[pylock] Environment unchanged since last validation, skipping dependency checks.")
+        # The fingerprint only covers dist-info metadata, not the files themselves.
+        if check_hashes and not verify_hashes(deps, jobs=jobs if jobs > 1 else None, on_error=on_error):
+            return None
+        print("[pylock] Environment validation passed.")
+        return recorded
+
+    if jobs and jobs > 1 and len(deps) > 1:
+        # Checks run concurrently; the policy below still walks the lockfile in order.
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(partial(_check_dependency, pip_fallback=pip_fallback), deps.keys(), deps.values())
+            checks = dict(zip(deps.keys(), results))
+    else:
+        checks = {dep: _check_dependency(dep, info, pip_fallback) for dep, info in deps.items()}
+
+    install_errors = {}
+    # A wheelhouse always installs in one batch, and never from the network.
+    batch_install = batch_install or bool(wheelhouse)
+    if fix_missing and batch_install:
+        missing = [
+            (dep, deps[dep].get('version'))
+            for dep, (result, error) in checks.items()
+            if error is None and not result['available'] and not is_importable(dep)
+        ]
+        if wheelhouse:
+            install_errors = install_packages_offline(missing, wheelhouse)
+        else:
+            distributions = {dep: deps[dep]['distribution'] for dep, _ in missing if deps[dep].get('distribution')}
+            install_errors = install_packages(missing, distributions=distributions)
+
+    for dep, info in deps.items():
+        result, error = checks[dep]
+        if error is not None:
+            print(f"[pylock] Error checking {dep}: {error}")
             if on_error == 'abort':
                 raise RuntimeError(f"[pylock] Dependency check failed for {dep}")
             elif on_error == 'warn':
@@ -51,7 +147,11 @@ def validate_environment(lockfile, *, strict=True, interactive=True, on_error='a
             msg = f"[pylock] Missing required package: {dep}"
             if fix_missing:
                 try:
-                    ensure_package(dep, info.get('version'))
+                    if batch_install:
+                        if install_errors.get(dep) is not None:
+                            raise install_errors[dep]
+                    else:
+                        ensure_package(dep, info.get('version'), info.get('distribution'))
                     continue
                 except Exception as e:
                     print(f"[pylock.WARN] Auto-install failed: {e}")
@@ -84,4 +184,16 @@ def validate_environment(lockfile, *, strict=True, interactive=True, on_error='a
                 else: 
                     continue
 
-    print("[pylock] Environment validation passed.")
\ No newline at end of file
+    hashes_ok = verify_hashes(deps, jobs=jobs if jobs > 1 else None, on_error=on_error) if check_hashes else True
+    print("[pylock] Environment validation passed.")
+
+    clean = hashes_ok and all(
+        error is None and result['available'] and result['version_matches']
+        for result, error in checks.values()
+    )
+    if not clean:
+        return None
+    environment = environment_fingerprint(deps.keys())
+    if environment is not None and transitive:
+        environment['transitive'] = True
+    return environment
\ No newline at end of file
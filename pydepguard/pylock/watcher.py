@@ -0,0 +1,190 @@
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from time import monotonic, sleep
+
+DEFAULT_DEBOUNCE_SECONDS = 0.3
+DEFAULT_POLL_SECONDS = 0.5
+
+# inotify(7) constants. Parent directories are watched rather than the files
+# themselves, because most editors save by writing a new file and renaming
+# it over the old one.
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct('iIII')
+
+
+class PollingWatcher:
+    # Portable fallback: one stat per watched file every `poll` seconds.
+    def __init__(self, paths, poll: float = DEFAULT_POLL_SECONDS):
+        self.poll = poll
+        self.update(paths)
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def update(self, paths):
+        self.states = {Path(path).resolve(): None for path in paths}
+        for path in self.states:
+            self.states[path] = self._stat(path)
+
+    def wait(self, timeout: float = None) -> set:
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            changed = set()
+            for path, state in self.states.items():
+                current = self._stat(path)
+                if current != state:
+                    self.states[path] = current
+                    changed.add(path)
+            if changed:
+                return changed
+            remaining = self.poll if deadline is None else min(self.poll, deadline - monotonic())
+            if remaining <= 0:
+                return changed
+            sleep(remaining)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    def __init__(self, paths):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        self.update(paths)
+
+    def update(self, paths):
+        self.files = {Path(path).resolve() for path in paths}
+        wanted = {path.parent for path in self.files}
+        for directory, wd in list(self.dirs.items()):
+            if directory not in wanted:
+                self._libc.inotify_rm_watch(self.fd, wd)
+                del self.dirs[directory]
+        for directory in wanted - set(self.dirs):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _IN_MASK)
+            if wd >= 0:
+                self.dirs[directory] = wd
+        self.by_wd = {wd: directory for directory, wd in self.dirs.items()}
+
+    def wait(self, timeout: float = None) -> set:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, _mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+            offset += _EVENT.size + length
+            directory = self.by_wd.get(wd)
+            if directory is not None and name:
+                path = directory / os.fsdecode(name)
+                if path in self.files:
+                    changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(paths, poll: float = DEFAULT_POLL_SECONDS, polling: bool = False):
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError) as e:
+            print(f"[pylock.WARN] inotify unavailable ({e}); polling every {poll}s instead.")
+    return PollingWatcher(paths, poll=poll)
+
+
+def wait_for_changes(watcher, debounce: float = DEFAULT_DEBOUNCE_SECONDS, stop: threading.Event = None) -> set:
+    # Blocks until something changed, then keeps collecting until the files
+    # have been quiet for `debounce` seconds, so a burst of saves (or an
+    # editor's write-then-rename) becomes a single rescan.
+    changed = set()
+    while not changed:
+        if stop is not None and stop.is_set():
+            return changed
+        changed = watcher.wait(timeout=0.5 if stop is not None else None)
+    while True:
+        more = watcher.wait(timeout=debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def watch_lockfile(lm, script_path, *, project=False, cache=None, debounce: float = DEFAULT_DEBOUNCE_SECONDS,
+                   watcher=None, stop: threading.Event = None):
+    # Keeps lm's lockfile current until interrupted (or `stop` is set). The
+    # scan baseline lives in memory; the file on disk is only rewritten, in
+    # one atomic rename, when the dependency set changes.
+    from .generator import _pins, generate
+    from .resolver import clear_classification_cache
+
+    script_path = Path(script_path)
+    generate(lm, script_path, project=project, cache=cache)
+    state = lm.lockfile if lm.lockfile is not None else lm.load()
+    files = [script_path.parent / rel for rel in state.get('meta', {}).get('sources', {})]
+    watcher = watcher or create_watcher(files)
+    watcher.update(files)
+    print(f"[pylock] Watching {len(files)} file(s) for {script_path.name}; press Ctrl+C to stop.")
+    try:
+        while stop is None or not stop.is_set():
+            changed = wait_for_changes(watcher, debounce, stop)
+            if not changed:
+                continue
+            before = _pins(state['deps'])
+            # A module created or deleted next to the script changes what is local.
+            clear_classification_cache(script_path.parent)
+            try:
+                result = generate(lm, script_path, project=project, cache=cache, previous=state,
+                                  only_if_deps_changed=True)
+            except OSError as e:
+                # e.g. a project file deleted mid-save; the next event retries.
+                print(f"[pylock.WARN] Rescan failed: {e}")
+                continue
+            if result is None:
+                continue
+            deps, unbound, files, rescanned = result
+            state = lm.lockfile
+            watcher.update(files)
+            for sym in unbound:
+                print(f"[pylock.CRIT] Unbound Symbol: {sym.name} at {sym.file}:{sym.line}")
+            after = _pins(deps)
+            if after == before:
+                print(f"[pylock] Re-parsed {len(rescanned)} file(s); dependency set unchanged.")
+                continue
+            added = sorted(set(after) - set(before))
+            removed = sorted(set(before) - set(after))
+            bumped = sorted(name for name in set(after) & set(before) if after[name] != before[name])
+            for label, names in (("New dependencies", added), ("No longer imported", removed), ("Version changed", bumped)):
+                if names:
+                    print(f"[pylock] {label}: {', '.join(names)}")
+    except KeyboardInterrupt:
+        print("\n[pylock] Stopped watching.")
+    finally:
+        watcher.close()
@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import platform
+import re
+import sys
+import sysconfig
+import zipfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from .aliases import lookup_alias
+from .cache import user_cache_dir
+from .distindex import normalize_name
+from .markers import _version_key
+
+INDEX_VERSION = 1
+
+_WHEEL_RE = re.compile(
+    r"^(?P<name>[^-]+)-(?P<version>[^-]+)(?:-(?P<build>\d[^-]*))?"
+    r"-(?P<py>[^-]+)-(?P<abi>[^-]+)-(?P<plat>[^-]+)\.whl$"
+)
+
+
+@dataclass(frozen=True)
+class Wheel:
+    filename: str
+    name: str
+    version: str
+    tags: frozenset
+    modules: tuple = ()
+    stat: tuple = ()
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'version': self.version, 'tags': sorted('-'.join(tag) for tag in self.tags),
+                'modules': list(self.modules), 'stat': list(self.stat)}
+
+
+def parse_wheel_filename(filename: str) -> Wheel | None:
+    match = _WHEEL_RE.match(filename)
+    if not match:
+        return None
+    # Compressed tag sets: py2.py3-none-any is two tags.
+    tags = frozenset(
+        (py, abi, plat)
+        for py in match.group('py').split('.')
+        for abi in match.group('abi').split('.')
+        for plat in match.group('plat').split('.')
+    )
+    return Wheel(filename, match.group('name'), match.group('version'), tags)
+
+
+def wheel_modules(path) -> tuple[str, ...]:
+    # Top-level import names, read from the zip's central directory only.
+    names = set()
+    try:
+        with zipfile.ZipFile(path) as zf:
+            for member in zf.namelist():
+                top = member.split('/')[0]
+                if top.endswith(('.dist-info', '.data')):
+                    continue
+                if '/' not in member:
+                    if not member.endswith('.py'):
+                        continue
+                    top = top[:-3]
+                if top.isidentifier():
+                    names.add(top)
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"[pylock.WARN] Could not read wheel {path}: {e}")
+    return tuple(sorted(names))
+
+
+@lru_cache(maxsize=1)
+def supported_tags() -> tuple[frozenset, frozenset, tuple[str, str]]:
+    # A simplified take on pip's compatibility rules: the interpreter and ABI
+    # tags this Python accepts, plus the OS family and machine for platforms.
+    major, minor = sys.version_info[:2]
+    impl = {'cpython': 'cp', 'pypy': 'pp'}.get(sys.implementation.name, 'py')
+    pythons = {f"{impl}{major}{minor}", f"py{major}{minor}", f"py{major}"}
+    pythons |= {f"cp{major}{m}" for m in range(2, minor)}  # abi3 wheels built for older CPythons
+    pythons |= {f"py{major}{m}" for m in range(0, minor)}
+    abis = {'none', f"{impl}{major}{minor}"}
+    if impl == 'cp':
+        abis.add('abi3')
+    system = sys.platform
+    machine = platform.machine().lower()
+    if system.startswith('linux'):
+        system = 'linux'
+    return frozenset(pythons), frozenset(abis), (system, machine)
+
+
+def _platform_matches(plat: str, system: str, machine: str) -> bool:
+    if plat == 'any':
+        return True
+    if system == 'linux':
+        return plat.startswith(('linux_', 'manylinux', 'musllinux')) and plat.endswith(f"_{machine}")
+    if system == 'darwin':
+        arch = {'arm64': 'arm64', 'x86_64': 'x86_64'}.get(machine, machine)
+        return plat.startswith('macosx_') and plat.endswith((f"_{arch}", '_universal2', '_universal'))
+    return plat == sysconfig.get_platform().replace('-', '_').replace('.', '_')
+
+
+def is_compatible(wheel: Wheel, tags=None) -> bool:
+    pythons, abis, (system, machine) = tags or supported_tags()
+    return any(
+        py in pythons and abi in abis and _platform_matches(plat, system, machine)
+        for py, abi, plat in wheel.tags
+    )
+
+
+class WheelhouseIndex:
+    def __init__(self, directory: Path, wheels: dict[str, Wheel], signature: str):
+        self.directory = directory
+        self.wheels = wheels
+        self.signature = signature
+        self.by_name = {}
+        self.by_module = {}
+        for wheel in wheels.values():
+            self.by_name.setdefault(normalize_name(wheel.name), []).append(wheel)
+            for module in wheel.modules:
+                self.by_module.setdefault(module, set()).add(normalize_name(wheel.name))
+
+    def candidates(self, module: str) -> list[Wheel]:
+        # Lockfile keys are import names: try them as a project name, then the
+        # known alias map, then the top-level modules found inside the wheels.
+        names = [normalize_name(module)]
+        mapped = lookup_alias(module)
+        if mapped:
+            names.append(normalize_name(mapped))
+        names.extend(sorted(self.by_module.get(module, ())))
+        for name in names:
+            if name in self.by_name:
+                return self.by_name[name]
+        return []
+
+    def to_dict(self) -> dict:
+        return {'version': INDEX_VERSION, 'signature': self.signature,
+                'wheels': {filename: wheel.to_dict() for filename, wheel in self.wheels.items()}}
+
+
+def _listing(directory: Path) -> dict[str, tuple[int, int]]:
+    listing = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith('.whl') and entry.is_file():
+                stat = entry.stat()
+                listing[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    return listing
+
+
+def _signature(listing) -> str:
+    digest = hashlib.sha256()
+    for name, (size, mtime) in sorted(listing.items()):
+        digest.update(f"{name}\0{size}\0{mtime}\n".encode())
+    return digest.hexdigest()
+
+
+def index_path(directory: Path) -> Path:
+    key = hashlib.sha256(str(directory).encode()).hexdigest()[:16]
+    return user_cache_dir() / f"wheelhouse-{key}.json"
+
+
+def _load_index(path: Path) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if data.get('version') == INDEX_VERSION else {}
+
+
+def _write_index(path: Path, index: WheelhouseIndex):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index.to_dict(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[pylock.WARN] Failed to write wheelhouse index: {e}")
+
+
+def get_wheelhouse_index(directory, refresh: bool = False) -> WheelhouseIndex:
+    # One scandir per call; only wheels added or replaced since the cached
+    # index was written are opened.
+    directory = Path(directory).resolve()
+    listing = _listing(directory)
+    signature = _signature(listing)
+    path = index_path(directory)
+    cached = {} if refresh else _load_index(path)
+    cached_wheels = cached.get('wheels', {})
+
+    wheels = {}
+    for filename, stat in sorted(listing.items()):
+        wheel = parse_wheel_filename(filename)
+        if wheel is None:
+            continue
+        entry = cached_wheels.get(filename)
+        if entry and entry.get('stat') == list(stat):
+            modules = tuple(entry['modules'])
+        else:
+            modules = wheel_modules(directory / filename)
+        wheels[filename] = Wheel(filename, wheel.name, wheel.version, wheel.tags, modules, stat)
+
+    index = WheelhouseIndex(directory, wheels, signature)
+    if cached.get('signature') != signature:
+        _write_index(path, index)
+    return index
+
+
+def _same_version(found: str, pinned: str) -> bool:
+    if found == pinned:
+        return True
+    found_key, pinned_key = _version_key(found), _version_key(pinned)
+    if found_key is None or pinned_key is None or not re.fullmatch(r"[\d.]+", found + pinned):
+        return False
+    width = max(len(found_key), len(pinned_key))
+    return found_key + (0,) * (width - len(found_key)) == pinned_key + (0,) * (width - len(pinned_key))
+
+
+def resolve_pins(index: WheelhouseIndex, pins: list[tuple[str, str]], tags=None) -> tuple[dict, dict]:
+    # Returns ({module: Wheel}, {module: reason}) without touching pip.
+    resolved, unsatisfiable = {}, {}
+    for module, version in pins:
+        version = None if version in (None, '', 'unknown') else version
+        candidates = index.candidates(module)
+        if not candidates:
+            unsatisfiable[module] = "no wheels for this package"
+            continue
+        matching = [w for w in candidates if version is None or _same_version(w.version, version)]
+        if not matching:
+            available = ', '.join(sorted({w.version for w in candidates}, key=lambda v: _version_key(v) or ()))
+            unsatisfiable[module] = f"{version} not in wheelhouse (available: {available})"
+            continue
+        compatible = [w for w in matching if is_compatible(w, tags)]
+        if not compatible:
+            unsatisfiable[module] = f"no wheel compatible with this interpreter ({matching[0].filename})"
+            continue
+        resolved[module] = max(compatible, key=lambda w: _version_key(w.version) or ())
+    return resolved, unsatisfiable
@@ -0,0 +1,65 @@
+import pytest
+from pydepguard.pylock import aliases
+from pydepguard.pylock.aliases import load_aliases, lookup_alias, parse_aliases
+from pydepguard.pylock.distindex import normalize_name
+from pydepguard.pylock.package_handler import resolve_pip_name
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYLOCK_ALIASES", str(tmp_path / "aliases.tsv"))
+    aliases.clear_alias_cache()
+    yield
+    aliases.clear_alias_cache()
+
+
+def test_parse_aliases():
+    text = "# comment\n\nyaml\tpyyaml\nPIL   pillow\nbroken line here\n"
+    assert parse_aliases(text) == {'yaml': 'pyyaml', 'PIL': 'pillow'}
+
+
+def test_bundled_database():
+    table = load_aliases()
+    assert len(table) > 200
+    assert table['sklearn'] == 'scikit-learn'
+    assert table['cv2'] == 'opencv-python'
+    # Identity mappings add nothing; lookups fall back to the name itself.
+    assert all(normalize_name(name) != normalize_name(dist) for name, dist in table.items())
+
+
+def test_lookup_is_case_insensitive_and_exact_first():
+    assert lookup_alias('PIL') == 'pillow'
+    assert lookup_alias('pil') == 'pillow'
+    assert lookup_alias('crypto') == 'pycryptodome'
+    assert lookup_alias('requests') is None
+    assert resolve_pip_name('PIL', '10.0.0') == ('pillow', '')
+
+
+def test_resolve_pip_name_keeps_pin_of_recorded_distribution():
+    assert resolve_pip_name('PIL', '10.0.0', 'Pillow') == ('Pillow', '10.0.0')
+    # The lockfile knows better than the alias table.
+    assert resolve_pip_name('yaml', '6.0', 'yaml-fork') == ('yaml-fork', '6.0')
+    assert resolve_pip_name('requests', '2.31.0', 'requests') == ('requests', '2.31.0')
+
+
+def test_bundled_database_skips_ambiguous_names():
+    table = load_aliases()
+    for name in ('tree', 'whisper', 'environ', 'box', 'board', 'community', 'compose'):
+        assert name not in table
+
+
+def test_loaded_lazily_once(monkeypatch):
+    reads = []
+    real = aliases._read_bundled
+    monkeypatch.setattr(aliases, "_read_bundled", lambda: reads.append(1) or real())
+    assert reads == []
+    lookup_alias('nosuchmodule')
+    lookup_alias('yaml')
+    assert reads == [1]
+
+
+def test_overlay_extends_and_overrides(tmp_path):
+    (tmp_path / "aliases.tsv").write_text("cv2\topencv-python-headless\ninhouse\tacme-inhouse-tools\n")
+    assert lookup_alias('cv2') == 'opencv-python-headless'
+    assert lookup_alias('inhouse') == 'acme-inhouse-tools'
+    assert lookup_alias('bs4') == 'beautifulsoup4'
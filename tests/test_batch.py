@@ -0,0 +1,72 @@
+import io
+import json
+import sys
+import threading
+from pydepguard.pylock.batch import ThreadOutput, expand_scripts, run_batch, summarize, write_summary
+
+
+def test_expand_scripts_globs_and_files_from(tmp_path, monkeypatch):
+    for name in ("a.py", "b.py", "sub/c.py"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("")
+    listing = tmp_path / "list.txt"
+    listing.write_text(f"# scripts\n{tmp_path / 'b.py'}\n\n{tmp_path / 'sub' / 'c.py'}\n")
+
+    found = expand_scripts([str(tmp_path / "*.py")], str(listing))
+    assert [p.name for p in found] == ["a.py", "b.py", "c.py"]
+
+    assert [p.name for p in expand_scripts([str(tmp_path / "**" / "*.py")])] == ["a.py", "b.py", "c.py"]
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO(f"{tmp_path / 'a.py'}\n"))
+    assert expand_scripts([], "-") == [tmp_path / "a.py"]
+
+
+def test_expand_scripts_keeps_missing_literal_paths(tmp_path, capsys):
+    assert expand_scripts([str(tmp_path / "missing.py")]) == [tmp_path / "missing.py"]
+    assert expand_scripts([str(tmp_path / "*.nothing")]) == []
+    assert "No scripts match" in capsys.readouterr().out
+
+
+def test_run_batch_keeps_order_and_isolates_failures(capsys):
+    def task(script):
+        if script == "bad":
+            raise RuntimeError("boom")
+        print(f"handled {script}")
+        return {'status': 'passed'}
+
+    for jobs in (1, 3):
+        results = run_batch(["a", "bad", "c"], task, jobs=jobs)
+        assert [r['script'] for r in results] == ["a", "bad", "c"]
+        assert [r['status'] for r in results] == ["passed", "failed", "passed"]
+        assert results[1]['error'] == "boom"
+        out = capsys.readouterr().out
+        assert "handled a\n" in out and "handled c\n" in out and "boom" in out
+
+
+def test_thread_output_does_not_interleave():
+    stream = io.StringIO()
+    output = ThreadOutput(stream)
+    barrier = threading.Barrier(2)
+
+    def work(tag):
+        output.write(f"{tag}1 ")
+        barrier.wait()
+        output.write(f"{tag}2\n")
+
+    threads = [threading.Thread(target=output.capture, args=(work, tag)) for tag in "xy"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(stream.getvalue().splitlines()) == ["x1 x2", "y1 y2"]
+
+
+def test_summary(tmp_path):
+    results = [{'script': 'a', 'status': 'passed'}, {'script': 'b', 'status': 'error'}]
+    summary = summarize('validate', results, 1.5)
+    assert summary['counts'] == {'passed': 1, 'error': 1}
+    assert summary['failed'] == 1
+
+    path = tmp_path / "summary.json"
+    write_summary(str(path), summary)
+    assert json.loads(path.read_text())['scripts'] == results
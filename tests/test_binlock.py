@@ -0,0 +1,63 @@
+import json
+import pytest
+from pydepguard.pylock import binlock
+
+LOCKFILE = {
+    'meta': {'script': 'app', 'files': ['app.py', 'pkg/util.py'], 'environment': {'fingerprint': 'abc'}},
+    'deps': {
+        'requests': {
+            'version': '2.31.0',
+            'origin': 'app.py:1',
+            'origins': ['app.py:1', 'pkg/util.py:3'],
+            'tree': ['urllib3', 'certifi'],
+            'transitive': {'certifi': '2024.2.2', 'urllib3': '2.2.1'},
+        },
+        'yaml': {'version': 'unknown', 'origin': 'app.py:2', 'tree': []},
+        'naïve': {'version': '1.0', 'origin': 'app.py:9', 'tree': []},
+    },
+}
+
+
+def test_roundtrip():
+    loaded = binlock.loads(binlock.dumps(LOCKFILE))
+    assert list(loaded['deps']) == list(LOCKFILE['deps'])
+    assert binlock.to_json(loaded) == LOCKFILE
+
+
+def test_deps_decoded_lazily(tmp_path):
+    path = tmp_path / "app_dep.lckb"
+    binlock.write(path, LOCKFILE)
+    assert binlock.is_binary(path)
+
+    loaded = binlock.load(path)
+    deps = loaded['deps']
+    try:
+        assert loaded['meta'] == LOCKFILE['meta']
+        assert len(deps) == 3 and 'yaml' in deps and 'flask' not in deps
+        assert deps._decoded == {}
+        assert deps['yaml'] == LOCKFILE['deps']['yaml']
+        assert list(deps._decoded) == ['yaml']
+        with pytest.raises(KeyError):
+            deps['flask']
+    finally:
+        deps.close()
+
+
+def test_json_conversion_is_lossless(tmp_path):
+    src = tmp_path / "app_dep.lck"
+    src.write_text(json.dumps(LOCKFILE, indent=4))
+    binlock.json_to_binary(src, tmp_path / "app_dep.lckb")
+    binlock.binary_to_json(tmp_path / "app_dep.lckb", tmp_path / "back.lck")
+    assert json.loads((tmp_path / "back.lck").read_text()) == LOCKFILE
+    assert (tmp_path / "app_dep.lckb").stat().st_size < src.stat().st_size
+
+
+def test_rejects_bad_input(tmp_path):
+    with pytest.raises(ValueError):
+        binlock.loads(b'{"deps": {}}')
+    data = binlock.dumps(LOCKFILE)
+    with pytest.raises(ValueError):
+        binlock.loads(data[:-10])
+    with pytest.raises(ValueError):
+        binlock.loads(data[:8] + b'\x63\x00' + data[10:])
+    assert not binlock.is_binary(tmp_path / "missing.lckb")
@@ -135,3 +135,223 @@ def test_cli_validate_missing_lockfile(capsys):
         if pylock_dir.exists() and not any(pylock_dir.iterdir()):
             pylock_dir.rmdir()
 
+
+
+def test_cli_validate_fast_path(capsys):
+    code = "import pip\nprint('fast path')"
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as tmp:
+        tmp.write(code)
+        script_path = tmp.name
+
+    lockfile_path = Path(script_path).parent / ".pylock" / f"{Path(script_path).stem}_dep.lck"
+
+    try:
+        sys.argv = ["pylock", script_path, "--generate"]
+        pylock_main()
+
+        sys.argv = ["pylock", script_path, "--validate", "--non-interactive"]
+        pylock_main()
+        assert "Environment unchanged" not in capsys.readouterr().out
+        assert "environment" in json.loads(lockfile_path.read_text())["meta"]
+
+        pylock_main()
+        assert "Environment unchanged" in capsys.readouterr().out
+
+        sys.argv = ["pylock", script_path, "--validate", "--non-interactive", "--revalidate"]
+        pylock_main()
+        assert "Environment unchanged" not in capsys.readouterr().out
+    finally:
+        if lockfile_path.exists():
+            os.remove(lockfile_path)
+        if Path(script_path).exists():
+            os.remove(script_path)
+
+
+def test_cli_generate_project(tmp_path):
+    (tmp_path / "main.py").write_text("import helper\nprint('project')\n")
+    (tmp_path / "helper.py").write_text("import pip\nimport json\n")
+    script_path = tmp_path / "main.py"
+
+    sys.argv = ["pylock", str(script_path), "--generate", "--project"]
+    pylock_main()
+
+    data = json.loads((tmp_path / ".pylock" / "main_dep.lck").read_text())
+    assert list(data["deps"]) == ["pip"]
+    assert data["deps"]["pip"]["origin"] == f"{tmp_path / 'helper.py'}:1"
+    assert data["meta"]["files"] == ["main.py", "helper.py"]
+
+
+def test_cli_run_propagates_exit_code(tmp_path):
+    import pytest
+    script_path = tmp_path / "fails.py"
+    script_path.write_text("import sys\nsys.exit(7)\n")
+
+    sys.argv = ["pylock", str(script_path), "--generate"]
+    pylock_main()
+
+    sys.argv = ["pylock", str(script_path), "--run", "--non-interactive"]
+    with pytest.raises(SystemExit) as exc:
+        pylock_main()
+    assert exc.value.code == 7
+
+
+def test_cli_binary_lockfile(tmp_path, capsys):
+    script_path = tmp_path / "app.py"
+    script_path.write_text("import pip\n")
+
+    sys.argv = ["pylock", str(script_path), "--generate"]
+    pylock_main()
+    sys.argv = ["pylock", str(script_path), "--lock-format", "binary", "--convert-lock"]
+    pylock_main()
+    assert "Converted lockfile to binary" in capsys.readouterr().out
+
+    sys.argv = ["pylock", str(script_path), "--lock-format", "binary", "--validate", "--non-interactive"]
+    pylock_main()
+    assert "Environment validation passed" in capsys.readouterr().out
+
+    binary = LockfileManager(script_path, lock_format='binary').load()
+    assert "environment" in binary["meta"]
+    assert binary["deps"]["pip"] == LockfileManager(script_path).load()["deps"]["pip"]
+
+
+def test_cli_generate_is_incremental(tmp_path, capsys):
+    script_path = tmp_path / "app.py"
+    script_path.write_text("import pip\n")
+
+    sys.argv = ["pylock", str(script_path), "--generate"]
+    pylock_main()
+    assert "Lockfile generated" in capsys.readouterr().out
+
+    pylock_main()
+    assert "is up to date" in capsys.readouterr().out
+
+    sys.argv = ["pylock", str(script_path), "--generate", "--force"]
+    pylock_main()
+    assert "Lockfile generated" in capsys.readouterr().out
+
+
+def test_cli_run_refreshes_stale_lockfile(tmp_path, capsys):
+    script_path = tmp_path / "app.py"
+    script_path.write_text("print('v1')\n")
+
+    sys.argv = ["pylock", str(script_path), "--generate"]
+    pylock_main()
+    script_path.write_text("import pip\nprint('v2')\n")
+
+    sys.argv = ["pylock", str(script_path), "--run", "--non-interactive"]
+    pylock_main()
+    out = capsys.readouterr().out
+    assert "New dependencies: pip" in out
+    assert "v2" in out
+    assert "pip" in LockfileManager(script_path).load()["deps"]
+
+    pylock_main()
+    assert "rescanning" not in capsys.readouterr().out
+
+
+def test_cli_import_stays_light():
+    # The scanner, installer and importlib.metadata load only in the branches
+    # that use them.
+    heavy = ["ast", "importlib.metadata", "zipfile", "logging", "runpy",
+             "pydepguard.pylock.depscan", "pydepguard.pylock.validator",
+             "pydepguard.pylock.package_handler", "pydepguard.pylock.wheelhouse"]
+    code = f"import sys, pydepguard.pylock.cli; print([m for m in {heavy!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-S", "-c", code], capture_output=True, text=True,
+                            cwd=Path(__file__).resolve().parent.parent, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_run_path_imports_stay_light(tmp_path):
+    # Everything `pylock app.py --run` loads on a valid environment: no
+    # scanner, no dataclasses (which pull in inspect and ast), and hashing
+    # and thread pools only for --verify-hashes and --jobs.
+    script = tmp_path / "app.py"
+    script.write_text("import pip\n")
+    root = Path(__file__).resolve().parent.parent
+    env = dict(os.environ, PYTHONPATH=str(root))
+    subprocess.run([sys.executable, "-m", "pydepguard.pylock", str(script), "--generate", "--no-cache"],
+                   capture_output=True, env=env, check=True)
+
+    heavy = ["ast", "inspect", "dis", "tokenize", "dataclasses", "importlib.metadata", "zipfile", "logging",
+             "concurrent.futures", "pydepguard.pylock.depscan", "pydepguard.pylock.hashing",
+             "pydepguard.pylock.wheelhouse"]
+    code = (
+        "import sys\n"
+        "startup = set(sys.modules)  # whatever site and .pth files loaded\n"
+        "from pydepguard.pylock.cli import main\n"
+        f"sys.argv = ['pylock', {str(script)!r}, '--run']\n"
+        "try:\n"
+        "    main()\n"
+        "finally:\n"
+        f"    print('LOADED', [m for m in {heavy!r} if m in sys.modules and m not in startup])\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env,
+                            cwd=tmp_path, check=True)
+    assert "Environment validation passed." in result.stdout
+    assert "LOADED []" in result.stdout
+
+
+def test_package_exports_resolve_lazily():
+    import pydepguard
+    import pydepguard.pylock as pylock
+    assert pydepguard.validate_environment is pylock.validate_environment
+    assert set(pylock.__all__) <= set(dir(pylock))
+
+
+def test_cli_batch_generate_and_validate(tmp_path, capsys):
+    for name, code in (("a.py", "import pip\n"), ("b.py", "import json\n")):
+        (tmp_path / name).write_text(code)
+    summary_path = tmp_path / "summary.json"
+
+    sys.argv = ["pylock", str(tmp_path / "*.py"), "--generate", "--no-cache", "--summary-json", str(summary_path)]
+    pylock_main()
+    summary = json.loads(summary_path.read_text())
+    assert summary['action'] == 'generate'
+    assert [Path(r['script']).name for r in summary['scripts']] == ["a.py", "b.py"]
+    assert [r['status'] for r in summary['scripts']] == ["generated", "generated"]
+    assert "2 scripts: 2 generated" in capsys.readouterr().out
+
+    sys.argv = ["pylock", str(tmp_path / "a.py"), str(tmp_path / "b.py"), str(tmp_path / "c.py"),
+                "--validate", "--non-interactive", "--script-jobs", "2", "--summary-json", str(summary_path)]
+    try:
+        pylock_main()
+        assert False, "a script without a lockfile must fail the batch"
+    except SystemExit as e:
+        assert e.code == 1
+    summary = json.loads(summary_path.read_text())
+    assert [r['status'] for r in summary['scripts']] == ["passed", "passed", "error"]
+    assert summary['failed'] == 1
+    assert "File not found" in capsys.readouterr().err
+
+
+def test_cli_summary_json_on_stdout_is_only_json(tmp_path, capsys):
+    (tmp_path / "a.py").write_text("import pip\n")
+    sys.argv = ["pylock", str(tmp_path / "a.py"), "--generate", "--no-cache", "--summary-json", "-"]
+    pylock_main()
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)['counts'] == {'generated': 1}
+    assert "[pylock] Scanning a.py" in captured.err
+
+
+def test_cli_files_from_stdin_allows_script_jobs(tmp_path, monkeypatch, capsys):
+    import io
+    for name in ("a.py", "b.py"):
+        (tmp_path / name).write_text("import pip\n")
+    sys.argv = ["pylock", str(tmp_path / "*.py"), "--generate", "--no-cache"]
+    pylock_main()
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO(f"{tmp_path / 'a.py'}\n{tmp_path / 'b.py'}\n"))
+    sys.argv = ["pylock", "--files-from", "-", "--validate", "--script-jobs", "2"]
+    pylock_main()
+    assert "2 scripts: 2 passed" in capsys.readouterr().out
+
+
+def test_cli_batch_rejects_run(tmp_path, capsys):
+    for name in ("a.py", "b.py"):
+        (tmp_path / name).write_text("")
+    sys.argv = ["pylock", str(tmp_path / "a.py"), str(tmp_path / "b.py"), "--run"]
+    try:
+        pylock_main()
+    except SystemExit as e:
+        assert e.code == 1
+    assert "--run takes exactly one script" in capsys.readouterr().err
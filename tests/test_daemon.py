@@ -0,0 +1,135 @@
+import sys
+import threading
+import pytest
+from pydepguard.pylock.batch import ThreadOutput
+from pydepguard.pylock.daemon import DaemonError, PROTOCOL_VERSION, PylockServer, _LockfileCache, request, wait_until_ready
+from pydepguard.pylock.lockfile import LockfileManager
+
+
+def _options(script, **overrides):
+    options = dict(scripts=[str(script)], generate=False, validate=True, run=False, force=False, project=False,
+                   workers=1, no_cache=True, lock_format='json', strict=True, non_interactive=True,
+                   on_error='abort', fix_missing=False, batch_install=False, jobs=1, pip_fallback=False,
+                   revalidate=False, transitive=False, verify_hashes=False, wheelhouse=None)
+    options.update(overrides)
+    return options
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path / "cache"))
+    server = PylockServer(tmp_path / "d.sock", poll=60, no_cache=True)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    wait_until_ready(server.path)
+    yield server
+    request(server.path, {'op': 'shutdown'})
+    thread.join(timeout=5)
+
+
+def test_daemon_generate_then_validate(daemon, tmp_path):
+    script = tmp_path / "app.py"
+    script.write_text("import pip\n")
+
+    response = request(daemon.path, {'op': 'generate', 'options': _options(script, generate=True, validate=False)})
+    assert response['results'][0]['status'] == 'generated'
+
+    for _ in range(2):
+        response = request(daemon.path, {'op': 'validate', 'options': _options(script)})
+        assert response['results'][0]['status'] == 'passed'
+        assert response['summary']['failed'] == 0
+
+    missing = request(daemon.path, {'op': 'validate', 'options': _options(tmp_path / "missing.py")})
+    assert missing['results'][0]['status'] == 'error'
+
+    stats = request(daemon.path, {'op': 'stats'})
+    assert stats['requests'] == 4 and stats['lockfiles'] == 1
+
+
+def test_daemon_returns_the_request_log(tmp_path, monkeypatch):
+    # pytest swaps sys.stdout between test phases, so drive run() directly.
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path / "cache"))
+    script = tmp_path / "app.py"
+    script.write_text("import pip\n")
+    server = PylockServer(tmp_path / "d.sock", no_cache=True)
+    server.output = ThreadOutput(sys.stdout)
+    monkeypatch.setattr(sys, "stdout", server.output)
+
+    response = server.run('generate', _options(script, generate=True, validate=False))
+    assert "Lockfile generated for app.py with 1 dependencies." in response['output']
+    response = server.run('validate', _options(script))
+    assert "Environment validation passed." in response['output']
+
+
+def test_daemon_sees_new_local_modules(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path / "cache"))
+    script = tmp_path / "app.py"
+    script.write_text("import pip\nimport helper\n")
+    server = PylockServer(tmp_path / "d.sock", no_cache=True)
+    server.output = ThreadOutput(sys.stdout)
+    monkeypatch.setattr(sys, "stdout", server.output)
+
+    server.run('generate', _options(script, generate=True, validate=False))
+    assert set(LockfileManager(script).load()['deps']) == {'pip', 'helper'}
+    (tmp_path / "helper.py").write_text("")
+    server.run('generate', _options(script, generate=True, validate=False, force=True))
+    assert set(LockfileManager(script).load()['deps']) == {'pip'}
+
+
+def test_daemon_scan_cache_reaches_worker_processes(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path / "cache"))
+    (tmp_path / "helper.py").write_text("import pytest\n")
+    (tmp_path / "other.py").write_text("import json\n")
+    script = tmp_path / "app.py"
+    script.write_text("import pip\nimport helper\nimport other\n")
+    server = PylockServer(tmp_path / "d.sock")
+    server.output = ThreadOutput(sys.stdout)
+    monkeypatch.setattr(sys, "stdout", server.output)
+
+    response = server.run('generate', _options(script, generate=True, validate=False, project=True, workers=2,
+                                               no_cache=False))
+    assert response['results'][0]['status'] == 'generated'
+    assert set(LockfileManager(script).load()['deps']) == {'pip', 'pytest'}
+
+
+def test_daemon_warm_forgets_the_old_environment(tmp_path, monkeypatch):
+    from pydepguard.pylock import resolver, utils
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path / "cache"))
+    resolver.direct_requirements("pip", signature="old")
+    utils._distribution_info("pip", "old")
+    PylockServer(tmp_path / "d.sock").warm()
+    assert resolver._installed_requirements.cache_info().currsize == 0
+    assert utils._distribution_info.cache_info().currsize == 0
+    assert resolver._installed_requirements.cache_info().maxsize is not None
+
+
+def test_daemon_rejects_bad_requests(daemon):
+    with pytest.raises(DaemonError, match="Unknown op"):
+        request(daemon.path, {'op': 'nope'})
+    assert daemon.handle({'op': 'ping', 'version': PROTOCOL_VERSION + 1})['ok'] is False
+    response = daemon.handle({'op': 'validate', 'version': PROTOCOL_VERSION, 'executable': '/other/python'})
+    assert "validates" in response['error']
+
+
+def test_daemon_refuses_second_server(daemon):
+    with pytest.raises(DaemonError, match="already serving"):
+        PylockServer(daemon.path)._claim_socket()
+
+
+def test_request_without_daemon(tmp_path):
+    with pytest.raises(DaemonError, match="No pylock daemon"):
+        request(tmp_path / "none.sock", {'op': 'ping'})
+
+
+def test_lockfile_cache_reloads_on_change(tmp_path):
+    script = tmp_path / "app.py"
+    script.write_text("import pip\n")
+    lm = LockfileManager(script)
+    lm.save({'pip': {'version': '1'}})
+    cache = _LockfileCache()
+
+    first = cache.load(lm)
+    assert cache.load(LockfileManager(script)) is first
+
+    lm.save({'pip': {'version': '2'}, 'json': {'version': 'stdlib'}})
+    assert set(cache.load(LockfileManager(script))['deps']) == {'pip', 'json'}
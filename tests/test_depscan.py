@@ -1,6 +1,7 @@
 import tempfile
 from pathlib import Path
-from pydepguard.pylock.depscan import scan_script_for_imports, ImportReference
+from pydepguard.pylock import depscan
+from pydepguard.pylock.depscan import scan_script_for_imports, scan_project_for_imports, scan_files_for_imports, walk_project_imports, ImportReference
 
 def write_temp_script(code: str) -> Path:
     with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as tmp:
@@ -197,4 +198,208 @@ def test_importlib_no_args():
     print_refs("IMPORTLIB NO ARGS", results)
 
     assert any(r.module == 'importlib' and r.import_type == 'import' for r in results)
-    assert all(r.import_type != 'dynamic' for r in results)
\ No newline at end of file
+    assert all(r.import_type != 'dynamic' for r in results)
+
+def write_project(root: Path, files: dict[str, str]):
+    for name, code in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(code)
+
+
+def test_project_scan_follows_local_imports(tmp_path):
+    write_project(tmp_path, {
+        "main.py": "import helpers\nfrom app import views\nimport requests\n",
+        "helpers.py": "import yaml\nfrom app.models import Model\n",
+        "app/__init__.py": "",
+        "app/views.py": "from . import models\nfrom .util import fmt\nimport flask\n",
+        "app/models.py": "import sqlalchemy\nfrom .. import helpers\n",
+        "app/util.py": "import numpy as np\n",
+        "unused.py": "import django\n",
+    })
+
+    refs, _, files = scan_project_for_imports(tmp_path / "main.py")
+
+    scanned = {f.relative_to(tmp_path).as_posix() for f in files}
+    assert scanned == {"main.py", "helpers.py", "app/__init__.py", "app/views.py", "app/models.py", "app/util.py"}
+    assert len(files) == len(scanned)
+
+    modules = {r.module for r in refs}
+    assert modules == {"requests", "yaml", "flask", "sqlalchemy", "numpy"}
+
+    flask_ref = next(r for r in refs if r.module == "flask")
+    assert flask_ref.file == str(tmp_path / "app" / "views.py")
+    assert flask_ref.line == 3
+
+
+def test_project_scan_handles_cycles_and_missing_modules(tmp_path):
+    write_project(tmp_path, {
+        "main.py": "import a\nfrom . import ghost\n",
+        "a.py": "import b\nimport os\n",
+        "b.py": "import a\nimport a.thing\n",
+    })
+
+    refs, _, files = scan_project_for_imports(tmp_path / "main.py")
+    assert [f.name for f in files] == ["main.py", "a.py", "b.py"]
+    assert {r.module for r in refs} == {"os"}
+
+
+def test_project_scan_with_workers_matches_serial(tmp_path):
+    files = {"main.py": "".join(f"import mod{i}\n" for i in range(8)) + "import requests\n"}
+    for i in range(8):
+        files[f"mod{i}.py"] = f"import third_party_{i}\nimport os\n\nundefined_{i}\n"
+    write_project(tmp_path, files)
+
+    serial = scan_project_for_imports(tmp_path / "main.py")
+    parallel = scan_project_for_imports(tmp_path / "main.py", workers=2)
+
+    assert parallel[2] == serial[2]
+    assert parallel[0] == serial[0]
+    assert parallel[1] == serial[1]
+    assert {s.name for s in parallel[1]} == {f"undefined_{i}" for i in range(8)}
+
+
+def test_walk_project_reuses_recorded_refs(tmp_path, monkeypatch):
+    write_project(tmp_path, {
+        "main.py": "import a\nimport b\n",
+        "a.py": "import yaml\n",
+        "b.py": "import flask\n",
+        "c.py": "import numpy\n",
+    })
+    main = (tmp_path / "main.py").resolve()
+    # main.py's recorded imports are stale on purpose: they are resolved again,
+    # but the file itself is not parsed.
+    recorded = {main: [ImportReference(module="c", file=str(main), line=1, import_type="import")]}
+    pools = []
+    real_scanner = depscan._file_scanner
+
+    def counting_scanner(*args, **kwargs):
+        pools.append(args)
+        return real_scanner(*args, **kwargs)
+
+    monkeypatch.setattr(depscan, "_file_scanner", counting_scanner)
+    walked = list(walk_project_imports(main, recorded=recorded.get, workers=2))
+
+    assert [path.name for path, *_ in walked] == ["main.py", "c.py"]
+    assert walked[0][3] is None and walked[1][3] == []
+    assert [ref.module for ref in walked[1][2]] == ["numpy"]
+    assert len(pools) == 1
+
+
+def test_walk_project_without_follow_keeps_local_imports(tmp_path):
+    write_project(tmp_path, {"main.py": "import a\nfrom . import b\n", "a.py": "import yaml\n"})
+    walked = list(walk_project_imports(tmp_path / "main.py", follow=False))
+    assert len(walked) == 1
+    assert [ref.module for ref in walked[0][2]] == ["a", "."]
+
+
+def test_project_scan_ignores_plain_data_directories(tmp_path):
+    write_project(tmp_path, {
+        "main.py": "import pytest\nimport plugins.extra\n",
+        "pytest/results.txt": "",
+        "plugins/extra.py": "import yaml\n",
+    })
+    refs, _, files = scan_project_for_imports(tmp_path / "main.py")
+    assert {r.module for r in refs} == {"pytest", "yaml"}
+    assert [f.name for f in files] == ["main.py", "extra.py"]
+
+
+def test_scan_files_for_imports(tmp_path):
+    write_project(tmp_path, {"a.py": "import json\n", "b.py": "from x import y\n"})
+
+    results = scan_files_for_imports([tmp_path / "a.py", tmp_path / "b.py"], workers=2)
+    assert results[tmp_path / "a.py"][0][0].module == "json"
+    assert results[tmp_path / "b.py"][0][0].imported_symbols == ["y"]
+    assert results[tmp_path / "b.py"][0][0].file == str(tmp_path / "b.py")
+
+
+def unbound_names(code: str) -> set[str]:
+    _, unbound = scan_script_for_imports(write_temp_script(code))
+    return {sym.name for sym in unbound}
+
+
+def test_unbound_symbol_reported_once():
+    code = "print(missing)\nmissing.attr\nmissing()\n"
+    _, unbound = scan_script_for_imports(write_temp_script(code))
+    assert [(s.name, s.line) for s in unbound] == [("missing", 1)]
+
+
+def test_unbound_ignores_locally_bound_names():
+    code = '''
+import os.path
+from json import dumps as to_json
+from typing import *
+
+def handler(a, /, b=1, *args, c, d=2, **kwargs):
+    total = a + b + c + d + len(args) + len(kwargs)
+    squares = [n * n for n in range(total) if n]
+    lookup = {k: v for k, v in kwargs.items()}
+    for i, (x, y) in enumerate(lookup.items()):
+        total += i
+    with open(os.path.join("a", "b")) as fh, open("c") as (fh2):
+        fh.read(); fh2.read()
+    try:
+        pass
+    except ValueError as err:
+        print(err)
+    if (size := len(squares)) > 1:
+        print(size)
+    fn = lambda q, *rest: q + helper(q)
+    return to_json([squares, fn, Optional])
+
+def helper(value):
+    global counter
+    counter = value
+    return counter
+
+class Widget:
+    kind = "widget"
+    def describe(self):
+        return self.kind + __class__.__name__ + __file__
+
+match helper(1):
+    case {"key": found, **rest}:
+        print(found, rest)
+    case [first, *others]:
+        print(first, others)
+    case Widget() as widget:
+        print(widget)
+'''
+    assert unbound_names(code) == set()
+
+
+def test_unbound_respects_scope_boundaries():
+    code = '''
+def first():
+    local_only = 1
+    return local_only
+
+def second():
+    return local_only
+
+class Config:
+    setting = 1
+    def read(self):
+        return setting
+
+values = [item for item in range(3)]
+print(item)
+'''
+    assert unbound_names(code) == {"local_only", "setting", "item"}
+
+
+def test_walrus_in_comprehension_binds_enclosing_scope():
+    code = '''
+def check(data):
+    if any((hit := x) > 2 for x in data):
+        return hit
+    return x
+'''
+    assert unbound_names(code) == {"x"}
+
+
+def test_from_import_alias_binds_alias_name():
+    code = "from collections import OrderedDict as OD\nOD()\nOrderedDict()\n"
+    results, unbound = scan_script_for_imports(write_temp_script(code))
+    assert results[0].imported_symbols == ["OrderedDict"]
+    assert {s.name for s in unbound} == {"OrderedDict"}
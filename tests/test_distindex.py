@@ -0,0 +1,98 @@
+import importlib.metadata
+import json
+import os
+from pathlib import PurePosixPath
+from pydepguard.pylock import distindex
+from pydepguard.pylock.package_handler import guess_distribution_name
+
+
+class FakeDist:
+    def __init__(self, name, top_level=None, files=()):
+        self.metadata = {"Name": name}
+        self._top_level = top_level
+        self.files = [PurePosixPath(f) for f in files]
+
+    def read_text(self, filename):
+        if filename == "top_level.txt":
+            return self._top_level
+        return None
+
+
+FAKE_DISTS = [
+    FakeDist("PyYAML", top_level="_yaml\nyaml\n"),
+    FakeDist("attrs", files=[
+        "attr/__init__.py",
+        "attrs/__init__.py",
+        "attrs-23.1.0.dist-info/RECORD",
+        "../../bin/attrs-cli",
+    ]),
+    FakeDist("six", files=["six.py", "six-1.16.0.dist-info/METADATA", "__pycache__/six.cpython-311.pyc"]),
+    FakeDist("distutils-precedence", files=["distutils-precedence.pth"]),
+]
+
+
+def use_fake_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(distindex, "_index", None)
+    monkeypatch.setattr(importlib.metadata, "distributions", lambda: iter(FAKE_DISTS))
+
+
+def test_index_uses_top_level_and_record(monkeypatch, tmp_path):
+    use_fake_environment(monkeypatch, tmp_path)
+
+    index = distindex.get_distribution_index()
+    assert index.lookup("yaml") == "PyYAML"
+    assert index.lookup("attr") == "attrs"
+    assert index.lookup("attrs") == "attrs"
+    assert index.lookup("six") == "six"
+    assert index.lookup("__pycache__") is None
+    assert index.lookup("distutils-precedence") is None
+    assert index.lookup("nothere") is None
+
+
+def test_index_persists_to_disk(monkeypatch, tmp_path):
+    use_fake_environment(monkeypatch, tmp_path)
+    distindex.get_distribution_index()
+
+    files = list(tmp_path.glob("distindex-*.json"))
+    assert len(files) == 1
+    data = json.loads(files[0].read_text())
+    assert data["modules"]["yaml"] == ["PyYAML"]
+
+    def no_scan():
+        raise AssertionError("index should have been loaded from disk")
+
+    monkeypatch.setattr(distindex, "_index", None)
+    monkeypatch.setattr(importlib.metadata, "distributions", no_scan)
+    assert guess_distribution_name("yaml") == "PyYAML"
+
+
+def test_index_invalidated_when_environment_changes(monkeypatch, tmp_path):
+    site_dir = tmp_path / "site"
+    site_dir.mkdir()
+    monkeypatch.setattr(distindex.sys, "path", [str(site_dir)])
+    use_fake_environment(monkeypatch, tmp_path / "cache")
+
+    first = distindex.get_distribution_index()
+    assert first.lookup("six") == "six"
+
+    monkeypatch.setattr(importlib.metadata, "distributions", lambda: iter([FakeDist("six-ng", top_level="six")]))
+    assert distindex.get_distribution_index() is first
+
+    stat = os.stat(site_dir)
+    os.utime(site_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert distindex.get_distribution_index().lookup("six") == "six-ng"
+
+
+def test_search_paths_skip_the_working_directory(monkeypatch, tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    work = tmp_path / "work"
+    work.mkdir()
+    monkeypatch.chdir(work)
+    monkeypatch.setattr("sys.path", ["", str(work), str(site)])
+    assert distindex.search_paths() == [str(site)]
+
+    before = distindex.environment_signature()
+    (work / "app_dep.lck").write_text("{}")
+    assert distindex.environment_signature() == before
@@ -0,0 +1,226 @@
+import os
+from pydepguard.pylock import utils
+from pydepguard.pylock.generator import file_state, generate, is_stale, refresh_lockfile
+from pydepguard.pylock.lockfile import LockfileManager
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_file_state(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("import pip\n")
+    state, changed = file_state(path)
+    assert changed and set(state) == {'sha256', 'mtime_ns', 'size'}
+
+    assert file_state(path, state) == (state, False)
+
+    _bump_mtime(path)
+    touched, changed = file_state(path, state)
+    assert not changed and touched['mtime_ns'] != state['mtime_ns']
+
+    path.write_text("import pytest\n")
+    assert file_state(path, state)[1]
+
+
+def test_generate_skips_unchanged_script(tmp_path):
+    script = tmp_path / "app.py"
+    script.write_text("import pip\n")
+    lm = LockfileManager(script)
+
+    deps, _, files, rescanned = generate(lm, script)
+    assert list(deps) == ['pip']
+    assert rescanned == files == [script]
+    assert generate(lm, script) is None
+
+    # A touch re-hashes but does not re-parse.
+    _bump_mtime(script)
+    deps, _, _, rescanned = generate(lm, script)
+    assert list(deps) == ['pip'] and rescanned == []
+    assert generate(lm, script) is None
+
+    assert generate(lm, script, force=True)[3] == [script]
+
+
+def test_generate_merges_changed_project_files(tmp_path, monkeypatch):
+    (tmp_path / "main.py").write_text("import helper\nimport pip\n")
+    (tmp_path / "helper.py").write_text("import json\n")
+    script = tmp_path / "main.py"
+    lm = LockfileManager(script)
+    generate(lm, script, project=True)
+
+    enriched = []
+    real_info = utils._distribution_info
+
+    def counting_info(top, signature):
+        enriched.append(top)
+        return real_info(top, signature)
+
+    monkeypatch.setattr(utils, "_distribution_info", counting_info)
+    (tmp_path / "helper.py").write_text("import json\nimport pytest\n")
+    deps, _, files, rescanned = generate(lm, script, project=True)
+
+    assert rescanned == [(tmp_path / "helper.py").resolve()]
+    assert len(files) == 2
+    assert list(deps) == ['pip', 'pytest']
+    assert deps['pip']['origin'] == f"{script.resolve()}:2"
+    assert deps['pytest']['origin'] == f"{(tmp_path / 'helper.py').resolve()}:2"
+    # pip was already locked against this environment.
+    assert enriched == ['pytest']
+    assert set(lm.load()['meta']['sources']) == {'main.py', 'helper.py'}
+
+
+def test_generate_follows_new_local_imports(tmp_path):
+    (tmp_path / "main.py").write_text("import pip\n")
+    (tmp_path / "extra.py").write_text("import pytest\n")
+    script = tmp_path / "main.py"
+    lm = LockfileManager(script)
+    generate(lm, script, project=True)
+
+    (tmp_path / "main.py").write_text("import pip\nimport extra\n")
+    deps, _, files, _ = generate(lm, script, project=True)
+    assert list(deps) == ['pip', 'pytest']
+
+    (tmp_path / "main.py").write_text("import pip\n")
+    deps, _, files, _ = generate(lm, script, project=True)
+    assert list(deps) == ['pip'] and len(files) == 1
+    assert lm.load()['meta']['files'] == ['main.py']
+
+
+def test_generate_reenriches_when_environment_changes(tmp_path, monkeypatch):
+    script = tmp_path / "app.py"
+    script.write_text("import pip\n")
+    lm = LockfileManager(script)
+    generate(lm, script)
+
+    monkeypatch.setattr("pydepguard.pylock.generator.environment_signature", lambda: "changed")
+    deps, _, _, rescanned = generate(lm, script)
+    assert rescanned == [] and list(deps) == ['pip']
+    assert lm.load()['meta']['env_signature'] == "changed"
+
+
+def test_is_stale_and_refresh(tmp_path, monkeypatch, capsys):
+    script = tmp_path / "app.py"
+    script.write_text("import pip\nimport json\n")
+    lm = LockfileManager(script)
+    generate(lm, script)
+    lockfile = lm.load()
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("unchanged script must not be rescanned")
+
+    monkeypatch.setattr("pydepguard.pylock.depscan.scan_script_for_imports", no_scan)
+    assert not is_stale(lm, script, lockfile)
+    _bump_mtime(script)
+    assert not is_stale(lm, script, lockfile)
+    monkeypatch.undo()
+
+    script.write_text("import pytest\n")
+    assert is_stale(lm, script, lockfile)
+    refreshed = refresh_lockfile(lm, script, lockfile)
+    assert list(refreshed['deps']) == ['pytest']
+    out = capsys.readouterr().out
+    assert "New dependencies: pytest" in out
+    assert "No longer imported: pip" in out
+    assert lm.load()['deps'].keys() == {'pytest'}
+
+
+def test_generate_ignores_sources_from_other_mode(tmp_path):
+    (tmp_path / "main.py").write_text("import helper\n")
+    (tmp_path / "helper.py").write_text("import pip\n")
+    script = tmp_path / "main.py"
+    lm = LockfileManager(script)
+
+    deps, _, _, _ = generate(lm, script)
+    assert list(deps) == [] and lm.load()['meta']['mode'] == 'script'
+
+    deps, _, files, rescanned = generate(lm, script, project=True)
+    assert list(deps) == ['pip'] and rescanned == files and len(files) == 2
+    assert lm.load()['meta']['mode'] == 'project'
+
+    deps, _, files, _ = generate(lm, script)
+    assert list(deps) == [] and files == [script]
+
+
+def test_generate_reresolves_imports_of_unchanged_files(tmp_path):
+    (tmp_path / "main.py").write_text("import helper\nimport pip\n")
+    (tmp_path / "helper.py").write_text("import json\n")
+    script = tmp_path / "main.py"
+    lm = LockfileManager(script)
+    generate(lm, script, project=True)
+
+    # helper.py becomes a package; main.py itself is untouched.
+    (tmp_path / "helper.py").unlink()
+    (tmp_path / "helper").mkdir()
+    (tmp_path / "helper" / "__init__.py").write_text("import pytest\n")
+    deps, _, files, rescanned = generate(lm, script, project=True)
+    assert list(deps) == ['pip', 'pytest']
+    assert rescanned == [(tmp_path / "helper" / "__init__.py").resolve()]
+    assert set(lm.load()['meta']['sources']) == {'main.py', 'helper/__init__.py'}
+
+    # A new local module shadows the installed pip.
+    (tmp_path / "pip.py").write_text("import json\n")
+    deps, _, files, _ = generate(lm, script, project=True)
+    assert list(deps) == ['pytest'] and len(files) == 3
+
+
+def test_refresh_keeps_pins_when_environment_differs(tmp_path, monkeypatch, capsys):
+    script = tmp_path / "app.py"
+    script.write_text("import pytest\n")
+    lm = LockfileManager(script)
+    generate(lm, script)
+    lockfile = lm.load()
+    lockfile['deps']['pytest'].update(version='7.0.0', distribution='pytest')
+    lm._write(lockfile)
+    lockfile = lm.load()
+
+    monkeypatch.setattr("pydepguard.pylock.generator.environment_signature", lambda: "another-machine")
+    script.write_text("import pytest\nimport pip\nprint('changed')\n")
+    assert is_stale(lm, script, lockfile)
+    refreshed = refresh_lockfile(lm, script, lockfile)
+
+    assert refreshed['deps']['pytest'] == lockfile['deps']['pytest'] | {'origins': [f"{script}:1"]}
+    assert refreshed['deps']['pip']['version'] != 'unknown'
+    assert lm.load()['meta']['env_signature'] == lockfile['meta']['env_signature']
+    out = capsys.readouterr().out
+    assert "New dependencies: pip" in out and "Version changed" not in out
+
+
+def test_refresh_of_lockfile_without_sources_keeps_pins(tmp_path):
+    script = tmp_path / "app.py"
+    script.write_text("import pytest\n")
+    lm = LockfileManager(script)
+    lm.save({'pytest': {'version': '7.0.0', 'origin': f"{script}:1", 'tree': ['pluggy']}})
+    lockfile = lm.load()
+
+    assert is_stale(lm, script, lockfile)
+    refreshed = refresh_lockfile(lm, script, lockfile)
+    assert refreshed['deps']['pytest']['version'] == '7.0.0'
+    assert refreshed['deps']['pytest']['tree'] == ['pluggy']
+    assert 'app.py' in lm.load()['meta']['sources']
+    assert not is_stale(lm, script, lm.load())
+
+
+def test_project_and_script_mode_agree_on_data_directories(tmp_path):
+    script = tmp_path / "app.py"
+    script.write_text("import pytest\n")
+    (tmp_path / "pytest").mkdir()
+    (tmp_path / "pytest" / "report.xml").write_text("")
+    lm = LockfileManager(script)
+
+    assert list(generate(lm, script)[0]) == ['pytest']
+    assert list(generate(lm, script, project=True)[0]) == ['pytest']
+
+
+def test_generate_reports_unbound_symbols_of_reused_files(tmp_path, monkeypatch):
+    script = tmp_path / "app.py"
+    script.write_text("import pip\nundefined_thing()\n")
+    lm = LockfileManager(script)
+    assert [sym.name for sym in generate(lm, script)[1]] == ['undefined_thing']
+
+    monkeypatch.setattr("pydepguard.pylock.generator.environment_signature", lambda: "changed")
+    _, unbound, _, rescanned = generate(lm, script)
+    assert rescanned == []
+    assert [(sym.name, sym.line, sym.file) for sym in unbound] == [('undefined_thing', 2, str(script))]
@@ -0,0 +1,71 @@
+import base64
+import hashlib
+from pydepguard.pylock import hashing
+from pydepguard.pylock.hashing import hash_file, parse_record, record_digest, verify_distributions
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b'=').decode()
+
+
+def _install(site, files):
+    dist_info = site / "demo-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    rows = []
+    for rel, data in files.items():
+        path = site / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        rows.append(f"{rel},sha256={_b64(data)},{len(data)}")
+    rows.append("demo/__pycache__/mod.cpython-311.pyc,,")
+    rows.append("demo-1.0.dist-info/RECORD,,")
+    record = "\n".join(rows) + "\n"
+    (dist_info / "RECORD").write_text(record)
+    return dist_info, record
+
+
+def test_parse_record_and_digest():
+    record = "a.py,sha256=abc,3\nb.py,sha256=def,\nRECORD,,\n"
+    entries = parse_record(record)
+    assert [(e.path, e.digest, e.size) for e in entries] == [("a.py", "abc", 3), ("b.py", "def", None)]
+    reordered = "b.py,sha256=def,\na.py,sha256=abc,3\n"
+    assert record_digest(record) == record_digest(reordered)
+    assert record_digest(record) != record_digest("a.py,sha256=abd,3\n")
+
+
+def test_hash_file_small_and_mmapped(tmp_path, monkeypatch):
+    data = b"x" * 100_000 + b"y"
+    path = tmp_path / "blob"
+    path.write_bytes(data)
+    assert hash_file(path) == _b64(data)
+
+    monkeypatch.setattr(hashing, "MMAP_THRESHOLD", 1)
+    monkeypatch.setattr(hashing, "CHUNK_SIZE", 4096)
+    assert hash_file(path) == _b64(data)
+
+
+def test_verify_distributions(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    dist_info, record = _install(site, {
+        "demo/__init__.py": b"",
+        "demo/mod.py": b"VALUE = 1\n",
+        "demo/data.bin": b"\0" * 5000,
+    })
+    monkeypatch.setattr(hashing, "BATCH_BYTES", 10)
+    target = ("demo", str(dist_info), str(site), record_digest(record))
+    assert verify_distributions([target], jobs=2) == {"demo": []}
+
+    (site / "demo" / "mod.py").write_bytes(b"VALUE = 2\n")
+    (site / "demo" / "__init__.py").unlink()
+    (site / "demo" / "data.bin").write_bytes(b"\0" * 10)
+    problems = verify_distributions([target], jobs=2)["demo"]
+    assert sorted(problems) == [
+        "demo/__init__.py: missing",
+        "demo/data.bin: size differs",
+        "demo/mod.py: content differs",
+    ]
+
+    stale = ("demo", str(dist_info), str(site), "sha256:0")
+    assert "RECORD differs from the lockfile" in verify_distributions([stale])["demo"]
+    missing = ("demo", str(tmp_path / "nope.dist-info"), str(site), None)
+    assert verify_distributions([missing]) == {"demo": ["no RECORD to verify against"]}
@@ -48,4 +48,81 @@ def test_lockfile_exists_false():
     if os.path.exists(lm.lockfile_path):
         os.remove(lm.lockfile_path)
 
-    assert lm.exists() is False
\ No newline at end of file
+    assert lm.exists() is False
+
+def test_lockfile_record_environment():
+    with tempfile.NamedTemporaryFile(suffix=".py", delete=False) as tmp:
+        script_path = tmp.name
+
+    lm = LockfileManager(script_path)
+    try:
+        lm.save({'requests': {'version': '2.31.0', 'origin': 'script.py:1', 'tree': []}})
+        environment = {'interpreter': 'python', 'fingerprint': 'abc', 'dist_paths': []}
+        lm.record_environment(environment)
+
+        data = LockfileManager(script_path).load()
+        assert data['meta']['environment'] == environment
+        assert data['deps']['requests']['version'] == '2.31.0'
+    finally:
+        if os.path.exists(lm.lockfile_path):
+            os.remove(lm.lockfile_path)
+        if os.path.exists(script_path):
+            os.remove(script_path)
+
+
+def test_lockfile_record_environment_survives_write_errors(tmp_path, monkeypatch, capsys):
+    script = tmp_path / "app.py"
+    script.write_text("import pip\n")
+    lm = LockfileManager(script)
+    lm.save({'pip': {'version': '1'}})
+
+    def read_only(*args, **kwargs):
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr("pydepguard.pylock.lockfile.os.replace", read_only)
+    lm.record_environment({'fingerprint': 'abc'})
+
+    assert "[pylock.WARN] Could not record the validated environment" in capsys.readouterr().out
+    assert 'environment' not in LockfileManager(script).load()['meta']
+    assert [p.name for p in lm.lockfile_dir.iterdir()] == [lm.lockfile_name]
+
+def test_lockfile_keeps_all_origins(tmp_path):
+    script_path = tmp_path / "script.py"
+    script_path.write_text("")
+    lm = LockfileManager(script_path)
+    lm.save({'yaml': {'version': '6.0', 'origin': 'a.py:1', 'origins': ['a.py:1', 'b.py:2'], 'tree': []}})
+
+    data = lm.load()
+    assert data['deps']['yaml']['origin'] == 'a.py:1'
+    assert data['deps']['yaml']['origins'] == ['a.py:1', 'b.py:2']
+
+def test_lockfile_binary_format(tmp_path):
+    script = tmp_path / "app.py"
+    script.write_text("import requests\n")
+    deps = {'requests': {'version': '2.31.0', 'origin': 'app.py:1', 'tree': ['urllib3']}}
+
+    lm = LockfileManager(script, lock_format='binary')
+    lm.save(deps)
+    assert lm.lockfile_path.name == "app_dep.lckb"
+
+    data = LockfileManager(script, lock_format='binary').load()
+    assert dict(data['deps']) == deps
+    assert data['meta']['script'] == "app"
+
+    lm = LockfileManager(script, lock_format='binary')
+    lm.load()
+    lm.record_environment({'fingerprint': 'abc'})
+    data = LockfileManager(script, lock_format='binary').load()
+    assert data['meta']['environment'] == {'fingerprint': 'abc'}
+    assert dict(data['deps']) == deps
+
+def test_lockfile_convert(tmp_path):
+    script = tmp_path / "app.py"
+    script.write_text("")
+    deps = {'requests': {'version': '2.31.0', 'origin': 'app.py:1', 'tree': []}}
+    LockfileManager(script).save(deps)
+
+    binary = LockfileManager(script, lock_format='binary')
+    assert binary.convert() == binary.lockfile_path
+    assert dict(binary.load()['deps']) == deps
+    assert binary.load()['meta'] == LockfileManager(script).load()['meta']
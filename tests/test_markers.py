@@ -0,0 +1,55 @@
+import pytest
+from pydepguard.pylock.markers import Requirement, parse_requirement, evaluate_marker
+
+ENV = {
+    'implementation_name': 'cpython',
+    'implementation_version': '3.11.7',
+    'os_name': 'posix',
+    'platform_machine': 'x86_64',
+    'platform_release': '6.0',
+    'platform_system': 'Linux',
+    'platform_version': '#1',
+    'platform_python_implementation': 'CPython',
+    'python_full_version': '3.11.7',
+    'python_version': '3.11',
+    'sys_platform': 'linux',
+}
+
+
+def test_parse_requirement():
+    assert parse_requirement('urllib3<3,>=1.21.1') == Requirement('urllib3')
+    req = parse_requirement('PySocks!=1.5.7,>=1.5.6; extra == "socks"')
+    assert req.name == 'PySocks'
+    assert req.marker == 'extra == "socks"'
+    assert parse_requirement('requests[Security, socks] (>=2.0)').extras == frozenset({'security', 'socks'})
+
+
+@pytest.mark.parametrize("marker, expected", [
+    ('python_version >= "3.8"', True),
+    ('python_version < "3.10"', False),
+    ('python_version == "3.11.*"', True),
+    ('python_full_version ~= "3.11.0"', True),
+    ('python_full_version ~= "3.10.0"', False),
+    ('sys_platform == "win32"', False),
+    ('sys_platform == "win32" or os_name == "posix"', True),
+    ('(sys_platform == "linux" and python_version < "3.9") or platform_machine == "x86_64"', True),
+    ('"linux" in sys_platform', True),
+    ('"win" not in sys_platform', True),
+    ('implementation_name == "pypy"', False),
+])
+def test_evaluate_marker(marker, expected):
+    assert evaluate_marker(marker, ENV) is expected
+
+
+def test_evaluate_marker_extras():
+    assert not evaluate_marker('extra == "socks"', ENV)
+    assert evaluate_marker('extra == "socks"', ENV, extras=['socks'])
+    assert evaluate_marker('extra == "use-chardet"', ENV, extras=['use_chardet'])
+    assert evaluate_marker('', ENV)
+
+
+def test_evaluate_marker_invalid():
+    with pytest.raises(ValueError):
+        evaluate_marker('python_version >=', ENV)
+    with pytest.raises(ValueError):
+        evaluate_marker('unknown_var == "x"', ENV)
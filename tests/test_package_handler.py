@@ -0,0 +1,94 @@
+import pytest
+import subprocess
+from pydepguard.pylock import package_handler
+from pydepguard.pylock.package_handler import install_packages
+
+
+class FakeCompletedProcess:
+    def __init__(self, returncode, stdout=b"", stderr=b""):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+def test_install_packages_single_pip_call(monkeypatch, capsys):
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return FakeCompletedProcess(0, b"Successfully installed PyYAML-6.0.1 requests-2.31.0\n")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    outcomes = install_packages([("yaml", "6.0.1"), ("requests", "2.31.0")])
+
+    assert len(calls) == 1
+    assert calls[0][-2:] == ["pyyaml", "requests==2.31.0"]
+    assert outcomes == {"yaml": None, "requests": None}
+    out = capsys.readouterr().out
+    assert "Installed pyyaml (6.0.1) successfully." in out
+    assert "Installed requests==2.31.0 (2.31.0) successfully." in out
+
+
+def test_install_packages_falls_back_per_package(monkeypatch):
+    monkeypatch.setattr(subprocess, "run", lambda cmd, **kw: FakeCompletedProcess(1, stderr=b"No matching distribution"))
+    monkeypatch.setattr(package_handler, "is_importable", lambda name: name == "installed_anyway")
+    retried = []
+
+    def fake_install_package(package, version=None, distribution=None):
+        retried.append(package)
+        if package == "broken":
+            raise RuntimeError("[pylock] Failed to install broken")
+        return True
+
+    monkeypatch.setattr(package_handler, "install_package", fake_install_package)
+    outcomes = install_packages([("installed_anyway", None), ("fine", "1.0"), ("broken", "2.0")])
+
+    assert retried == ["fine", "broken"]
+    assert outcomes["installed_anyway"] is None
+    assert outcomes["fine"] is None
+    assert isinstance(outcomes["broken"], RuntimeError)
+
+
+def test_install_packages_empty(monkeypatch):
+    monkeypatch.setattr(subprocess, "run", lambda *a, **kw: (_ for _ in ()).throw(AssertionError("pip should not run")))
+    assert install_packages([]) == {}
+
+
+def test_install_packages_offline(monkeypatch, tmp_path, capsys):
+    import zipfile
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path / "cache"))
+    house = tmp_path / "wheels"
+    house.mkdir()
+    with zipfile.ZipFile(house / "PyYAML-6.0.1-py3-none-any.whl", "w") as zf:
+        zf.writestr("yaml/__init__.py", "")
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        # Unsatisfiable pins must be reported before pip runs.
+        assert "Not satisfiable from wheelhouse" in capsys.readouterr().out
+        return FakeCompletedProcess(0, b"Successfully installed PyYAML-6.0.1\n")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    outcomes = package_handler.install_packages_offline([("yaml", "6.0.1"), ("requests", "2.31.0")], house)
+
+    assert len(calls) == 1
+    assert calls[0][-4:] == ["--no-index", "--find-links", str(house.resolve()), "PyYAML==6.0.1"]
+    assert outcomes["yaml"] is None
+    assert isinstance(outcomes["requests"], RuntimeError)
+
+
+def test_install_packages_offline_failure_does_not_hit_network(monkeypatch, tmp_path):
+    import zipfile
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path / "cache"))
+    house = tmp_path / "wheels"
+    house.mkdir()
+    with zipfile.ZipFile(house / "requests-2.31.0-py3-none-any.whl", "w") as zf:
+        zf.writestr("requests/__init__.py", "")
+    calls = []
+    monkeypatch.setattr(subprocess, "run", lambda cmd, **kw: calls.append(cmd) or FakeCompletedProcess(1, stderr=b"boom"))
+    monkeypatch.setattr(package_handler, "ensure_package", lambda *a: pytest.fail("must not fall back to the index"))
+
+    outcomes = package_handler.install_packages_offline([("requests", "2.31.0")], house)
+    assert len(calls) == 1
+    assert isinstance(outcomes["requests"], RuntimeError)
@@ -0,0 +1,65 @@
+import json
+import sys
+import pytest
+from pydepguard.pylock import profiling
+from pydepguard.pylock.cli import main as pylock_main
+
+
+def test_span_is_free_without_hooks():
+    assert not profiling.enabled()
+    assert profiling.span('parse') is profiling.span('scan', files=3)
+
+
+def test_hooks_see_nested_spans():
+    seen = []
+    hook = seen.append
+    profiling.add_hook(hook)
+    try:
+        with profiling.span('generate', script='a.py'):
+            with profiling.span('parse', file='a.py') as inner:
+                assert inner.parent == 'generate'
+    finally:
+        profiling.remove_hook(hook)
+    assert [(s.name, s.parent) for s in seen] == [('parse', 'generate'), ('generate', None)]
+    assert seen[1].attrs == {'script': 'a.py'} and seen[1].duration >= seen[0].duration
+
+
+def test_failing_hook_does_not_break_work(capsys):
+    def broken(span):
+        raise RuntimeError("metrics down")
+    profiling.add_hook(broken)
+    try:
+        with profiling.span('validate'):
+            result = 42
+    finally:
+        profiling.remove_hook(broken)
+    assert result == 42
+    assert "metrics down" in capsys.readouterr().out
+
+
+def test_session_writes_report_on_exit(tmp_path):
+    report_path = tmp_path / "profile.json"
+    with pytest.raises(SystemExit):
+        with profiling.session(str(report_path)):
+            for _ in range(2):
+                with profiling.span('validate.dependency', dependency='pip'):
+                    pass
+            sys.exit(1)
+    report = json.loads(report_path.read_text())
+    assert report['version'] == profiling.REPORT_VERSION
+    assert report['phases']['validate.dependency']['count'] == 2
+    assert report['spans'][0]['attrs'] == {'dependency': 'pip'}
+    assert not profiling.enabled()
+
+
+def test_cli_profile_report(tmp_path, monkeypatch):
+    script = tmp_path / "app.py"
+    script.write_text("import pip\n")
+    report_path = tmp_path / "profile.json"
+    stats_path = tmp_path / "profile.prof"
+    monkeypatch.setattr(sys, "argv", ["pylock", str(script), "--generate", "--no-cache",
+                                      "--profile", str(report_path), "--cprofile", str(stats_path)])
+    pylock_main()
+    phases = json.loads(report_path.read_text())['phases']
+    assert {'generate', 'scan', 'parse', 'symbols', 'classify', 'enrich', 'lockfile.write'} <= set(phases)
+    assert stats_path.stat().st_size > 0
@@ -0,0 +1,142 @@
+import importlib.metadata
+import importlib.util
+import pytest
+from pydepguard.pylock import resolver
+from pydepguard.pylock.resolver import (
+    classify_module, clear_classification_cache, is_stdlib_module,
+    direct_requirements, resolve_transitive,
+    STDLIB, LOCAL, THIRD_PARTY, UNRESOLVABLE,
+)
+from pydepguard.pylock.utils import enrich_dependencies
+from pydepguard.pylock.depscan import ImportReference
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    def no_find_spec(*args, **kwargs):
+        raise AssertionError("classification must not locate or import modules")
+
+    monkeypatch.setattr(importlib.util, "find_spec", no_find_spec)
+    clear_classification_cache()
+    yield
+    clear_classification_cache()
+
+
+def test_classify_stdlib():
+    assert classify_module("os.path") == STDLIB
+    assert classify_module("json") == STDLIB
+    assert classify_module("sys") == STDLIB
+    assert is_stdlib_module("collections.abc")
+    assert not is_stdlib_module("pip")
+
+
+def test_classify_third_party_and_unresolvable():
+    assert classify_module("pip._internal") == THIRD_PARTY
+    assert classify_module("thisshouldnotexist1234") == UNRESOLVABLE
+
+
+def test_classify_local(tmp_path):
+    (tmp_path / "helpers.py").write_text("")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "data").mkdir()
+
+    assert classify_module("helpers", tmp_path) == LOCAL
+    assert classify_module("pkg.sub", tmp_path) == LOCAL
+    assert classify_module("data", tmp_path) == UNRESOLVABLE
+    assert classify_module(".sibling") == LOCAL
+    assert classify_module("helpers") == UNRESOLVABLE
+
+
+def test_classify_is_memoized(monkeypatch):
+    classify_module("thisshouldnotexist1234")
+    with monkeypatch.context() as m:
+        m.setattr(resolver, "_third_party_names", lambda signature: pytest.fail("should be cached"))
+        assert classify_module("thisshouldnotexist1234") == UNRESOLVABLE
+
+
+def test_classify_sees_environment_changes(monkeypatch):
+    assert classify_module("thisshouldnotexist1234", signature="before") == UNRESOLVABLE
+    with monkeypatch.context() as m:
+        m.setattr(resolver, "_third_party_names", lambda signature: frozenset({"thisshouldnotexist1234"}))
+        assert classify_module("thisshouldnotexist1234", signature="before") == UNRESOLVABLE
+        assert classify_module("thisshouldnotexist1234", signature="after") == THIRD_PARTY
+
+
+def test_clear_classification_cache_for_one_project(tmp_path):
+    assert classify_module("helpers", tmp_path) == UNRESOLVABLE
+    (tmp_path / "helpers.py").write_text("")
+    assert classify_module("helpers", tmp_path) == UNRESOLVABLE
+
+    clear_classification_cache(tmp_path)
+    assert classify_module("helpers", tmp_path) == LOCAL
+
+
+def test_enrich_skips_stdlib_and_local(tmp_path):
+    (tmp_path / "helpers.py").write_text("")
+    script = str(tmp_path / "main.py")
+    refs = [
+        ImportReference(module="os", file=script, line=1, import_type="import"),
+        ImportReference(module="helpers", file=script, line=2, import_type="import"),
+        ImportReference(module="..parent", file=script, line=3, import_type="from"),
+        ImportReference(module="pip", file=script, line=4, import_type="import"),
+    ]
+    assert list(enrich_dependencies(refs)) == ["pip"]
+
+
+class FakeDist:
+    def __init__(self, name, version, requires=()):
+        self.metadata = {'Name': name}
+        self.version = version
+        self.requires = list(requires)
+
+
+FAKE_DISTS = {
+    'app': FakeDist('App', '1.0', [
+        'Lib-A>=1',
+        'lib-b; python_version >= "3.0"',
+        'oldpy; python_version < "3.0"',
+        'extra-only; extra == "fast"',
+    ]),
+    'lib-a': FakeDist('Lib-A', '2.1', ['shared', 'lib-b[speed]']),
+    'lib-b': FakeDist('lib_b', '0.3', ['shared', 'accel; extra == "speed"']),
+    'shared': FakeDist('shared', '5.0', ['lib-a']),
+    'accel': FakeDist('accel', '0.9'),
+    'extra-only': FakeDist('extra-only', '1.1', ['not-installed']),
+}
+
+
+@pytest.fixture
+def fake_dists(monkeypatch):
+    calls = []
+
+    def distribution(name):
+        calls.append(name)
+        if name not in FAKE_DISTS:
+            raise importlib.metadata.PackageNotFoundError(name)
+        return FAKE_DISTS[name]
+
+    monkeypatch.setattr(resolver.importlib.metadata, "distribution", distribution)
+    resolver._installed_requirements.cache_clear()
+    yield calls
+    resolver._installed_requirements.cache_clear()
+
+
+def test_direct_requirements_evaluates_markers(fake_dists):
+    assert direct_requirements('app', signature='sig') == ['Lib-A', 'lib-b']
+    assert direct_requirements('app', extras=['fast'], signature='sig') == ['Lib-A', 'lib-b', 'extra-only']
+    assert direct_requirements('missing', signature='sig') == []
+
+
+def test_resolve_transitive_closure(fake_dists):
+    closure = resolve_transitive('App', signature='sig')
+    # Cycle lib-a <-> shared terminates, lib-b[speed] pulls in accel, the
+    # root and marker-excluded nodes are left out.
+    assert closure == {'accel': '0.9', 'Lib-A': '2.1', 'lib_b': '0.3', 'shared': '5.0'}
+    assert sorted(set(fake_dists)) == sorted(fake_dists)
+
+
+def test_resolve_transitive_extras_and_missing(fake_dists):
+    closure = resolve_transitive('app', extras=['fast'], signature='sig')
+    assert closure['extra-only'] == '1.1'
+    assert closure['not-installed'] == 'unknown'
@@ -1,6 +1,7 @@
 import os
 import tempfile
 import subprocess
+import sys
 from pydepguard.pylock.runner import execute_script
 
 def test_execute_script_runs_successfully(capsys):
@@ -30,4 +31,108 @@ def test_execute_script_failure(capsys):
         assert "return code" in captured.out.lower()
     finally:
         if os.path.exists(script_path):
-            os.remove(script_path)
\ No newline at end of file
+            os.remove(script_path)
+
+def write_script(code):
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as tmp:
+        tmp.write(code)
+        return tmp.name
+
+
+def test_execute_script_streams_output_before_exit(capsys):
+    # The child blocks until the parent has seen its first line, which only
+    # works if output is forwarded while the script is still running.
+    marker = tempfile.NamedTemporaryFile(delete=False).name
+    os.remove(marker)
+    script_path = write_script(
+        "import os, sys, time\n"
+        "print('first line')\n"
+        f"while not os.path.exists({marker!r}):\n"
+        "    time.sleep(0.01)\n"
+        "print('second line')\n"
+        "print('to stderr', file=sys.stderr)\n"
+        "sys.exit(3)\n"
+    )
+
+    class Watcher:
+        def __init__(self, stream):
+            self.stream = stream
+        def write(self, text):
+            if 'first line' in text:
+                open(marker, 'w').close()
+            return self.stream.write(text)
+        def flush(self):
+            self.stream.flush()
+
+    original = sys.stdout
+    sys.stdout = Watcher(original)
+    try:
+        rc = execute_script(script_path)
+    finally:
+        sys.stdout = original
+        for path in (script_path, marker):
+            if os.path.exists(path):
+                os.remove(path)
+
+    captured = capsys.readouterr()
+    assert rc == 3
+    assert captured.out.index("first line") < captured.out.index("second line")
+    assert "to stderr" in captured.err
+    assert "return code 3" in captured.out
+
+
+def test_execute_script_inherit_mode(capfd):
+    script_path = write_script("print('inherited output')")
+    try:
+        rc = execute_script(script_path, output='inherit')
+    finally:
+        os.remove(script_path)
+    assert rc == 0
+    assert "inherited output" in capfd.readouterr().out
+
+
+def test_execute_script_buffer_mode(capsys):
+    script_path = write_script("import sys\nprint('buffered')\nsys.exit(2)")
+    try:
+        rc = execute_script(script_path, output='buffer')
+    finally:
+        os.remove(script_path)
+    assert rc == 2
+    assert "buffered" in capsys.readouterr().out
+
+
+def test_run_script_in_process(capsys):
+    from pydepguard.pylock.runner import run_script_in_process
+    script_path = write_script(
+        "import sys\n"
+        "print('in-process', __name__, sys.argv[0].endswith('.py'))\n"
+    )
+    saved_argv = sys.argv[:]
+    try:
+        rc = run_script_in_process(script_path)
+    finally:
+        os.remove(script_path)
+    assert rc == 0
+    assert "in-process __main__ True" in capsys.readouterr().out
+    assert sys.argv == saved_argv
+
+
+def test_run_script_in_process_exit_codes(capsys):
+    from pydepguard.pylock.runner import run_script_in_process
+    cases = {
+        "import sys\nsys.exit(4)": 4,
+        "import sys\nsys.exit('fatal message')": 1,
+        "raise ValueError('in-process failure')": 1,
+        "import sys\nsys.exit()": 0,
+    }
+    for code, expected in cases.items():
+        script_path = write_script(code)
+        try:
+            assert run_script_in_process(script_path) == expected
+        finally:
+            os.remove(script_path)
+
+    captured = capsys.readouterr()
+    assert "fatal message" in captured.err
+    assert "ValueError: in-process failure" in captured.err
+    assert "return code 4" in captured.out
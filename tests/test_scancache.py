@@ -0,0 +1,72 @@
+import os
+from pydepguard.pylock import depscan
+from pydepguard.pylock.depscan import scan_script_for_imports, scan_project_for_imports
+from pydepguard.pylock.scancache import ScanCache
+
+
+def test_cache_hit_skips_parsing(monkeypatch, tmp_path):
+    script = tmp_path / "script.py"
+    script.write_text("import requests\nfrom os import path\nundefined_thing\n")
+    cache = ScanCache(tmp_path / "cache")
+
+    first = scan_script_for_imports(script, cache=cache)
+    assert len(cache.entries()) == 1
+
+    monkeypatch.setattr(depscan, "scan_source_for_imports", lambda *a: (_ for _ in ()).throw(AssertionError("parsed")))
+    second = scan_script_for_imports(script, cache=cache)
+    assert second == first
+
+    # Same content at another path reuses the entry but reports the new path.
+    copy = tmp_path / "copy.py"
+    copy.write_bytes(script.read_bytes())
+    refs, unbound = scan_script_for_imports(copy, cache=cache)
+    assert refs[0].file == str(copy)
+    assert unbound[0].name == "undefined_thing"
+
+
+def test_cache_miss_after_edit(tmp_path):
+    script = tmp_path / "script.py"
+    script.write_text("import json\n")
+    cache = ScanCache(tmp_path / "cache")
+    scan_script_for_imports(script, cache=cache)
+
+    script.write_text("import yaml\n")
+    refs, _ = scan_script_for_imports(script, cache=cache)
+    assert [r.module for r in refs] == ["yaml"]
+    assert len(cache.entries()) == 2
+
+
+def test_syntax_errors_are_not_cached(tmp_path):
+    script = tmp_path / "broken.py"
+    script.write_text("def broken(:")
+    cache = ScanCache(tmp_path / "cache")
+
+    assert scan_script_for_imports(script, cache=cache) == ([], [])
+    assert cache.entries() == []
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = ScanCache(tmp_path / "cache", max_bytes=10_000)
+    keys = [cache.key(f"source {i}".encode()) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, ([["mod", i, "import", []]], []))
+        path = cache._entry_path(key)
+        os.utime(path, (1000 + i, 1000 + i))
+
+    cache.get(keys[0])  # refresh the oldest entry
+    size = cache.entries()[0][1]
+    cache.max_bytes = size * 2
+    cache.prune()
+
+    remaining = {path.stem for _, _, path in cache.entries()}
+    assert remaining == {keys[0], keys[2]}
+
+
+def test_project_scan_uses_cache(monkeypatch, tmp_path):
+    (tmp_path / "main.py").write_text("import helper\n")
+    (tmp_path / "helper.py").write_text("import yaml\n")
+    cache = ScanCache(tmp_path / "cache")
+
+    expected = scan_project_for_imports(tmp_path / "main.py", cache=cache)
+    monkeypatch.setattr(depscan, "scan_source_for_imports", lambda *a: (_ for _ in ()).throw(AssertionError("parsed")))
+    assert scan_project_for_imports(tmp_path / "main.py", cache=cache) == expected
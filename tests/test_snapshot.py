@@ -0,0 +1,72 @@
+from pydepguard.pylock import snapshot as snapshot_module
+from pydepguard.pylock.snapshot import build_snapshot, get_snapshot
+
+
+def make_dist_info(site, dirname, name, version, filename="METADATA"):
+    path = site / dirname
+    path.mkdir()
+    (path / filename).write_text(f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n\nLong description\nVersion: bogus\n")
+    return path
+
+
+def test_snapshot_normalizes_names(tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    make_dist_info(site, "Typing_Extensions-4.8.0.dist-info", "typing_extensions", "4.8.0")
+    make_dist_info(site, "legacy_pkg-1.0-py3.11.egg-info", "Legacy.Pkg", "1.0", filename="PKG-INFO")
+    (site / "not_a_dist").mkdir()
+
+    snap = build_snapshot([str(site)])
+    assert len(snap) == 2
+    info = snap.get("typing-extensions")
+    assert info.version == "4.8.0"
+    assert info.location == str(site)
+    assert snap.get("legacy_pkg").name == "Legacy.Pkg"
+    assert "LEGACY-PKG" in snap
+    assert snap.get("missing") is None
+
+
+def test_snapshot_first_path_wins(tmp_path):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    make_dist_info(first, "demo-2.0.dist-info", "demo", "2.0")
+    make_dist_info(second, "demo-1.0.dist-info", "demo", "1.0")
+
+    snap = build_snapshot([str(first), str(second)])
+    assert snap.get("demo").version == "2.0"
+
+
+def test_get_snapshot_rebuilds_on_environment_change(monkeypatch, tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    monkeypatch.setattr(snapshot_module, "_snapshot", None)
+    monkeypatch.setattr(snapshot_module, "search_paths", lambda: [str(site)])
+
+    first = get_snapshot()
+    assert first.get("demo") is None
+    assert get_snapshot() is first
+
+    make_dist_info(site, "demo-1.0.dist-info", "demo", "1.0")
+    assert get_snapshot().get("demo").version == "1.0"
+
+
+def test_environment_fingerprint_tracks_dist_info(monkeypatch, tmp_path):
+    from pydepguard.pylock.snapshot import environment_fingerprint, environment_matches
+
+    site = tmp_path / "site"
+    site.mkdir()
+    dist_info = make_dist_info(site, "demo-1.0.dist-info", "demo", "1.0")
+    monkeypatch.setattr(snapshot_module, "_snapshot", None)
+    monkeypatch.setattr(snapshot_module, "search_paths", lambda: [str(site)])
+
+    env = environment_fingerprint(["demo"])
+    assert env["dist_paths"] == [str(dist_info)]
+    assert environment_matches(env)
+
+    (dist_info / "METADATA").unlink()
+    dist_info.rmdir()
+    make_dist_info(site, "demo-1.1.dist-info", "demo", "1.1")
+    assert not environment_matches(env)
+    assert environment_fingerprint(["demo", "missing"]) is None
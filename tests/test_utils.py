@@ -11,6 +11,7 @@ def test_enrich_known_package():
     assert info['version'] != 'unknown'
     assert 'urllib3' in info['tree']
     assert info['origin'] == 'app.py:5'
+    assert info['distribution'] == 'requests'
 
 def test_enrich_unknown_package():
     ref = ImportReference(module='thisshouldnotexist1234', file='script.py', line=1, import_type='import')
@@ -21,3 +22,39 @@ def test_enrich_unknown_package():
     assert info['version'] == 'unknown'
     assert info['tree'] == []
     assert info['origin'] == 'script.py:1'
+
+def test_enrich_groups_references_by_package(monkeypatch):
+    from pydepguard.pylock import utils
+    utils._distribution_info.cache_clear()
+    lookups = []
+    real_find = utils.find_distribution
+
+    def counting_find(name):
+        lookups.append(name)
+        return real_find(name)
+
+    monkeypatch.setattr(utils, "find_distribution", counting_find)
+    refs = [
+        ImportReference(module='pip', file='a.py', line=1, import_type='import'),
+        ImportReference(module='pip._internal', file='b.py', line=7, import_type='from'),
+        ImportReference(module='pip', file='a.py', line=40, import_type='import'),
+        ImportReference(module='pip', file='a.py', line=1, import_type='import'),
+    ]
+    enriched = enrich_dependencies(refs)
+
+    assert lookups == ['pip']
+    assert enriched['pip']['origin'] == 'a.py:1'
+    assert enriched['pip']['origins'] == ['a.py:1', 'b.py:7', 'a.py:40']
+
+    enrich_dependencies(refs)
+    assert lookups == ['pip']
+
+def test_enrich_records_transitive_closure():
+    ref = ImportReference(module='requests', file='app.py', line=5, import_type='import')
+    info = enrich_dependencies([ref])['requests']
+
+    assert 'urllib3' in info['transitive']
+    assert 'requests' not in info['transitive']
+    assert info['digest'].startswith('sha256:')
+    # Optional extras like socks are not part of the default closure.
+    assert not any(name.lower() == 'pysocks' for name in info['transitive'])
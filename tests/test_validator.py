@@ -33,7 +33,7 @@ def test_importlib_fails_pip_show_succeeds(monkeypatch):
 
     monkeypatch.setattr(subprocess, "run", lambda *a, **kw: FakeCompletedProcess())
 
-    result = resolve_installed_package_info("example")
+    result = resolve_installed_package_info("example", pip_fallback=True)
     assert result['available'] is True
     assert result['version'] == "1.2.3"
     assert result['source'] == "pip_show"
@@ -52,7 +52,7 @@ def test_pip_show_no_version(monkeypatch):
 
     monkeypatch.setattr(subprocess, "run", lambda *a, **kw: NoVersionProcess())
 
-    result = resolve_installed_package_info("something")
+    result = resolve_installed_package_info("something", pip_fallback=True)
     assert result['available'] is True
     assert result['version'] is None
     assert result['source'] == "pip_show"
@@ -70,11 +70,36 @@ def test_all_methods_fail(monkeypatch):
     monkeypatch.setattr("importlib.metadata.version", fail_version)
     monkeypatch.setattr(subprocess, "run", lambda *a, **kw: FakeProcess())
 
-    result = resolve_installed_package_info("nonexistent")
+    result = resolve_installed_package_info("nonexistent", pip_fallback=True)
     assert result['available'] is False
     assert result['version'] is None
     assert result['source'] == "none"
 
+def test_pip_show_not_used_by_default(monkeypatch):
+    def fail_version(name):
+        raise importlib.metadata.PackageNotFoundError
+
+    monkeypatch.setattr("importlib.metadata.version", fail_version)
+    monkeypatch.setattr(subprocess, "run", lambda *a, **kw: pytest.fail("pip show should be opt-in"))
+
+    result = resolve_installed_package_info("nonexistent")
+    assert result == {'available': False, 'version': None, 'source': 'none'}
+
+def test_availability_uses_snapshot(monkeypatch):
+    from pydepguard.pylock.snapshot import EnvironmentSnapshot, InstalledDistribution
+
+    snapshot = EnvironmentSnapshot({
+        'zope-interface': InstalledDistribution('zope.interface', '6.0', '/site', '/site/zope.interface-6.0.dist-info'),
+    }, 'sig')
+    monkeypatch.setattr("pydepguard.pylock.validator.get_snapshot", lambda: snapshot)
+    monkeypatch.setattr("pydepguard.pylock.validator.resolve_installed_package_info",
+                        lambda *a, **kw: pytest.fail("snapshot hit should not fall back"))
+
+    result = check_package_availability("Zope_Interface", expected_version="6.0")
+    assert result['available'] is True
+    assert result['version_matches'] is True
+    assert result['source'] == 'snapshot'
+
 def test_version_match(monkeypatch):
     monkeypatch.setattr("importlib.metadata.version", lambda _: "2.0.0")
     result = check_package_availability("flask", expected_version="2.0.0")
@@ -88,7 +113,7 @@ def test_version_mismatch(monkeypatch):
     assert result['version_matches'] is False
 
 def test_validate_passes_with_defaults(monkeypatch):
-    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None: {
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
         'available': True,
         'version_matches': True,
         'version': ver,
@@ -100,7 +125,7 @@ def test_validate_passes_with_defaults(monkeypatch):
 
 
 def test_validate_missing_package_warn(monkeypatch):
-    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None: {
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
         'available': False,
         'version_matches': False,
         'version': None,
@@ -112,7 +137,7 @@ def test_validate_missing_package_warn(monkeypatch):
 
 
 def test_validate_version_mismatch_strict(monkeypatch):
-    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None: {
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
         'available': True,
         'version_matches': False,
         'version': '1.0.0',
@@ -125,7 +150,7 @@ def test_validate_version_mismatch_strict(monkeypatch):
 
 
 def test_validate_version_mismatch_non_strict(monkeypatch):
-    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None: {
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
         'available': True,
         'version_matches': False,
         'version': '1.0.0',
@@ -159,7 +184,7 @@ def test_validate_check_package_crashes_warn(monkeypatch):
 
 
 def test_validate_missing_package_skip(monkeypatch):
-    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None: {
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
         'available': False,
         'version_matches': False,
         'version': None,
@@ -170,7 +195,7 @@ def test_validate_missing_package_skip(monkeypatch):
 
 
 def test_validate_version_mismatch_input_decline(monkeypatch):
-    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None: {
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
         'available': True,
         'version_matches': False,
         'version': '1.0.0',
@@ -183,7 +208,7 @@ def test_validate_version_mismatch_input_decline(monkeypatch):
 
 
 def test_validate_version_mismatch_keyboard_interrupt(monkeypatch):
-    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None: {
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
         'available': True,
         'version_matches': False,
         'version': '1.0.0',
@@ -206,7 +231,7 @@ def test_validate_check_package_crashes_skip(monkeypatch):
 
 
 def test_validate_missing_package_abort(monkeypatch):
-    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None: {
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
         'available': False,
         'version_matches': True,
         'version': None,
@@ -218,7 +243,7 @@ def test_validate_missing_package_abort(monkeypatch):
 
 
 def test_validate_missing_package_else_skip(monkeypatch):
-    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None: {
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
         'available': False,
         'version_matches': True,
         'version': None,
@@ -229,7 +254,7 @@ def test_validate_missing_package_else_skip(monkeypatch):
 
 
 def test_validate_version_mismatch_warn(monkeypatch):
-    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None: {
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
         'available': True,
         'version_matches': False,
         'version': '0.9.0',
@@ -240,7 +265,7 @@ def test_validate_version_mismatch_warn(monkeypatch):
 
 
 def test_validate_version_mismatch_else_skip(monkeypatch):
-    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None: {
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
         'available': True,
         'version_matches': False,
         'version': '0.9.0',
@@ -249,3 +274,172 @@ def test_validate_version_mismatch_else_skip(monkeypatch):
     lockfile = {'deps': {'mismatch': {'version': '1.0.0'}}}
     validate_environment(lockfile, strict=True, interactive=False, on_error='skip')
 
+
+
+def test_validate_batch_install_single_call(monkeypatch):
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
+        'available': dep == 'flask',
+        'version_matches': True,
+        'version': ver,
+        'source': 'mock'
+    })
+    monkeypatch.setattr("pydepguard.pylock.validator.is_importable", lambda name: False)
+    monkeypatch.setattr("pydepguard.pylock.validator.ensure_package",
+                        lambda *a, **kw: pytest.fail("per-package install should not run"))
+    calls = []
+
+    def fake_install_packages(packages, distributions=None):
+        calls.append(packages)
+        calls.append(distributions)
+        return {name: None for name, _ in packages}
+
+    monkeypatch.setattr("pydepguard.pylock.validator.install_packages", fake_install_packages)
+    lockfile = {'deps': {
+        'flask': {'version': '2.0.0'},
+        'yaml': {'version': 'unknown'},
+        'requests': {'version': '2.31.0', 'distribution': 'requests'},
+    }}
+    validate_environment(lockfile, fix_missing=True, batch_install=True)
+    assert calls == [[('yaml', 'unknown'), ('requests', '2.31.0')], {'requests': 'requests'}]
+
+
+def test_validate_batch_install_failure_applies_on_error(monkeypatch):
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
+        'available': False,
+        'version_matches': False,
+        'version': None,
+        'source': 'none'
+    })
+    monkeypatch.setattr("pydepguard.pylock.validator.is_importable", lambda name: False)
+    monkeypatch.setattr("pydepguard.pylock.validator.install_packages", lambda packages, distributions=None: {
+        'good': None,
+        'bad': RuntimeError("[pylock] Failed to install bad"),
+    })
+    lockfile = {'deps': {'good': {'version': '1.0'}, 'bad': {'version': '1.0'}}}
+    with pytest.raises(RuntimeError, match="Missing required package: bad"):
+        validate_environment(lockfile, fix_missing=True, batch_install=True)
+
+
+def test_validate_parallel_checks_report_in_lockfile_order(monkeypatch, capsys):
+    import threading
+    import time
+
+    seen_threads = set()
+
+    def slow_check(dep, ver=None, pip_fallback=False):
+        seen_threads.add(threading.get_ident())
+        # Finish the first entries last so completion order differs from lockfile order.
+        time.sleep({'a': 0.05, 'b': 0.03, 'c': 0.0}[dep])
+        return {'available': dep != 'b', 'version_matches': dep != 'c', 'version': '0.1', 'source': 'mock'}
+
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", slow_check)
+    lockfile = {'deps': {'a': {'version': '1.0'}, 'b': {'version': '1.0'}, 'c': {'version': '1.0'}}}
+    validate_environment(lockfile, interactive=False, on_error='warn', jobs=3)
+
+    out = capsys.readouterr().out
+    assert len(seen_threads) > 1
+    assert out.index("Missing required package: b") < out.index("Version mismatch for c")
+
+
+def test_validate_parallel_abort_is_deterministic(monkeypatch):
+    def check(dep, ver=None, pip_fallback=False):
+        if dep in ('second', 'third'):
+            raise Exception(f"boom {dep}")
+        return {'available': True, 'version_matches': True, 'version': ver, 'source': 'mock'}
+
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", check)
+    lockfile = {'deps': {'first': {'version': '1'}, 'second': {'version': '1'}, 'third': {'version': '1'}}}
+    with pytest.raises(RuntimeError, match="Dependency check failed for second"):
+        validate_environment(lockfile, on_error='abort', jobs=4)
+
+
+def test_validate_skips_checks_when_fingerprint_matches(monkeypatch, capsys):
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability",
+                        lambda *a, **kw: pytest.fail("checks should be skipped"))
+    monkeypatch.setattr("pydepguard.pylock.validator.environment_matches", lambda env: env == {'fingerprint': 'abc'})
+
+    lockfile = {'meta': {'environment': {'fingerprint': 'abc'}}, 'deps': {'flask': {'version': '2.0.0'}}}
+    assert validate_environment(lockfile) == {'fingerprint': 'abc'}
+    assert "Environment unchanged" in capsys.readouterr().out
+
+
+def test_validate_revalidate_ignores_fingerprint(monkeypatch):
+    checked = []
+
+    def check(dep, ver=None, pip_fallback=False):
+        checked.append(dep)
+        return {'available': True, 'version_matches': True, 'version': ver, 'source': 'mock'}
+
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", check)
+    monkeypatch.setattr("pydepguard.pylock.validator.environment_matches", lambda env: True)
+    monkeypatch.setattr("pydepguard.pylock.validator.environment_fingerprint", lambda deps: {'fingerprint': 'new'})
+
+    lockfile = {'meta': {'environment': {'fingerprint': 'abc'}}, 'deps': {'flask': {'version': '2.0.0'}}}
+    assert validate_environment(lockfile, revalidate=True) == {'fingerprint': 'new'}
+    assert checked == ['flask']
+
+
+def test_validate_returns_no_fingerprint_after_warnings(monkeypatch):
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", lambda dep, ver=None, pip_fallback=False: {
+        'available': True,
+        'version_matches': False,
+        'version': '1.0.0',
+        'source': 'mock'
+    })
+    monkeypatch.setattr("pydepguard.pylock.validator.environment_fingerprint", lambda deps: {'fingerprint': 'new'})
+
+    lockfile = {'deps': {'flask': {'version': '2.0.0'}}}
+    assert validate_environment(lockfile, strict=False) is None
+
+
+def test_validate_transitive_checks_pinned_closure(monkeypatch):
+    checked = []
+
+    def check(dep, ver=None, pip_fallback=False):
+        checked.append((dep, ver))
+        return {'available': True, 'version_matches': True, 'version': ver, 'source': 'mock'}
+
+    monkeypatch.setattr("pydepguard.pylock.validator.check_package_availability", check)
+    monkeypatch.setattr("pydepguard.pylock.validator.environment_matches", lambda env: True)
+    monkeypatch.setattr("pydepguard.pylock.validator.environment_fingerprint", lambda deps: {'fingerprint': 'new'})
+
+    lockfile = {
+        'meta': {'environment': {'fingerprint': 'abc'}},
+        'deps': {
+            'requests': {'version': '2.0.0', 'transitive': {'urllib3': '2.8.0', 'idna': '3.10', 'gone': 'unknown'}},
+            'idna': {'version': '3.10'},
+        },
+    }
+    # The recorded fingerprint only covered direct deps, so checks still run.
+    assert validate_environment(lockfile, transitive=True) == {'fingerprint': 'new', 'transitive': True}
+    assert checked == [('requests', '2.0.0'), ('idna', '3.10'), ('urllib3', '2.8.0')]
+
+
+def test_validate_check_hashes(monkeypatch, capsys):
+    from pydepguard.pylock import validator
+    from pydepguard.pylock.snapshot import EnvironmentSnapshot, InstalledDistribution
+
+    monkeypatch.setattr(validator, "check_package_availability", lambda dep, ver=None, pip_fallback=False: {
+        'available': True, 'version_matches': True, 'version': ver, 'source': 'mock'
+    })
+    monkeypatch.setattr(validator, "environment_fingerprint", lambda deps: {'fingerprint': 'new'})
+    snap = EnvironmentSnapshot({'flask': InstalledDistribution('Flask', '2.0.0', '/site', '/site/flask.dist-info')}, 'sig')
+    monkeypatch.setattr(validator, "get_snapshot", lambda: snap)
+    seen = []
+
+    def verify(targets, jobs=None):
+        seen.extend(targets)
+        return {name: ['flask/app.py: content differs'] for name, *_ in targets}
+
+    monkeypatch.setattr("pydepguard.pylock.hashing.verify_distributions", verify)
+    lockfile = {'deps': {'flask': {'version': '2.0.0', 'digest': 'sha256:abc'}, 'nodigest': {'version': '1'}}}
+
+    with pytest.raises(RuntimeError):
+        validate_environment(lockfile, check_hashes=True)
+    assert seen == [('flask', '/site/flask.dist-info', '/site', 'sha256:abc')]
+
+    assert validate_environment(lockfile, check_hashes=True, on_error='warn') is None
+    assert "Hash verification failed for flask" in capsys.readouterr().out
+
+    monkeypatch.setattr("pydepguard.pylock.hashing.verify_distributions", lambda targets, jobs=None: {'flask': []})
+    assert validate_environment(lockfile, check_hashes=True) == {'fingerprint': 'new'}
@@ -0,0 +1,107 @@
+import os
+import sys
+import threading
+import pytest
+from pydepguard.pylock.lockfile import LockfileManager
+from pydepguard.pylock.watcher import InotifyWatcher, PollingWatcher, wait_for_changes, watch_lockfile
+
+
+class ScriptedWatcher:
+    # Each wait() runs the next step (a callable or None) and reports the
+    # paths it returns; when the steps run out it stops the watch loop.
+    def __init__(self, steps, stop):
+        self.steps = list(steps)
+        self.stop = stop
+        self.updates = []
+
+    def update(self, paths):
+        self.updates.append(sorted(str(p) for p in paths))
+
+    def wait(self, timeout=None):
+        if not self.steps:
+            self.stop.set()
+            return set()
+        step = self.steps.pop(0)
+        return set(step()) if step else set()
+
+    def close(self):
+        pass
+
+
+def test_polling_watcher(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("x = 1\n")
+    watcher = PollingWatcher([path], poll=0.01)
+    assert watcher.wait(timeout=0.05) == set()
+    path.write_text("x = 22\n")
+    assert watcher.wait(timeout=1) == {path.resolve()}
+    path.unlink()
+    assert watcher.wait(timeout=1) == {path.resolve()}
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="inotify is Linux-only")
+def test_inotify_watcher_sees_replace(tmp_path):
+    path = tmp_path / "a.py"
+    other = tmp_path / "b.py"
+    path.write_text("x = 1\n")
+    watcher = InotifyWatcher([path])
+    try:
+        other.write_text("unrelated\n")
+        assert watcher.wait(timeout=0.1) == set()
+        tmp = tmp_path / "a.py.swp"
+        tmp.write_text("x = 2\n")
+        os.replace(tmp, path)
+        assert watcher.wait(timeout=1) == {path.resolve()}
+    finally:
+        watcher.close()
+
+
+def test_wait_for_changes_debounces_bursts():
+    bursts = [{"a"}, {"b"}, {"a"}, set(), {"c"}, set()]
+    watcher = type("W", (), {"wait": lambda self, timeout=None: bursts.pop(0)})()
+    assert wait_for_changes(watcher, debounce=0.01) == {"a", "b"}
+    assert wait_for_changes(watcher, debounce=0.01) == {"c"}
+
+
+def test_watch_rewrites_only_when_deps_change(tmp_path, capsys):
+    script = tmp_path / "app.py"
+    script.write_text("import pip\n")
+    lm = LockfileManager(script)
+    stop = threading.Event()
+    written = []
+
+    def lock_mtime():
+        return os.stat(lm.lockfile_path).st_mtime_ns
+
+    def edit(text):
+        def step():
+            written.append(lock_mtime())
+            script.write_text(text)
+            return [script]
+        return step
+
+    steps = [edit("import pip\n# comment\n"), None, edit("import pip\nimport pytest\n"), None,
+             lambda: written.append(lock_mtime()) or []]
+    watch_lockfile(lm, script, watcher=ScriptedWatcher(steps, stop), stop=stop, debounce=0)
+
+    # The comment-only edit left the file alone; the new import rewrote it.
+    assert written[0] == written[1] != written[2]
+    assert set(lm.load()['deps']) == {'pip', 'pytest'}
+    out = capsys.readouterr().out
+    assert "dependency set unchanged" in out
+    assert "New dependencies: pytest" in out
+
+
+def test_watch_sees_new_local_modules(tmp_path):
+    script = tmp_path / "app.py"
+    script.write_text("import pip\nimport helper\n")
+    lm = LockfileManager(script)
+    stop = threading.Event()
+
+    def add_helper():
+        (tmp_path / "helper.py").write_text("")
+        script.write_text("import pip\nimport helper\n# uses the local helper now\n")
+        return [script]
+
+    watch_lockfile(lm, script, watcher=ScriptedWatcher([add_helper], stop), stop=stop, debounce=0)
+    assert set(lm.load()['deps']) == {'pip'}
@@ -0,0 +1,91 @@
+import zipfile
+import pytest
+from pydepguard.pylock import wheelhouse
+from pydepguard.pylock.wheelhouse import get_wheelhouse_index, is_compatible, parse_wheel_filename, resolve_pins
+
+TAGS = (frozenset({'cp311', 'py311', 'py3', 'py310'}), frozenset({'none', 'cp311', 'abi3'}), ('linux', 'x86_64'))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYLOCK_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def _wheel(directory, filename, members):
+    directory.mkdir(exist_ok=True)
+    with zipfile.ZipFile(directory / filename, 'w') as zf:
+        for member in members:
+            zf.writestr(member, "")
+
+
+def test_parse_wheel_filename():
+    wheel = parse_wheel_filename("requests-2.31.0-py3-none-any.whl")
+    assert (wheel.name, wheel.version) == ("requests", "2.31.0")
+    assert wheel.tags == {('py3', 'none', 'any')}
+
+    wheel = parse_wheel_filename("six-1.16.0-1-py2.py3-none-any.whl")
+    assert wheel.version == "1.16.0"
+    assert wheel.tags == {('py2', 'none', 'any'), ('py3', 'none', 'any')}
+    assert parse_wheel_filename("requests-2.31.0.tar.gz") is None
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("pkg-1.0-py3-none-any.whl", True),
+    ("pkg-1.0-cp311-cp311-manylinux_2_17_x86_64.manylinux2014_x86_64.whl", True),
+    ("pkg-1.0-cp38-abi3-manylinux2014_x86_64.whl", False),
+    ("pkg-1.0-cp310-abi3-musllinux_1_1_x86_64.whl", False),
+    ("pkg-1.0-cp311-cp311-manylinux2014_aarch64.whl", False),
+    ("pkg-1.0-cp311-cp311-win_amd64.whl", False),
+    ("pkg-1.0-cp312-cp312-manylinux2014_x86_64.whl", False),
+    ("pkg-1.0-py2-none-any.whl", False),
+])
+def test_is_compatible(filename, expected):
+    assert is_compatible(parse_wheel_filename(filename), TAGS) is expected
+
+
+def test_index_is_cached_and_incremental(tmp_path, monkeypatch):
+    house = tmp_path / "wheels"
+    _wheel(house, "PyYAML-6.0.1-py3-none-any.whl", ["yaml/__init__.py", "PyYAML-6.0.1.dist-info/RECORD"])
+    _wheel(house, "acme_tools-2.0-py3-none-any.whl", ["acme/__init__.py", "acme_helpers.py"])
+    (house / "notes.txt").write_text("ignored")
+
+    index = get_wheelhouse_index(house)
+    assert sorted(index.wheels) == ["PyYAML-6.0.1-py3-none-any.whl", "acme_tools-2.0-py3-none-any.whl"]
+    assert [w.name for w in index.candidates("yaml")] == ["PyYAML"]
+    assert [w.name for w in index.candidates("acme")] == ["acme_tools"]
+    assert [w.name for w in index.candidates("acme_helpers")] == ["acme_tools"]
+    assert index.candidates("nothing") == []
+
+    opened = []
+    real = wheelhouse.wheel_modules
+    monkeypatch.setattr(wheelhouse, "wheel_modules", lambda path: opened.append(path.name) or real(path))
+    get_wheelhouse_index(house)
+    assert opened == []
+
+    _wheel(house, "PyYAML-6.0.2-py3-none-any.whl", ["yaml/__init__.py"])
+    index = get_wheelhouse_index(house)
+    assert opened == ["PyYAML-6.0.2-py3-none-any.whl"]
+    assert len(index.candidates("yaml")) == 2
+
+
+def test_resolve_pins(tmp_path):
+    house = tmp_path / "wheels"
+    _wheel(house, "requests-2.31.0-py3-none-any.whl", ["requests/__init__.py"])
+    _wheel(house, "requests-2.32.0-py3-none-any.whl", ["requests/__init__.py"])
+    _wheel(house, "fastpkg-1.0-cp311-cp311-win_amd64.whl", ["fastpkg/__init__.py"])
+    index = get_wheelhouse_index(house)
+
+    resolved, unsatisfiable = resolve_pins(index, [
+        ("requests", "2.31"),
+        ("fastpkg", "1.0"),
+        ("missing", "1.0"),
+    ], tags=TAGS)
+    assert resolved["requests"].version == "2.31.0"
+    assert unsatisfiable["fastpkg"].startswith("no wheel compatible")
+    assert unsatisfiable["missing"] == "no wheels for this package"
+
+    resolved, _ = resolve_pins(index, [("requests", "unknown")], tags=TAGS)
+    assert resolved["requests"].version == "2.32.0"
+
+    _, unsatisfiable = resolve_pins(index, [("requests", "2.0.0")], tags=TAGS)
+    assert unsatisfiable["requests"] == "2.0.0 not in wheelhouse (available: 2.31.0, 2.32.0)"